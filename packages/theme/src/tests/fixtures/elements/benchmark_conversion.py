@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+import os
+import copy
+import random
+import timeit
+import tracemalloc
+import logging
+import argparse
+import contextlib
+from collections import Counter
+from bs4 import BeautifulSoup
+
+import html_input
+import fragment_memo
+import html_to_mdx_v2
+import html_to_mdx_v10
+import page_regions
+import text_triage
+import verify_mdx_conversion
+
+# --- Configuration Constants ---
+DEFAULT_HTML_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "1025.html")
+DEFAULT_REPEAT = 5
+DEFAULT_NUMBER = 20
+DEFAULT_NAV_ITEM_COUNT = 50000  # Sidebar entries in the synthetic vocabulary
+DEFAULT_EXAMPLE_SCALE = 50  # Copies of each example block when inflating a page into an example-heavy one
+DEFAULT_TRIAGE_PAGES = 10000  # Synthetic HTML/MDX text pairs for the verification triage
+DEFAULT_MEMO_PASSES = 20  # Times the given pages are converted in one batch; a real corpus repeats its boilerplate less
+
+# The selector strings convert_soup_to_mdx used before they were precompiled
+UNCOMPILED_SELECTORS = [
+    'div.col-md-7 h4:-soup-contains("Element reference")',
+    'div.col-md-7 > div.row.m-1 > h3',
+    'main.container div.row.m-1 > h3',
+    'main.container h1, div.col-md-7 h1',
+    'div.col-md-7.border.rounded',
+]
+COMPILED_SELECTORS = [
+    html_to_mdx_v2.ELEMENT_REFERENCE_H4_SELECTOR,
+    html_to_mdx_v2.MAIN_TITLE_SELECTOR,
+    html_to_mdx_v2.MAIN_TITLE_FALLBACK_SELECTOR,
+    html_to_mdx_v2.MAIN_TITLE_H1_SELECTOR,
+    html_to_mdx_v2.MAIN_CONTENT_COLUMN_SELECTOR,
+]
+
+
+def best_time_ms(fn, repeat, number):
+    """Best per-call time in milliseconds over `repeat` rounds of `number` calls."""
+    return min(timeit.repeat(fn, repeat=repeat, number=number)) / number * 1000
+
+
+def tree_size(soup):
+    return sum(1 for _ in soup.descendants), len(str(soup))
+
+
+def report_row(label, baseline_ms, new_ms):
+    print(f"  {label:<28} {baseline_ms:9.3f} ms -> {new_ms:9.3f} ms  ({1 - new_ms / baseline_ms:.0%} saved)"
+          if baseline_ms else f"  {label:<28} {new_ms:9.3f} ms")
+
+
+# --- Benchmarks ---
+def benchmark_parse(html_file, repeat, number):
+    """Full vs strained parsing, string vs precompiled selectors, and end-to-end conversion of one page."""
+    html_content = html_to_mdx_v2.read_html_file(html_file)
+    html_filename = os.path.basename(html_file)
+    logger = logging.getLogger("benchmark")
+    full_soup = html_to_mdx_v2.parse_html(html_content, restrict_to_page_regions=False)
+    strained_soup = html_to_mdx_v2.parse_html(html_content)
+    nav_soup = BeautifulSoup(html_content, 'html.parser', parse_only=html_to_mdx_v10.SIDEBAR_NAV_STRAINER)
+
+    print(f"{html_filename}: {len(html_content.encode('utf-8'))} bytes of HTML")
+    for label, soup in (("full parse", full_soup), ("main.container only", strained_soup), ("sidebar nav only", nav_soup)):
+        nodes, chars = tree_size(soup)
+        print(f"  {label:<28} {nodes:6d} nodes, {chars:7d} chars in tree")
+
+    print("Per-call time (best of %d x %d):" % (repeat, number))
+    report_row("converter parse", best_time_ms(lambda: html_to_mdx_v2.parse_html(html_content, False), repeat, number),
+               best_time_ms(lambda: html_to_mdx_v2.parse_html(html_content), repeat, number))
+    report_row("sidebar parse", best_time_ms(lambda: BeautifulSoup(html_content, 'html.parser'), repeat, number),
+               best_time_ms(lambda: BeautifulSoup(html_content, 'html.parser',
+                                                  parse_only=html_to_mdx_v10.SIDEBAR_NAV_STRAINER), repeat, number))
+    report_row("page selectors",
+               best_time_ms(lambda: [full_soup.select_one(s) for s in UNCOMPILED_SELECTORS], repeat, number),
+               best_time_ms(lambda: [s.select_one(strained_soup) for s in COMPILED_SELECTORS], repeat, number))
+    report_row("sidebar nav selector",
+               best_time_ms(lambda: full_soup.select(html_to_mdx_v10.NAV_CONTAINER_SELECTOR.pattern), repeat, number),
+               best_time_ms(lambda: html_to_mdx_v10.NAV_CONTAINER_SELECTOR.select(nav_soup), repeat, number))
+
+    full_output = html_to_mdx_v2.convert_soup_to_mdx(full_soup, html_filename, logger)
+    strained_output = html_to_mdx_v2.convert_soup_to_mdx(strained_soup, html_filename, logger)
+    report_row("parse + convert",
+               best_time_ms(lambda: html_to_mdx_v2.convert_soup_to_mdx(
+                   html_to_mdx_v2.parse_html(html_content, False), html_filename, logger), repeat, number),
+               best_time_ms(lambda: html_to_mdx_v2.convert_html_to_mdx(html_content, html_filename, logger),
+                            repeat, number))
+    print(f"  MDX output identical: {full_output == strained_output}")
+    return full_output == strained_output
+
+
+def parse_peak_kib(parse):
+    # Peak memory while building (and holding) one tree
+    tracemalloc.start()
+    soup = parse()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del soup
+    return peak / 1024
+
+
+def benchmark_regions(html_file, repeat, number):
+    """
+    The sidebar nav parse: navs pre-scanned out of the page (html_to_mdx_v10.load_html_soup) vs the nav
+    strainer. Parse work, tree memory and identical navs; the converter's own parse is compared in 'parse'.
+    """
+    html_content = html_to_mdx_v2.read_html_file(html_file)
+    html_filename = os.path.basename(html_file)
+    nav_regions = page_regions.find_all_regions(html_content, 'nav', ('navISBDMSection',))
+    parses = (("sidebar nav strainer", lambda: BeautifulSoup(html_content, 'html.parser',
+                                                             parse_only=html_to_mdx_v10.SIDEBAR_NAV_STRAINER)),
+              ("pre-scanned navs", lambda: html_to_mdx_v10.load_html_soup(html_file)))
+
+    print(f"{html_filename}: {len(html_content)} chars of HTML, "
+          f"{sum(b - a for a, b in nav_regions)} chars in {len(nav_regions)} pre-scanned nav(s)")
+    navs = []
+    for label, parse in parses:
+        nodes, _ = tree_size(parse())
+        navs.append([str(n) for n in html_to_mdx_v10.NAV_CONTAINER_SELECTOR.select(parse())])
+        print(f"  {label:<28} {nodes:6d} nodes, peak {parse_peak_kib(parse):8.1f} KiB while parsing")
+
+    print("Per-call time (best of %d x %d):" % (repeat, number))
+    report_row("nav pre-scan", 0, best_time_ms(
+        lambda: page_regions.find_all_regions(html_content, 'nav', ('navISBDMSection',)), repeat, number))
+    report_row("sidebar nav parse", *(best_time_ms(parse, repeat, number) for _, parse in parses))
+    navs_identical = navs[0] == navs[1]
+    print(f"  Sidebar navs identical: {navs_identical}")
+    return navs_identical
+
+
+def benchmark_input(html_file, html_subdirectory, repeat, number):
+    """Text read and decoded for html.parser vs raw (mapped) bytes handed to the bytes parser, through one conversion."""
+    html_filename = os.path.basename(html_file)
+    logger = logging.getLogger("benchmark")
+
+    def text_path():
+        return html_to_mdx_v2.convert_html_to_mdx(html_to_mdx_v2.read_html_file(html_file), html_filename, logger,
+                                                  html_subdirectory)
+
+    def bytes_path():
+        with html_input.mapped_html(html_file) as html_content:
+            return html_to_mdx_v2.convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory)
+
+    def text_parse():
+        return html_to_mdx_v2.parse_html(html_to_mdx_v2.read_html_file(html_file))
+
+    def bytes_parse():
+        with html_input.mapped_html(html_file) as html_content:
+            return html_to_mdx_v2.parse_html(html_content)
+
+    with html_input.mapped_html(html_file) as html_content:
+        encoding = html_input.declared_encoding(html_content)
+        print(f"{html_filename}: {len(html_content)} bytes of HTML ({encoding}), {type(html_content).__name__} input, "
+              f"bytes parsed by {html_input.BYTES_PARSER}")
+    for label, parse in (("text + html.parser", text_parse), ("bytes + " + html_input.BYTES_PARSER, bytes_parse)):
+        # tracemalloc sees Python objects only: the decoded text and the tree, not lxml's own C buffers
+        print(f"  {label:<28} Python heap peak {parse_peak_kib(parse):8.1f} KiB while reading and parsing")
+    print("Per-call time (best of %d x %d):" % (repeat, number))
+    report_row("read + parse", best_time_ms(text_parse, repeat, number), best_time_ms(bytes_parse, repeat, number))
+    report_row("read + parse + convert", best_time_ms(text_path, repeat, number), best_time_ms(bytes_path, repeat, number))
+    identical = text_path() == bytes_path()
+    print(f"  MDX output identical: {identical}")
+    return identical
+
+
+def synthetic_text_pairs(html_file, pages, seed=1):
+    """Pairs cut from the page's normalised text: every 10th MDX text truncated, every 7th with one character changed."""
+    text = verify_mdx_conversion.get_text_from_div(html_file, 'selector', 'main.container') or ''
+    rng = random.Random(seed)
+    html_texts, mdx_texts = [], []
+    for page in range(pages):
+        start = rng.randrange(max(1, len(text) // 2))
+        html_text = text[start:]
+        mdx_text = html_text[:len(html_text) // 2] if page % 10 == 0 else html_text
+        if page % 7 == 0 and mdx_text:
+            changed = rng.randrange(len(mdx_text))
+            mdx_text = mdx_text[:changed] + "#" + mdx_text[changed + 1:]
+        html_texts.append(html_text)
+        mdx_texts.append(mdx_text)
+    return html_texts, mdx_texts
+
+
+def benchmark_triage(html_file, pages, repeat):
+    """Exact comparison and report of every pair vs triage: equality, then MinHash ranking of the differing pairs."""
+    html_texts, mdx_texts = synthetic_text_pairs(html_file, pages)
+
+    def compare_all():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for index, (html_text, mdx_text) in enumerate(zip(html_texts, mdx_texts)):
+                verify_mdx_conversion.compare_and_report(html_text, mdx_text, f"{index}.html", f"{index}.mdx")
+
+    ranked = text_triage.triage(html_texts, mdx_texts)
+    differing = {index for index, (h, m) in enumerate(zip(html_texts, mdx_texts)) if h != m}
+    flagged = {index for index, _, verdict in ranked if verdict != "identical"}
+    print(f"{pages} pairs of about {sum(map(len, html_texts)) // pages} chars, {len(differing)} differing; triage: "
+          f"{', '.join(f'{n} {v}' for v, n in sorted(Counter(v for _, _, v in ranked).items()))}")
+    print("Time for the corpus (best of %d):" % repeat)
+    report_row("compare corpus", best_time_ms(compare_all, repeat, 1),
+               best_time_ms(lambda: text_triage.triage(html_texts, mdx_texts), repeat, 1))
+    return flagged == differing
+
+
+def benchmark_memo(html_files, passes, repeat):
+    """One batch converting the pages `passes` times each, without and with the cross-page fragment memo."""
+    logger = logging.getLogger("benchmark")
+    pages = [(html_input.read_html_bytes(f), os.path.basename(f)) for f in html_files] * passes
+    memo = html_to_mdx_v2.FRAGMENT_MEMO
+
+    def convert_batch(max_entries):
+        memo.max_entries = max_entries
+        memo.clear()
+        return [html_to_mdx_v2.convert_html_to_mdx(content, name, logger) for content, name in pages]
+
+    print(f"{len(html_files)} page(s) x {passes} pass(es) per batch")
+    without_memo = convert_batch(0)
+    with_memo = convert_batch(fragment_memo.DEFAULT_MEMO_ENTRIES)
+    for line in memo.summary_lines(): print(f"  {line}")
+    print("Time for the batch (best of %d):" % repeat)
+    report_row("convert batch", best_time_ms(lambda: convert_batch(0), repeat, 1),
+               best_time_ms(lambda: convert_batch(fragment_memo.DEFAULT_MEMO_ENTRIES), repeat, 1))
+    identical = with_memo == without_memo
+    print(f"  MDX output identical: {identical}")
+    return identical
+
+
+def legacy_example_rows(element_node, examples_div, is_direct_content_row_block):
+    # Row extraction as the xampleBlockStip handler did it before collect_example_rows
+    rows = [element_node] if is_direct_content_row_block else \
+        [r for r in element_node.find_all('div', class_='row', recursive=True) if
+         r.find_parent('div', class_='xamples') == examples_div]
+    has_label = any(r.find(class_='xampleLabel') for r in rows)
+    return has_label, [(r, r.find(class_='xampleLabel'), r.find(class_='xampleValue'), r.find(class_='editComment'))
+                       for r in rows]
+
+
+def example_blocks(soup):
+    """(examples_div, element_node, is_direct_row) for every div inside a div.xamples, as the converter visits them."""
+    blocks = []
+    for examples_div in soup.select('div.xampleBlockStip div.xamples'):
+        for element_node in examples_div.children:
+            if getattr(element_node, 'name', None) == 'div':
+                classes = element_node.get('class', [])
+                blocks.append((examples_div, element_node, 'row' in classes and 'px-2' in classes))
+    return blocks
+
+
+def inflate_examples(soup, scale):
+    # Stand-in for the fullex pages: repeat every example block `scale` times
+    for examples_div in soup.select('div.xamples'):
+        originals = [node for node in examples_div.children if getattr(node, 'name', None)]
+        for _ in range(scale - 1):
+            for node in originals: examples_div.append(copy.copy(node))
+    return soup
+
+
+def benchmark_examples(html_file, scale, repeat, number):
+    """find_all + find_parent + find row extraction vs the single-pass collect_example_rows."""
+    html_content = html_to_mdx_v2.read_html_file(html_file)
+    soup = inflate_examples(html_to_mdx_v2.parse_html(html_content), scale)
+    blocks = example_blocks(soup)
+
+    def run_legacy():
+        return [legacy_example_rows(node, examples_div, is_row) for examples_div, node, is_row in blocks]
+
+    def run_single_pass():
+        results = []
+        for _, node, is_row in blocks:
+            rows = html_to_mdx_v2.collect_example_rows(node, is_row)
+            results.append((any(r.label for r in rows), [tuple(r) for r in rows]))
+        return results
+
+    identical = run_legacy() == run_single_pass()
+    row_count = sum(len(rows) for _, rows in run_single_pass())
+    print(f"{os.path.basename(html_file)} x{scale}: {len(blocks)} example blocks, {row_count} example rows")
+    report_row("example row extraction", best_time_ms(run_legacy, repeat, number),
+               best_time_ms(run_single_pass, repeat, number))
+    print(f"  Rows and roles identical: {identical}")
+    return identical
+
+
+class LegacyNavItem:
+    # NavItem as it was before NavSection: a __dict__ per item and a copied ancestor flag list
+    def __init__(self, original_href, normalized_key, label, html_level, html_position_in_section,
+                 source_html_file_path, mdx_path=None):
+        self.original_href = original_href
+        self.normalized_key = normalized_key
+        self.label = label
+        self.html_level = html_level
+        self.html_position_in_section = html_position_in_section
+        self.source_html_file_path = source_html_file_path
+        self.mdx_path = mdx_path
+        self.is_last_sibling = False
+        self.ancestor_is_last_flags = []
+        self.has_children_in_html = False
+
+
+def legacy_determine_hierarchy_properties(section_nav_items):
+    for i, current_item in enumerate(section_nav_items):
+        current_item.is_last_sibling = True
+        for j in range(i + 1, len(section_nav_items)):
+            if section_nav_items[j].html_level == current_item.html_level:
+                current_item.is_last_sibling = False; break
+            if section_nav_items[j].html_level < current_item.html_level:
+                break
+    parent_is_last_at_level_stack = []
+    for i, item in enumerate(section_nav_items):
+        while len(parent_is_last_at_level_stack) >= item.html_level:
+            parent_is_last_at_level_stack.pop()
+        item.ancestor_is_last_flags = list(parent_is_last_at_level_stack)
+        parent_is_last_at_level_stack.append(item.is_last_sibling)
+        if i + 1 < len(section_nav_items) and section_nav_items[i + 1].html_level > item.html_level:
+            item.has_children_in_html = True
+
+
+def legacy_sidebar_prefix(nav_item):
+    if nav_item.html_level < 2: return None
+    prefix_parts = []
+    for i in range(nav_item.html_level - 1):
+        is_ancestor_last = nav_item.ancestor_is_last_flags[i] if i < len(nav_item.ancestor_is_last_flags) else True
+        prefix_parts.append("   " if is_ancestor_last else "│  ")
+    prefix_parts.append("└─ " if nav_item.is_last_sibling else "├─ ")
+    return "".join(prefix_parts)
+
+
+def synthetic_vocabulary_levels(count, base_level=2, max_depth=5, seed=1):
+    # A value vocabulary shaped like the ISBDM 'values' sections: mostly flat runs with nested concept groups
+    rng = random.Random(seed)
+    levels, level = [], base_level
+    for _ in range(count):
+        levels.append(level)
+        roll = rng.random()
+        if roll < 0.15 and level < base_level + max_depth - 1: level += 1
+        elif roll < 0.30 and level > base_level: level -= rng.randint(1, level - base_level)
+    return levels
+
+
+def build_nav_items(item_class, levels, source_html_file_path, **extra):
+    return [item_class(f"/ISBDM/docs/values/{i}.html", f"values/{i}", f"Concept {i}", level, i + 1,
+                       source_html_file_path, **extra) for i, level in enumerate(levels)]
+
+
+def measure_nav_items(item_class, determine, levels, **extra):
+    source_html_file_path = "ISBDM/docs/values/index.html"
+    tracemalloc.start()
+    items = build_nav_items(item_class, levels, source_html_file_path, **extra)
+    determine(items)
+    current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, current_bytes, peak_bytes
+
+
+def benchmark_nav_items(count, repeat):
+    """Memory and hierarchy time for a large section: legacy NavItem vs NavSection-backed NavItem."""
+    levels = synthetic_vocabulary_levels(count)
+    legacy_items, legacy_bytes, legacy_peak = measure_nav_items(LegacyNavItem, legacy_determine_hierarchy_properties, levels)
+    items, new_bytes, new_peak = measure_nav_items(html_to_mdx_v10.NavItem, html_to_mdx_v10.determine_hierarchy_properties,
+                                                   levels, section=html_to_mdx_v10.NavSection())
+    labels = [f"Concept {i}" for i in range(count)]  # Item strings are the same in both layouts
+    string_bytes = sum(len(label) + 49 for label in labels)
+    print(f"{count} nav items, max level {max(levels)}:")
+    print(f"  retained memory   legacy {legacy_bytes / 1e6:8.2f} MB   slots+arrays {new_bytes / 1e6:8.2f} MB  "
+          f"({1 - new_bytes / legacy_bytes:.0%} less; ~{string_bytes * 3 / 1e6:.2f} MB of that is item strings)")
+    print(f"  peak memory       legacy {legacy_peak / 1e6:8.2f} MB   slots+arrays {new_peak / 1e6:8.2f} MB")
+    print(f"  per item          legacy {legacy_bytes / count:8.1f} B    slots+arrays {new_bytes / count:8.1f} B")
+    report_row("hierarchy pass", best_time_ms(lambda: legacy_determine_hierarchy_properties(legacy_items), repeat, 1),
+               best_time_ms(lambda: html_to_mdx_v10.determine_hierarchy_properties(items), repeat, 1))
+    identical = all(
+        (old.is_last_sibling, old.has_children_in_html, old.ancestor_is_last_flags, legacy_sidebar_prefix(old)) ==
+        (new.is_last_sibling, new.has_children_in_html, new.ancestor_is_last_flags, html_to_mdx_v10.generate_sidebar_prefix(new))
+        for old, new in zip(legacy_items, items))
+    print(f"  Flags and sidebar prefixes identical: {identical}")
+    return identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the HTML->MDX conversion scripts.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    parse_parser = subparsers.add_parser("parse", help="Full vs SoupStrainer parsing and precompiled selectors.")
+    parse_parser.add_argument("html_files", nargs="*", default=[DEFAULT_HTML_FILE], help="HTML pages to benchmark.")
+    regions_parser = subparsers.add_parser("regions", help="Pre-scanned vs strained sidebar nav parsing.")
+    regions_parser.add_argument("html_files", nargs="*", default=[DEFAULT_HTML_FILE], help="HTML pages to benchmark.")
+    input_parser = subparsers.add_parser("input", help="Decoded text vs raw bytes input to the page parser.")
+    input_parser.add_argument("html_files", nargs="*", default=[DEFAULT_HTML_FILE], help="HTML pages to benchmark.")
+    input_parser.add_argument("--source_root",
+                              help="Root the pages sit under, so their sidebar links are resolved as in a real run.")
+    examples_parser = subparsers.add_parser("examples", help="Example-row extraction on an example-heavy page.")
+    examples_parser.add_argument("html_files", nargs="*", default=[DEFAULT_HTML_FILE], help="HTML pages to benchmark.")
+    examples_parser.add_argument("--scale", type=int, default=DEFAULT_EXAMPLE_SCALE,
+                                 help="Copies of each example block, to approximate the fullex pages.")
+    triage_parser = subparsers.add_parser("triage", help="Exact vs MinHash-triaged verification of a synthetic corpus.")
+    triage_parser.add_argument("html_files", nargs="*", default=[DEFAULT_HTML_FILE], help="Pages to cut the texts from.")
+    triage_parser.add_argument("--pages", type=int, default=DEFAULT_TRIAGE_PAGES, help="Number of HTML/MDX text pairs.")
+    memo_parser = subparsers.add_parser("memo", help="Conversion batch without and with the cross-page fragment memo.")
+    memo_parser.add_argument("html_files", nargs="*", default=[DEFAULT_HTML_FILE], help="HTML pages in the batch.")
+    memo_parser.add_argument("--passes", type=int, default=DEFAULT_MEMO_PASSES,
+                             help="Times each page is converted in the batch.")
+    nav_parser = subparsers.add_parser("navitems", help="Memory of NavItem storage for a large vocabulary section.")
+    nav_parser.add_argument("--count", type=int, default=DEFAULT_NAV_ITEM_COUNT, help="Number of sidebar items.")
+    for sub in (parse_parser, regions_parser, input_parser, examples_parser, triage_parser, memo_parser, nav_parser):
+        sub.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timing rounds (best is reported).")
+        sub.add_argument("--number", type=int, default=DEFAULT_NUMBER, help="Calls per timing round.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)  # Converter warnings would swamp the report
+
+    all_identical = True
+    if args.benchmark == "parse":
+        for html_file in args.html_files:
+            all_identical &= benchmark_parse(html_file, args.repeat, args.number)
+    elif args.benchmark == "regions":
+        for html_file in args.html_files:
+            all_identical &= benchmark_regions(html_file, args.repeat, args.number)
+    elif args.benchmark == "input":
+        for html_file in args.html_files:
+            html_subdirectory = html_to_mdx_v2.html_subdirectory_for(html_file, os.path.abspath(args.source_root)) \
+                if args.source_root else None
+            all_identical &= benchmark_input(html_file, html_subdirectory, args.repeat, args.number)
+    elif args.benchmark == "examples":
+        for html_file in args.html_files:
+            all_identical &= benchmark_examples(html_file, args.scale, args.repeat, args.number)
+    elif args.benchmark == "triage":
+        for html_file in args.html_files:
+            all_identical &= benchmark_triage(html_file, args.pages, args.repeat)
+    elif args.benchmark == "memo":
+        all_identical = benchmark_memo(args.html_files, args.passes, args.repeat)
+    elif args.benchmark == "navitems":
+        all_identical = benchmark_nav_items(args.count, args.repeat)
+    if not all_identical: raise SystemExit(f"The '{args.benchmark}' benchmark found differing results.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# In-process batch API over html_to_mdx_v2 and html_to_mdx_v10 for tools and test suites that drive many
+# conversions from one warm process: results come back as data, and nothing here configures logging.
+import os
+import time
+import logging
+import contextlib
+from collections import namedtuple, OrderedDict
+import html_to_mdx_v2
+import html_to_mdx_v10
+from conversion_diagnostics import CapturingHandler, DiagnosticsList
+from conversion_journal import content_hash
+from conversion_shards import relative_key
+from docs_store import front_matter_of
+from html_input import read_html_bytes
+from standard_config import load_standard_config, DEFAULT_STANDARD
+
+# --- Configuration Constants ---
+RESULT_CACHE_SIZE = 4096  # Conversions kept per process, keyed by input content and options
+
+# source_root: the HTML tree's root, which decides the page's subdirectory and doc key (default: its own directory).
+# standard: a StandardConfig or a name/path for load_standard_config. dest_dir / search_dir: also write the MDX
+# (and examples JSON) / search page record as the CLI would.
+ConversionOptions = namedtuple("ConversionOptions", ["source_root", "standard", "element_registry", "examples_json",
+                                                     "dest_dir", "search_dir", "cache"],
+                               defaults=(None, DEFAULT_STANDARD, None, False, None, None, True))
+
+# One page's conversion. diagnostics are conversion_diagnostics.Diagnostic records with their message rendered;
+# examples and search_record are None unless requested. A result served from the cache has cache_hit set and
+# convert_seconds 0; its front_matter, examples and diagnostics are shared with earlier results, so treat them as
+# read-only. error is set (and mdx is None) when the page could not be read or converted.
+ConversionResult = namedtuple("ConversionResult", ["path", "doc", "mdx", "front_matter", "diagnostics", "examples",
+                                                   "search_record", "read_seconds", "convert_seconds", "cache_hit",
+                                                   "error"], defaults=(None,))
+
+# One MDX file's sidebar front matter update. cache_hit: the HTML sidebar structures were already parsed.
+# diagnostics: the WARNING+ log messages raised for this file; the first result also carries those of parsing
+# the HTML sidebars.
+FrontMatterResult = namedtuple("FrontMatterResult", ["path", "mdx", "front_matter", "changed", "written", "seconds",
+                                                     "cache_hit", "error", "diagnostics"], defaults=(None, ()))
+
+_result_cache = OrderedDict()  # cache key -> ConversionResult, least recently used first
+_sidebar_cache = {}            # (standard name, abs source_html_root) -> cached_structures, as ConversionServer keeps
+logger = logging.getLogger("conversion_api")
+
+
+def standard_for(standard):
+    return load_standard_config(standard) if isinstance(standard, str) else standard
+
+
+def clear_caches():
+    _result_cache.clear()
+    _sidebar_cache.clear()
+
+
+@contextlib.contextmanager
+def captured_warnings():
+    # html_to_mdx_v10 reports through the root logger; collect what it logs while the block runs
+    capture = CapturingHandler()
+    root_logger = logging.getLogger()
+    root_logger.addHandler(capture)
+    try:
+        yield capture.messages
+    finally:
+        root_logger.removeHandler(capture)
+
+
+def doc_key_for(abs_path, abs_source_dir):
+    # A page outside source_root is keyed by its file name rather than a '../' path
+    rel_path = relative_key(abs_path, abs_source_dir)
+    if rel_path == ".." or rel_path.startswith("../"): rel_path = os.path.basename(abs_path)
+    return os.path.splitext(rel_path)[0]
+
+
+# --- HTML -> MDX ---
+def convert_one(html_file_path, options, standard, log=logger):
+    abs_path = os.path.abspath(html_file_path)
+    abs_source_dir = os.path.abspath(options.source_root or os.path.dirname(abs_path))
+    doc = doc_key_for(abs_path, abs_source_dir)
+    started = time.perf_counter()
+    try:
+        html_content = read_html_bytes(abs_path)
+    except OSError as e:
+        return ConversionResult(html_file_path, doc, None, {}, [], None, None, time.perf_counter() - started, 0.0,
+                                False, str(e))
+    read_seconds = time.perf_counter() - started
+
+    # The registry is part of the key by identity: callers load it once and pass the same object
+    cache_key = (content_hash(html_content), doc, standard.name, options.element_registry, options.examples_json,
+                 options.search_dir is not None)
+    result = _result_cache.get(cache_key) if options.cache else None
+    if result is not None:
+        _result_cache.move_to_end(cache_key)
+        result = result._replace(path=html_file_path, read_seconds=read_seconds, convert_seconds=0.0, cache_hit=True)
+    else:
+        example_dataset = {} if options.examples_json else None
+        search_record = {} if options.search_dir is not None else None
+        found = DiagnosticsList()
+        started = time.perf_counter()
+        try:
+            mdx_output = html_to_mdx_v2.convert_html_to_mdx(
+                html_content, os.path.basename(abs_path), log, html_to_mdx_v2.html_subdirectory_for(abs_path, abs_source_dir),
+                element_registry=options.element_registry, example_dataset=example_dataset, standard=standard,
+                diagnostics=found, search_record=search_record)
+        except Exception as e:
+            return ConversionResult(html_file_path, doc, None, {}, found.diagnostics, None, None, read_seconds,
+                                    time.perf_counter() - started, False, f"{type(e).__name__}: {e}")
+        result = ConversionResult(html_file_path, doc, mdx_output, front_matter_of(mdx_output), found.diagnostics,
+                                  example_dataset, search_record, read_seconds, time.perf_counter() - started, False)
+        if options.cache:
+            _result_cache[cache_key] = result
+            if len(_result_cache) > RESULT_CACHE_SIZE: _result_cache.popitem(last=False)
+
+    if options.dest_dir:
+        try:
+            html_to_mdx_v2.write_page_outputs(html_to_mdx_v2.mdx_path_for(abs_path, abs_source_dir, options.dest_dir),
+                                              options.dest_dir, result.mdx, result.examples, result.search_record,
+                                              options.search_dir)
+        except OSError as e:
+            result = result._replace(error=str(e))
+    return result
+
+
+def convert_many(html_paths, options=None, log=logger):
+    """
+    Converts each HTML file, yielding a ConversionResult per path in order; a page that fails is reported in
+    its result's error instead of raising. Unchanged inputs converted earlier in the process (with the same
+    options) are served from the result cache.
+    """
+    options = options or ConversionOptions()
+    standard = standard_for(options.standard)
+    for html_file_path in html_paths:
+        yield convert_one(html_file_path, options, standard, log)
+
+
+# --- Sidebar front matter ---
+def sidebar_structures_for(source_html_root, standard, reload=False):
+    """The standard's HTML sidebar structures under source_html_root, parsed once per process. Returns (structures, was_cached)."""
+    cache_key = (standard.name, os.path.abspath(source_html_root))
+    was_cached = cache_key in _sidebar_cache and not reload
+    if not was_cached:
+        _sidebar_cache[cache_key] = html_to_mdx_v10.cache_all_html_sidebar_structures(cache_key[1], standard=standard)
+    return _sidebar_cache[cache_key], was_cached
+
+
+def update_frontmatter_many(mdx_paths, source_html_root, target_mdx_root, standard=DEFAULT_STANDARD, write=False,
+                            reload_sidebar=False):
+    """
+    Sets the sidebar front matter of each MDX file from the HTML sidebars, yielding a FrontMatterResult per
+    path with the updated content and the warnings logged for it. Files are only rewritten with write=True,
+    and only when they changed.
+    """
+    standard = standard_for(standard)
+    target_root = os.path.abspath(target_mdx_root)
+    with captured_warnings() as sidebar_warnings:
+        cached, was_cached = sidebar_structures_for(source_html_root, standard, reload_sidebar)
+        main_category_keys = html_to_mdx_v10.main_category_keys_for(target_root, standard)
+    for mdx_path in mdx_paths:
+        mdx_path_abs = os.path.abspath(mdx_path)
+        started = time.perf_counter()
+        # Captured per file, not across the yield, so the caller's own logging is never collected
+        with captured_warnings() as warnings:
+            warnings.extend(sidebar_warnings)
+            sidebar_warnings = []
+            try:
+                with open(mdx_path_abs, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                existing_fm, body_content = html_to_mdx_v10.split_front_matter(content, mdx_path_abs)
+                updated_fm = html_to_mdx_v10.update_sidebar_front_matter(mdx_path_abs, existing_fm, target_root,
+                                                                         main_category_keys, cached, standard)
+                final_content = html_to_mdx_v10.render_front_matter(updated_fm, body_content)
+                changed = final_content != content
+                if write and changed: html_to_mdx_v10.write_mdx_content(mdx_path_abs, final_content)
+                result = FrontMatterResult(mdx_path, final_content, updated_fm, changed, write and changed,
+                                           time.perf_counter() - started, was_cached, diagnostics=warnings)
+            except Exception as e:
+                result = FrontMatterResult(mdx_path, None, {}, False, False, time.perf_counter() - started,
+                                           was_cached, f"{type(e).__name__}: {e}", warnings)
+        yield result
+        was_cached = True
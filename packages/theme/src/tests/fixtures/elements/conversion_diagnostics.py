@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+import json
+import atexit
+import logging
+import multiprocessing
+from collections import namedtuple, Counter
+from logging.handlers import QueueHandler, QueueListener
+
+# --- Configuration Constants ---
+SAMPLE_FILES = 3       # Files listed per aggregated diagnostic
+SNIPPET_CHARS = 100    # Text of the offending element shown when a diagnostic is logged on its own
+SUMMARY_ROWS = 50      # Aggregated diagnostics listed in the end-of-run log; the JSON report has all of them
+
+# One converter finding on a page. fingerprint is the offending element's tag and classes (see
+# element_fingerprint); element itself is only held while the page's tree is alive, for render().
+Diagnostic = namedtuple("Diagnostic", ["code", "file", "fingerprint", "message", "element"], defaults=("", None))
+
+
+def element_fingerprint(element):
+    """'div.seeAlso.px-2': tag name plus classes, without serialising the subtree."""
+    name = getattr(element, 'name', None)
+    if not name: return type(element).__name__
+    return ".".join([name] + list(element.get('class') or []))
+
+
+def element_snippet(element, limit=SNIPPET_CHARS):
+    """The element's opening tag and the start of its text, reading no more of the subtree than limit needs."""
+    if not getattr(element, 'name', None): return str(element)[:limit]
+    attributes = "".join(f' {k}="{" ".join(v) if isinstance(v, list) else v}"' for k, v in element.attrs.items())
+    text, length = [], 0
+    for string in element.strings:
+        text.append(string)
+        length += len(string)
+        if length >= limit: break
+    return f"<{element.name}{attributes}>{' '.join(''.join(text).split())[:limit]}"
+
+
+def render(diagnostic):
+    # The message's {element} placeholder is only filled (and the snippet built) when the diagnostic is logged
+    message = diagnostic.message
+    if diagnostic.element is not None and "{element}" in message:
+        message = message.replace("{element}", element_snippet(diagnostic.element))
+    return f"{diagnostic.file}: {message}" if diagnostic.file else message
+
+
+class DiagnosticsSummary:
+    """
+    Corpus-wide diagnostics: occurrences per (code, fingerprint), the number of files each occurred in and
+    the first SAMPLE_FILES of them. Pool workers send per-page counts (page_counts) for the parent to add.
+    """
+
+    def __init__(self, sample_files=SAMPLE_FILES):
+        self.sample_files = sample_files
+        self.entries = {}  # (code, fingerprint) -> [occurrences, files, sample files]
+
+    def add(self, code, fingerprint, page, occurrences=1):
+        entry = self.entries.setdefault((code, fingerprint), [0, 0, []])
+        entry[0] += occurrences
+        entry[1] += 1
+        if len(entry[2]) < self.sample_files: entry[2].append(page)
+
+    def add_page(self, page, diagnostics):
+        for (code, fingerprint), occurrences in page_counts(diagnostics):
+            self.add(code, fingerprint, page, occurrences)
+
+    def counts(self):
+        # [((code, fingerprint), occurrences)]: for a one-page summary, that page's counts to send to merge()
+        return [(key, entry[0]) for key, entry in self.entries.items()]
+
+    def merge(self, page, counts):
+        for (code, fingerprint), occurrences in counts:
+            self.add(code, fingerprint, page, occurrences)
+
+    def rows(self):
+        return sorted(((code, fingerprint, *entry) for (code, fingerprint), entry in self.entries.items()),
+                      key=lambda row: (-row[2], row[0], row[1]))
+
+    def summary_lines(self, limit=SUMMARY_ROWS):
+        rows = self.rows()
+        if not rows: return ["No conversion diagnostics."]
+        lines = [f"Conversion diagnostics: {len(rows)} kind(s), {sum(r[2] for r in rows)} occurrence(s):"]
+        for code, fingerprint, occurrences, files, samples in rows[:limit]:
+            lines.append(f"  {code}{f' [{fingerprint}]' if fingerprint else ''}: {occurrences} in {files} file(s), "
+                         f"e.g. {', '.join(samples)}")
+        if len(rows) > limit: lines.append(f"  ... and {len(rows) - limit} more kind(s).")
+        return lines
+
+    def write_json(self, report_path):
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump([{"code": code, "fingerprint": fingerprint, "occurrences": occurrences, "files": files,
+                        "sample_files": samples} for code, fingerprint, occurrences, files, samples in self.rows()],
+                      f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+
+class DiagnosticsList:
+    """
+    The diagnostics themselves, for callers that want them as data (conversion_api): each one's message is
+    rendered and its element dropped as it is added, so the list outlives the page's tree. Takes the place
+    of a DiagnosticsSummary wherever the converter accepts one.
+    """
+
+    def __init__(self):
+        self.diagnostics = []
+
+    def add_page(self, page, diagnostics):
+        for d in diagnostics:
+            self.diagnostics.append(d._replace(file=page or d.file, message=render(d._replace(file="")), element=None))
+
+
+def page_counts(diagnostics):
+    """[((code, fingerprint), occurrences)] for one page's diagnostics: small enough to send between processes."""
+    return list(Counter((d.code, d.fingerprint) for d in diagnostics).items())
+
+
+def report_diagnostics(diagnostics, logger, summary=None, page=None):
+    """
+    Without a summary, logs each distinct diagnostic of a page at WARNING, as the converter always has. With
+    one, the page's diagnostics are counted there for the end-of-run report and logged one by one only at DEBUG.
+    """
+    if summary is None:
+        for message in dict.fromkeys(render(d) for d in diagnostics): logger.warning(message)
+        return
+    summary.add_page(page, diagnostics)
+    if logger.isEnabledFor(logging.DEBUG):
+        for message in dict.fromkeys(render(d) for d in diagnostics): logger.debug(message)
+
+
+def log_diagnostics_summary(summary, logger=None):
+    level = logging.WARNING if summary.entries else logging.INFO
+    for line in summary.summary_lines(): (logger or logging).log(level, line)
+
+
+class CapturingHandler(logging.Handler):
+    # Collects WARNING+ records raised while one request or file is handled, so they can be returned as data
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+# --- Queued Logging ---
+def start_queued_logging(handlers, level=logging.INFO, log_queue=None):
+    """
+    Routes the root logger through a QueueHandler; handlers (file, console) format and write on a
+    QueueListener thread, so converting code never waits on them. The queue is a multiprocessing queue,
+    which pool workers log into too (see attach_log_queue). The listener is flushed and stopped at exit.
+    Returns the queue.
+    """
+    log_queue = log_queue or multiprocessing.get_context().Queue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root = logging.getLogger()
+    for handler in list(root.handlers): root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+    listener.start()
+    atexit.register(listener.stop)
+    return log_queue
+
+
+def attach_log_queue(log_queue, level=logging.INFO):
+    # In a pool worker: send records to the parent's listener (replaces handlers inherited through fork)
+    root = logging.getLogger()
+    for handler in list(root.handlers): root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
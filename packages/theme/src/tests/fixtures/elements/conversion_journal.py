@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+from conversion_shards import relative_key
+
+# --- Configuration Constants ---
+DEFAULT_FSYNC_BATCH = 64          # Journal records written between fsyncs
+DEFAULT_FSYNC_INTERVAL = 2.0      # Max seconds a written record may wait for its fsync
+TAIL_SCAN_BYTES = 65536           # Block read backwards when looking for the journal's last complete line
+
+
+def content_hash(content):
+    # Raw page bytes are hashed as they are and text as UTF-8, so a UTF-8 page hashes the same either way
+    return hashlib.sha1(content.encode('utf-8') if isinstance(content, str) else content).hexdigest()
+
+
+class ProgressJournal:
+    """
+    Append-only JSON-lines record of finished files: relative path, content hash and outcome. Records are
+    flushed and fsynced in batches (every fsync_batch records or fsync_interval seconds, and on close) by a
+    background thread, so converting threads never wait on the disk; a killed run loses at most one batch,
+    which --resume then simply redoes.
+    """
+
+    def __init__(self, journal_path, root, resume=False, fsync_batch=DEFAULT_FSYNC_BATCH,
+                 fsync_interval=DEFAULT_FSYNC_INTERVAL):
+        self.journal_path = journal_path
+        self.root = os.path.abspath(root)
+        if resume: drop_torn_tail(journal_path)
+        self.completed = load_journal(journal_path) if resume else {}
+        self.fsync_batch = max(1, fsync_batch)
+        self.fsync_interval = fsync_interval
+        self.pending = 0
+        self.lock = threading.Lock()  # The async pipelines record from I/O worker threads
+        self.wake = threading.Event()  # Set when a batch is full or the journal closes
+        self.closing = False
+        os.makedirs(os.path.dirname(os.path.abspath(journal_path)), exist_ok=True)
+        self.file = open(journal_path, 'a' if resume else 'w', encoding='utf-8')
+        self.syncer = threading.Thread(target=self._sync_loop, name="journal-fsync", daemon=True)
+        self.syncer.start()
+        if resume:
+            done = sum(1 for entry in self.completed.values() if entry["status"] == "ok")
+            logging.info(f"Resuming from {journal_path}: {done} file(s) already done, "
+                         f"{len(self.completed) - done} failure(s) to retry.")
+
+    def is_done(self, path, digest):
+        """True when the last journal entry for path succeeded for content with this hash."""
+        return digest is not None and self.done_hash(path) == digest
+
+    def done_hash(self, path):
+        """Content hash of the last successful run of path, None if it has not succeeded yet."""
+        entry = self.completed.get(relative_key(path, self.root))
+        return entry["hash"] if entry and entry["status"] == "ok" else None
+
+    def record(self, path, digest, status, error=None):
+        entry = {"path": relative_key(path, self.root), "hash": digest, "status": status, "time": round(time.time(), 3)}
+        if error: entry["error"] = str(error)
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.pending += 1
+            if self.pending >= self.fsync_batch: self.wake.set()
+
+    def _sync_loop(self):
+        # Wakes for a full batch, or every fsync_interval for whatever was recorded since the last sync
+        while True:
+            self.wake.wait(self.fsync_interval)
+            self.wake.clear()
+            if self.closing: return
+            self._sync()
+
+    def _sync(self):
+        with self.lock:
+            if not self.pending or self.file.closed: return
+            self.file.flush()
+            self.pending = 0
+        os.fsync(self.file.fileno())  # Outside the lock: records keep going into the buffer meanwhile
+
+    def close(self):
+        if self.file.closed: return
+        self.closing = True
+        self.wake.set()
+        self.syncer.join()
+        with self.lock:
+            if self.file.closed: return
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def drop_torn_tail(journal_path):
+    """
+    Truncates the journal after its last newline, so a line torn by a killed run is neither read back nor
+    glued to the next record appended on resume. The file that line was for is simply redone.
+    """
+    if not os.path.exists(journal_path): return
+    with open(journal_path, 'r+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            block_start = max(0, position - TAIL_SCAN_BYTES)
+            f.seek(block_start)
+            newline = f.read(position - block_start).rfind(b"\n")
+            if newline != -1:
+                position = block_start + newline + 1
+                break
+            position = block_start
+        if position < end:
+            logging.warning(f"Dropping a torn final line ({end - position} bytes) from journal {journal_path}.")
+            f.truncate(position)
+
+
+def load_journal(journal_path):
+    """Last entry per relative path. A torn final line (the run was killed mid-write) is ignored."""
+    entries = {}
+    if not os.path.exists(journal_path): return entries
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logging.warning(f"Ignoring unreadable line {line_number} of journal {journal_path}.")
+                continue
+            entries[entry["path"]] = entry
+    return entries
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Configuration Constants ---
+DEFAULT_PREFETCH = 8        # Inputs read ahead of the converter (bounded read queue)
+DEFAULT_WRITE_BEHIND = 8    # Converted outputs waiting to be written (bounded write queue)
+DEFAULT_IO_WORKERS = 4      # Concurrent blocking reads/writes handed to the I/O thread pool
+
+_QUEUE_DONE = object()
+
+
+class PipelineStats:
+    def __init__(self):
+        self.files_ok = 0
+        self.files_failed = 0
+        self.read_seconds = 0.0           # Time spent inside read_fn calls (summed over I/O workers)
+        self.convert_seconds = 0.0        # Time spent inside convert_fn calls
+        self.write_seconds = 0.0          # Time spent inside write_fn calls (summed over I/O workers)
+        self.convert_input_wait_seconds = 0.0   # Converter idle, waiting for a prefetched input
+        self.convert_output_wait_seconds = 0.0  # Converter blocked on a full write queue (backpressure)
+        self.wall_seconds = 0.0
+
+    def summary_lines(self):
+        busy = self.convert_seconds or 1e-9
+        return [
+            f"Pipeline finished in {self.wall_seconds:.2f}s: {self.files_ok} ok, {self.files_failed} failed.",
+            f"  CPU (convert): {self.convert_seconds:.2f}s; I/O: read {self.read_seconds:.2f}s, write {self.write_seconds:.2f}s.",
+            f"  Converter waited {self.convert_input_wait_seconds:.2f}s on input and "
+            f"{self.convert_output_wait_seconds:.2f}s on output backpressure "
+            f"({(self.convert_input_wait_seconds + self.convert_output_wait_seconds) / busy:.0%} of convert time).",
+        ]
+
+
+async def _run_pipeline(jobs, read_fn, convert_fn, write_fn, prefetch, write_behind, io_workers,
+                        convert_executor, on_error, stats):
+    loop = asyncio.get_running_loop()
+    io_executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="pipeline-io")
+    read_queue = asyncio.Queue(maxsize=max(1, prefetch))
+    write_queue = asyncio.Queue(maxsize=max(1, write_behind))
+    job_iter = iter(jobs)
+
+    def fail(job, stage, exc):
+        stats.files_failed += 1
+        if on_error: on_error(job, stage, exc)
+
+    async def timed(executor, fn, *fn_args):
+        started = time.perf_counter()
+        result = await loop.run_in_executor(executor, fn, *fn_args)
+        return result, time.perf_counter() - started
+
+    async def reader():
+        for job in job_iter:  # Readers share one iterator, so each job is read exactly once
+            try:
+                data, elapsed = await timed(io_executor, read_fn, job)
+                stats.read_seconds += elapsed
+            except Exception as e:
+                fail(job, "read", e); continue
+            await read_queue.put((job, data))
+
+    async def converter():
+        while True:
+            waited = time.perf_counter()
+            item = await read_queue.get()
+            stats.convert_input_wait_seconds += time.perf_counter() - waited
+            if item is _QUEUE_DONE: return
+            job, data = item
+            try:
+                result, elapsed = await timed(convert_executor, convert_fn, job, data)
+                stats.convert_seconds += elapsed
+            except Exception as e:
+                fail(job, "convert", e); continue
+            waited = time.perf_counter()
+            await write_queue.put((job, result))
+            stats.convert_output_wait_seconds += time.perf_counter() - waited
+
+    async def writer():
+        while True:
+            item = await write_queue.get()
+            if item is _QUEUE_DONE: return
+            job, result = item
+            try:
+                _, elapsed = await timed(io_executor, write_fn, job, result)
+                stats.write_seconds += elapsed
+                stats.files_ok += 1
+            except Exception as e:
+                fail(job, "write", e)
+
+    try:
+        readers = [asyncio.create_task(reader()) for _ in range(max(1, io_workers))]
+        converter_task = asyncio.create_task(converter())
+        writers = [asyncio.create_task(writer()) for _ in range(max(1, io_workers))]
+        await asyncio.gather(*readers)
+        await read_queue.put(_QUEUE_DONE)
+        await converter_task
+        for _ in writers: await write_queue.put(_QUEUE_DONE)
+        await asyncio.gather(*writers)
+    finally:
+        io_executor.shutdown(wait=True)
+
+
+def run_pipeline(jobs, read_fn, convert_fn, write_fn, prefetch=DEFAULT_PREFETCH, write_behind=DEFAULT_WRITE_BEHIND,
+                 io_workers=DEFAULT_IO_WORKERS, convert_executor=None, on_error=None):
+    """
+    Runs read_fn(job) -> convert_fn(job, data) -> write_fn(job, result) over jobs with overlapping I/O.
+    Reads run up to `prefetch` inputs ahead of the converter and writes trail it by up to `write_behind`
+    outputs; both queues are bounded so a slow stage applies backpressure. read_fn/write_fn run in an I/O
+    thread pool, convert_fn in convert_executor (a single worker thread by default, so conversion stays
+    sequential). on_error(job, stage, exc) is called for failures; the job is then skipped.
+    """
+    stats = PipelineStats()
+    owns_executor = convert_executor is None
+    if owns_executor: convert_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-convert")
+    started = time.perf_counter()
+    try:
+        asyncio.run(_run_pipeline(jobs, read_fn, convert_fn, write_fn, prefetch, write_behind, io_workers,
+                                  convert_executor, on_error, stats))
+    finally:
+        if owns_executor: convert_executor.shutdown(wait=True)
+        stats.wall_seconds = time.perf_counter() - started
+    return stats
+
+
+def log_pipeline_stats(stats, logger=None):
+    for line in stats.summary_lines():
+        (logger or logging).info(line)
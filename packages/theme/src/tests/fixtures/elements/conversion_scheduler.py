@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+import gc
+import os
+import sys
+import time
+import logging
+import multiprocessing
+import multiprocessing.connection
+from collections import namedtuple
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+from conversion_shards import relative_key, load_manifest
+
+# --- Configuration Constants ---
+DEFAULT_WORKERS = os.cpu_count() or 1
+CHUNKS_PER_WORKER = 4   # Target chunk cost is the total estimated cost / (workers * CHUNKS_PER_WORKER)
+MAX_CHUNK_FILES = 32    # Cap on the number of small files batched into one chunk
+
+# One converted file as reported by a pool worker. status is "ok", "skipped" or "failed". diagnostics are the
+# page's diagnostic counts (conversion_diagnostics.DiagnosticsSummary.counts) when the run aggregates them;
+# fragment_memo the worker's fragment memo counts for the page (fragment_memo.FragmentMemo.counts).
+JobResult = namedtuple("JobResult", ["path", "status", "seconds", "digest", "error", "diagnostics", "fragment_memo"],
+                       defaults=(None, None))
+ChunkRun = namedtuple("ChunkRun", ["worker", "started", "finished", "results"])
+
+
+# --- Cost Estimates ---
+def load_previous_timings(manifest_paths, root):
+    """Per-file convert seconds {rel path: seconds} recorded in earlier runs' manifests. Unreadable manifests are skipped."""
+    timings = {}
+    for manifest_path in manifest_paths:
+        try:
+            manifest = load_manifest(manifest_path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring timings from {manifest_path}: {e}")
+            continue
+        for rel_path, result in manifest.get("results", {}).items():
+            if "seconds" in result: timings[rel_path] = result["seconds"]
+    return timings
+
+
+def estimate_costs(paths, root, previous_timings=None):
+    """
+    Expected cost per path: the previous run's convert seconds where known, otherwise the input size. Sizes of
+    files without a timing are scaled by the observed seconds per byte, so both kinds of estimate compare.
+    """
+    sizes = [os.path.getsize(p) for p in paths]
+    if not previous_timings: return sizes
+    keys = [relative_key(p, root) for p in paths]
+    timed = [(previous_timings[k], size) for k, size in zip(keys, sizes) if k in previous_timings]
+    if not timed: return sizes
+    seconds_per_byte = sum(t for t, _ in timed) / max(1, sum(size for _, size in timed))
+    return [previous_timings.get(k, size * seconds_per_byte) for k, size in zip(keys, sizes)]
+
+
+def plan_chunks(jobs, costs, workers, chunks_per_worker=CHUNKS_PER_WORKER, max_chunk_files=MAX_CHUNK_FILES):
+    """
+    Longest-job-first chunks: jobs sorted by descending cost, each job costing at least the target chunk cost
+    on its own, cheaper jobs batched up to it. Dispatched in this order the largest pages start first and the
+    small chunks fill in at the end, instead of one worker finishing a large page while the others sit idle.
+    """
+    order = sorted(range(len(jobs)), key=lambda i: costs[i], reverse=True)
+    target = sum(costs) / max(1, workers * chunks_per_worker)
+    chunks, current, current_cost = [], [], 0
+    for i in order:
+        if costs[i] >= target:
+            chunks.append([jobs[i]])
+            continue
+        current.append(jobs[i])
+        current_cost += costs[i]
+        if current_cost >= target or len(current) >= max_chunk_files:
+            chunks.append(current)
+            current, current_cost = [], 0
+    if current: chunks.append(current)
+    return chunks
+
+
+# --- Worker Memory ---
+def current_rss_kib():
+    """Resident set size of this process in KiB: /proc on Linux, otherwise the peak so far as an upper bound."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        return peak_rss_kib()
+
+
+def peak_rss_kib():
+    if resource is None: return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # Bytes on macOS, KiB elsewhere
+
+
+# --- Pool Execution ---
+class WorkerStats:
+    def __init__(self):
+        self.chunks = 0
+        self.files = 0
+        self.busy_seconds = 0.0
+        self.last_finished = 0.0  # Wall clock time the worker completed its last chunk
+        self.peak_rss_kib = 0
+        self.exit_reason = None   # Why the process stopped: "done", "files", "rss" or "died"
+
+
+class PoolStats:
+    def __init__(self, workers):
+        self.workers = workers
+        self.files_ok = 0       # Converted or skipped as already done
+        self.files_failed = 0
+        self.started = time.time()
+        self.wall_seconds = 0.0
+        self.per_worker = {}    # worker pid -> WorkerStats
+
+    def worker(self, pid):
+        return self.per_worker.setdefault(pid, WorkerStats())
+
+    def add_chunk(self, chunk_run):
+        if chunk_run.worker is not None:  # None: the chunk was lost with its worker
+            worker = self.worker(chunk_run.worker)
+            worker.chunks += 1
+            worker.files += len(chunk_run.results)
+            worker.busy_seconds += chunk_run.finished - chunk_run.started
+            worker.last_finished = max(worker.last_finished, chunk_run.finished)
+        for result in chunk_run.results:
+            if result.status == "failed": self.files_failed += 1
+            else: self.files_ok += 1
+
+    def summary_lines(self):
+        wall = self.wall_seconds or 1e-9
+        busy = sum(w.busy_seconds for w in self.per_worker.values())
+        recycled = sum(1 for w in self.per_worker.values() if w.exit_reason in ("files", "rss"))
+        peak = max((w.peak_rss_kib for w in self.per_worker.values()), default=0)
+        lines = [f"Pool finished in {self.wall_seconds:.2f}s on {self.workers} worker(s): {self.files_ok} ok, "
+                 f"{self.files_failed} failed. Utilisation {busy / (wall * self.workers):.0%}. "
+                 f"{len(self.per_worker)} worker process(es), {recycled} recycled, highest peak RSS {peak / 1024:.1f} MiB."]
+        for pid, worker in sorted(self.per_worker.items(), key=lambda item: item[1].last_finished):
+            memory = f"peak RSS {worker.peak_rss_kib / 1024:.1f} MiB, exit: {worker.exit_reason or 'unknown'}"
+            if not worker.chunks:
+                lines.append(f"  worker {pid}: no chunks (started after the queue ran dry), {memory}")
+                continue
+            lines.append(f"  worker {pid}: {worker.files} file(s) in {worker.chunks} chunk(s), busy "
+                         f"{worker.busy_seconds:.2f}s ({worker.busy_seconds / wall:.0%}), "
+                         f"done after {worker.last_finished - self.started:.2f}s, {memory}")
+        if self.per_worker:
+            finishes = [w.last_finished for w in self.per_worker.values() if w.chunks]
+            if finishes:
+                lines.append(f"  Tail: the last worker finished {max(finishes) - min(finishes):.2f}s after the first ran out of work.")
+        return lines
+
+
+def _worker_main(task_queue, connection, chunk_fn, initializer, initargs, recycle_after_files, max_rss_kib):
+    """
+    Pool worker process: runs chunks from task_queue until it gets None, or until it has converted
+    recycle_after_files files or its RSS exceeds max_rss_kib, when it exits and run_pool starts a fresh one.
+    Reports go through its own pipe, whose sends complete before the next chunk starts, so a worker that is
+    killed mid-chunk has always announced which chunk it was on.
+    """
+    pid = os.getpid()
+    if initializer: initializer(*initargs)
+    gc.freeze()  # The warmed-up registry, caches and modules are never garbage, so later collections skip them
+    files_done, exit_reason = 0, "done"
+    for index, chunk in iter(task_queue.get, None):
+        connection.send(("started", index))
+        started = time.time()
+        try:
+            chunk_run, error = ChunkRun(pid, started, None, chunk_fn(chunk)), None
+        except Exception as e:
+            chunk_run, error = None, f"worker: {e}"
+        if chunk_run: chunk_run = chunk_run._replace(finished=time.time())
+        connection.send(("finished", index, chunk_run, error))
+        files_done += len(chunk)
+        if recycle_after_files and files_done >= recycle_after_files:
+            exit_reason = "files"
+            break
+        if max_rss_kib and current_rss_kib() > max_rss_kib:
+            exit_reason = "rss"
+            break
+    connection.send(("exited", peak_rss_kib(), exit_reason))
+    connection.close()
+
+
+def run_pool(chunks, chunk_fn, workers=DEFAULT_WORKERS, initializer=None, initargs=(), on_results=None, job_path=None,
+             recycle_after_files=None, max_worker_rss_mb=None):
+    """
+    Runs chunk_fn(chunk) -> [JobResult] for every chunk on worker processes. Chunks are queued in list order
+    (plan_chunks puts the costliest first) and idle workers take the next one. on_results(results) runs in
+    this process as chunks complete. A worker is replaced by a fresh process after recycle_after_files files
+    or once its RSS exceeds max_worker_rss_mb, which keeps memory flat on large trees. If a chunk fails or its
+    worker dies, its jobs are reported failed; job_path(job) maps a job to the path used for them. Returns
+    PoolStats with per-worker utilisation and peak RSS.
+    """
+    stats = PoolStats(workers)
+    context = multiprocessing.get_context()
+    task_queue = context.Queue()
+    for index, chunk in enumerate(chunks): task_queue.put((index, chunk))
+    for _ in range(workers): task_queue.put(None)  # Live workers never outnumber workers, so one stop each suffices
+    max_rss_kib = max_worker_rss_mb * 1024 if max_worker_rss_mb else None
+    live = {}  # reader connection -> [process, index of the chunk it is working on or None]
+    remaining, untaken = len(chunks), len(chunks)
+
+    def start_worker():
+        reader, writer = context.Pipe(duplex=False)
+        process = context.Process(target=_worker_main, daemon=True,
+                                  args=(task_queue, writer, chunk_fn, initializer, initargs,
+                                        recycle_after_files, max_rss_kib))
+        process.start()
+        writer.close()  # The worker now holds the only write end: end of file on reader means it has gone
+        live[reader] = [process, None]
+
+    def report(chunk_run):
+        nonlocal remaining
+        stats.add_chunk(chunk_run)
+        if on_results: on_results(chunk_run.results)
+        remaining -= 1
+
+    def failed_chunk(index, error):
+        results = [JobResult(job_path(job) if job_path else job, "failed", 0.0, None, error) for job in chunks[index]]
+        return ChunkRun(None, None, None, results)
+
+    for _ in range(min(workers, len(chunks))): start_worker()
+    while live:
+        for reader in multiprocessing.connection.wait(list(live)):
+            process, running = live[reader]
+            worker = stats.worker(process.pid)
+            try:
+                message = reader.recv()
+            except EOFError:
+                del live[reader]
+                reader.close()
+                process.join()
+                if worker.exit_reason is None:  # Gone without reporting: crashed or killed
+                    worker.exit_reason = "died"
+                    if running is None and not worker.chunks:
+                        raise RuntimeError(f"Pool worker {process.pid} exited with code {process.exitcode} "
+                                           f"before taking any work.")
+                    if running is not None:
+                        report(failed_chunk(running, f"worker: process exited with code {process.exitcode}"))
+                    if untaken: start_worker()
+                continue
+            if message[0] == "started":
+                live[reader][1] = message[1]
+                untaken -= 1
+            elif message[0] == "finished":
+                index, chunk_run, error = message[1:]
+                live[reader][1] = None
+                report(chunk_run or failed_chunk(index, error))
+            elif message[0] == "exited":
+                worker.peak_rss_kib, worker.exit_reason = message[1:]
+                if untaken and worker.exit_reason != "done": start_worker()
+    if remaining: logging.error(f"Pool stopped with {remaining} chunk(s) unaccounted for.")
+    stats.wall_seconds = time.time() - stats.started
+    return stats
+
+
+def log_pool_stats(stats, logger=None):
+    for line in stats.summary_lines():
+        (logger or logging).info(line)
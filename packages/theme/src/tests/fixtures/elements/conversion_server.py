@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+import io
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import contextlib
+import socketserver
+
+import html_to_mdx_v2
+import html_to_mdx_v10
+import verify_mdx_conversion
+from conversion_diagnostics import CapturingHandler
+from element_registry import load_element_registry
+from html_input import read_html_bytes
+from standard_config import load_standard_config, DEFAULT_STANDARD
+
+# --- Configuration Constants ---
+DEFAULT_LOG_FILE = "conversion_server.log"
+DEFAULT_DIV_SELECTOR = "div.col-md-7.border.rounded"
+
+
+class RequestError(Exception):
+    pass
+
+
+class ConversionServer:
+    """
+    Long-lived state for the JSON-lines protocol: the conversion logger, element registries and the
+    sidebar structures parsed per HTML source root stay loaded between requests.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("conversion_server.convert")
+        self.sidebar_caches = {}  # (standard name, abs source_html_root) -> cached_structures
+        self.requests_handled = 0
+        self.handlers = {
+            "ping": self.handle_ping,
+            "convert-file": self.handle_convert_file,
+            "update-frontmatter": self.handle_update_frontmatter,
+            "verify-pair": self.handle_verify_pair,
+            "reload-sidebar": self.handle_reload_sidebar,
+        }
+
+    # --- Request handlers ---
+    def handle_ping(self, request):
+        return {"pid": os.getpid(), "requests_handled": self.requests_handled,
+                "sidebar_roots": [f"{name}:{root}" for name, root in sorted(self.sidebar_caches)]}
+
+    def handle_convert_file(self, request):
+        source = require(request, "source")
+        source_root = os.path.abspath(request.get("source_root") or os.path.dirname(source))
+        registry_csv = request.get("element_registry")
+        element_registry = load_element_registry(registry_csv, request.get("sheet_snapshot_dir")) if registry_csv else None
+        html_content = read_html_bytes(source)
+        mdx_output = html_to_mdx_v2.convert_html_to_mdx(
+            html_content, os.path.basename(source), self.logger,
+            html_to_mdx_v2.html_subdirectory_for(source, source_root), element_registry=element_registry,
+            standard=standard_for(request))
+        dest = request.get("dest")
+        if dest:
+            html_to_mdx_v2.write_mdx_file(dest, mdx_output)
+            return {"dest": dest, "bytes": len(mdx_output.encode('utf-8'))}
+        return {"mdx": mdx_output}
+
+    def sidebar_cache_for(self, source_html_root, standard, reload=False):
+        cache_key = (standard.name, os.path.abspath(source_html_root))
+        if reload or cache_key not in self.sidebar_caches:
+            self.sidebar_caches[cache_key] = html_to_mdx_v10.cache_all_html_sidebar_structures(cache_key[1],
+                                                                                              standard=standard)
+        return self.sidebar_caches[cache_key]
+
+    def handle_reload_sidebar(self, request):
+        cached = self.sidebar_cache_for(require(request, "source_html_root"), standard_for(request), reload=True)
+        return {"sections": {key: len(items) for key, items in cached.items()}}
+
+    def handle_update_frontmatter(self, request):
+        mdx_path = os.path.abspath(require(request, "path"))
+        target_root = os.path.abspath(require(request, "target_mdx_root"))
+        standard = standard_for(request)
+        cached = self.sidebar_cache_for(require(request, "source_html_root"), standard)
+        main_category_keys = html_to_mdx_v10.main_category_keys_for(target_root, standard)
+        existing_fm, body_content = html_to_mdx_v10.read_front_matter(mdx_path)
+        updated_fm = html_to_mdx_v10.update_sidebar_front_matter(mdx_path, existing_fm, target_root, main_category_keys,
+                                                                 cached, standard)
+        if not request.get("dry_run"):
+            html_to_mdx_v10.write_front_matter(mdx_path, updated_fm, body_content, target_mdx_root_abs=target_root)
+        return {"path": mdx_path, "front_matter": updated_fm, "written": not request.get("dry_run")}
+
+    def handle_verify_pair(self, request):
+        html_path, mdx_path = require(request, "html"), require(request, "mdx")
+        # The verifier reports through print(); keep that off the protocol stream and return it instead
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            html_text = verify_mdx_conversion.get_text_from_div(
+                html_path, request.get("div_type", "selector"), request.get("div_value", DEFAULT_DIV_SELECTOR))
+            mdx_text = verify_mdx_conversion.get_text_from_mdx(mdx_path)
+            if html_text is not None and mdx_text is not None:
+                verify_mdx_conversion.compare_and_report(html_text, mdx_text, os.path.basename(html_path),
+                                                         os.path.basename(mdx_path))
+        if html_text is None or mdx_text is None:
+            raise RequestError(printed.getvalue().strip() or "Could not read HTML or MDX file.")
+        return {"match": html_text == mdx_text, "html_length": len(html_text), "mdx_length": len(mdx_text),
+                "report": printed.getvalue()}
+
+    # --- Dispatch ---
+    def handle_line(self, line):
+        """Handles one JSON request line and returns the JSON response line (without newline)."""
+        request_id = None
+        started = time.perf_counter()
+        capture = CapturingHandler()
+        root_logger = logging.getLogger()
+        root_logger.addHandler(capture)
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict): raise RequestError("Request must be a JSON object.")
+            request_id = request.get("id")
+            handler = self.handlers.get(request.get("op"))
+            if not handler: raise RequestError(f"Unknown op '{request.get('op')}'.")
+            response = {"id": request_id, "ok": True, "result": handler(request)}
+        except (RequestError, json.JSONDecodeError, OSError) as e:
+            response = {"id": request_id, "ok": False, "error": str(e)}
+        except Exception as e:
+            logging.error(f"Unhandled error for request {request_id}: {e}", exc_info=True)
+            response = {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        finally:
+            root_logger.removeHandler(capture)
+        self.requests_handled += 1
+        response["warnings"] = capture.messages
+        response["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return json.dumps(response, ensure_ascii=False, default=str)
+
+    def serve_stream(self, in_stream, out_stream):
+        for line in in_stream:
+            line = line.strip()
+            if not line: continue
+            if json_op(line) == "shutdown":
+                out_stream.write(json.dumps({"id": json_id(line), "ok": True, "result": "bye"}) + "\n")
+                out_stream.flush()
+                return True
+            out_stream.write(self.handle_line(line) + "\n")
+            out_stream.flush()
+        return False
+
+
+def require(request, key):
+    value = request.get(key)
+    if not value: raise RequestError(f"Missing required field '{key}'.")
+    return value
+
+
+def standard_for(request):
+    # Optional "standard": a name from standard_configs/ or a config path; configs are cached by standard_config
+    try:
+        return load_standard_config(request.get("standard") or DEFAULT_STANDARD)
+    except (OSError, ValueError) as e:
+        raise RequestError(f"Unknown standard '{request.get('standard')}': {e}")
+
+
+def json_op(line):
+    try:
+        request = json.loads(line)
+        return request.get("op") if isinstance(request, dict) else None
+    except json.JSONDecodeError:
+        return None
+
+
+def json_id(line):
+    try:
+        return json.loads(line).get("id")
+    except (json.JSONDecodeError, AttributeError):
+        return None
+
+
+def serve_unix_socket(server, socket_path):
+    # Connections are served one at a time so the warm caches never see concurrent mutation
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            in_stream = io.TextIOWrapper(self.rfile, encoding='utf-8')
+            out_stream = io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True)
+            if server.serve_stream(in_stream, out_stream):
+                self.server.shutdown_requested = True
+
+    if os.path.exists(socket_path): os.unlink(socket_path)
+    with socketserver.UnixStreamServer(socket_path, Handler) as unix_server:
+        unix_server.shutdown_requested = False
+        logging.info(f"Listening on {socket_path}")
+        try:
+            while not unix_server.shutdown_requested:
+                unix_server.handle_request()
+        finally:
+            os.unlink(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve HTML->MDX conversion, sidebar front matter and verification over JSON lines.")
+    parser.add_argument("--socket", help="Listen on this Unix socket path instead of stdin/stdout.")
+    parser.add_argument("--log_file", default=DEFAULT_LOG_FILE, help="File to store server logs.")
+    parser.add_argument("--log_level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="Logging level.")
+    parser.add_argument("--preload_sidebar", help="HTML source root whose sidebar structures are parsed at startup.")
+    parser.add_argument("--standard", default=DEFAULT_STANDARD,
+                        help="Standard of the --preload_sidebar root: a name from standard_configs/ or a config YAML path.")
+    args = parser.parse_args()
+    # Logs go to the file and stderr only; stdout carries the protocol in stdio mode
+    logging.basicConfig(level=getattr(logging, args.log_level), format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+                        handlers=[logging.FileHandler(args.log_file, mode='w', encoding='utf-8'), logging.StreamHandler(sys.stderr)])
+    server = ConversionServer()
+    if args.preload_sidebar: server.sidebar_cache_for(args.preload_sidebar, load_standard_config(args.standard))
+    if args.socket:
+        serve_unix_socket(server, args.socket)
+    else:
+        protocol_out = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):  # Stray print() calls must not corrupt the protocol stream
+            server.serve_stream(sys.stdin, protocol_out)
+    logging.info(f"Server stopped after {server.requests_handled} request(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+
+# --- Configuration Constants ---
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST_FILE = "conversion_manifest.json"
+DEFAULT_SUMMARY_FILE = "conversion_summary.json"
+
+
+def parse_shard_spec(spec):
+    """Parses 'i/N' (1-based, as CI matrices count) into (i, N). Usable as an argparse type."""
+    try:
+        index_str, count_str = spec.split("/")
+        shard = (int(index_str), int(count_str))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shard must look like 'i/N', got '{spec}'.")
+    if not 1 <= shard[0] <= shard[1]:
+        raise argparse.ArgumentTypeError(f"Shard index must be between 1 and N, got '{spec}'.")
+    return shard
+
+
+def format_shard(shard):
+    return f"{shard[0]}/{shard[1]}"
+
+
+def relative_key(path, root):
+    # Manifests and hashing use '/'-separated paths relative to the run root, so every runner agrees on them
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+
+def shard_index_for(rel_path, shard_count):
+    # SHA-1 rather than hash(): the assignment must not change between machines or Python processes
+    digest = hashlib.sha1(rel_path.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count + 1
+
+
+def select_shard(paths, root, shard):
+    """The paths (in their original order) that belong to shard (i, N); all paths when shard is None."""
+    if shard is None: return list(paths)
+    return [p for p in paths if shard_index_for(relative_key(p, root), shard[1]) == shard[0]]
+
+
+def file_list_digest(rel_paths):
+    return hashlib.sha1("\n".join(sorted(rel_paths)).encode('utf-8')).hexdigest()
+
+
+def shard_suffixed(path, shard):
+    """'conversion_log.txt' -> 'conversion_log.shard-2-of-4.txt' for shard (2, 4); path unchanged without a shard."""
+    if shard is None: return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.shard-{shard[0]}-of-{shard[1]}{ext}"
+
+
+class ShardManifest:
+    """
+    Result manifest of one (possibly sharded) run: what was discovered, what this shard was assigned and
+    the outcome per file. conversion_shards.py merge checks a set of these for full, non-overlapping coverage.
+    """
+
+    def __init__(self, tool, root, shard, discovered_paths, assigned_paths):
+        self.tool = tool
+        self.root = os.path.abspath(root)
+        self.shard = shard or (1, 1)
+        discovered = [relative_key(p, self.root) for p in discovered_paths]
+        self.discovered_count = len(discovered)
+        self.discovered_digest = file_list_digest(discovered)
+        self.assigned = [relative_key(p, self.root) for p in assigned_paths]
+        self.results = {}  # rel path -> {"status": "ok" | "failed", ...}
+        self.started = time.time()
+
+    def record(self, path, status, output=None, error=None, seconds=None):
+        entry = {"status": status}
+        if output: entry["output"] = output
+        if error: entry["error"] = str(error)
+        if seconds is not None: entry["seconds"] = round(seconds, 4)  # Convert time, used to schedule the next run
+        self.results[relative_key(path, self.root)] = entry
+
+    def to_dict(self):
+        return {
+            "version": MANIFEST_VERSION, "tool": self.tool, "root": self.root,
+            "shard": list(self.shard), "discovered_count": self.discovered_count,
+            "discovered_digest": self.discovered_digest, "assigned": self.assigned, "results": self.results,
+            "elapsed_seconds": round(time.time() - self.started, 3),
+        }
+
+    def write(self, manifest_path):
+        os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        logging.info(f"Wrote manifest for shard {format_shard(self.shard)} to {manifest_path} "
+                     f"({len(self.results)}/{len(self.assigned)} file(s) recorded)")
+
+
+# --- Merging ---
+def merge_manifests(manifests):
+    """
+    Combines shard manifest dicts into a global summary. Returns (summary, problems); problems lists coverage
+    errors (missing or duplicated shards and files, files in the wrong shard, mismatched runs).
+    """
+    problems = []
+    if not manifests: return {}, ["No manifests given."]
+    first = manifests[0]
+    shard_count = first["shard"][1]
+    for manifest in manifests[1:]:
+        for key in ("tool", "discovered_count", "discovered_digest"):
+            if manifest[key] != first[key]:
+                problems.append(f"Shard {format_shard(manifest['shard'])} has {key} '{manifest[key]}', "
+                                f"shard {format_shard(first['shard'])} has '{first[key]}'.")
+        if manifest["shard"][1] != shard_count:
+            problems.append(f"Shard {format_shard(manifest['shard'])} is from a {manifest['shard'][1]}-way split, "
+                            f"expected {shard_count}.")
+
+    indices = [m["shard"][0] for m in manifests]
+    for index in sorted(set(range(1, shard_count + 1)) - set(indices)):
+        problems.append(f"Manifest for shard {index}/{shard_count} is missing.")
+    for index in sorted({i for i in indices if indices.count(i) > 1}):
+        problems.append(f"Shard {index}/{shard_count} appears in more than one manifest.")
+
+    owner = {}  # rel path -> shard index
+    shards, failures, missing = [], {}, []
+    for manifest in sorted(manifests, key=lambda m: m["shard"][0]):
+        index = manifest["shard"][0]
+        for rel_path in manifest["assigned"]:
+            if rel_path in owner:
+                problems.append(f"'{rel_path}' is assigned to shards {owner[rel_path]} and {index}.")
+            owner[rel_path] = index
+            if shard_index_for(rel_path, shard_count) != index:
+                problems.append(f"'{rel_path}' was processed by shard {index} but hashes to shard "
+                                f"{shard_index_for(rel_path, shard_count)}.")
+            result = manifest["results"].get(rel_path)
+            if result is None: missing.append(rel_path)
+            elif result["status"] != "ok": failures[rel_path] = result.get("error", result["status"])
+        statuses = [r["status"] for r in manifest["results"].values()]
+        shards.append({"shard": format_shard(manifest["shard"]), "assigned": len(manifest["assigned"]),
+                       "ok": statuses.count("ok"), "failed": len(statuses) - statuses.count("ok"),
+                       "elapsed_seconds": manifest.get("elapsed_seconds")})
+
+    if len(owner) != first["discovered_count"] or file_list_digest(owner) != first["discovered_digest"]:
+        problems.append(f"Shards cover {len(owner)} file(s) but {first['discovered_count']} were discovered.")
+
+    summary = {
+        "tool": first["tool"], "root": first["root"], "shard_count": shard_count,
+        "files": first["discovered_count"], "ok": len(owner) - len(failures) - len(missing),
+        "failed": len(failures), "missing": sorted(missing), "failures": failures, "shards": shards,
+        "coverage_problems": problems,
+    }
+    return summary, problems
+
+
+def load_manifest(manifest_path):
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the result manifests of a sharded conversion run.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    merge_parser = subparsers.add_parser("merge", help="Combine shard manifests, verify coverage and write the global summary.")
+    merge_parser.add_argument("manifests", nargs="+", help="Shard manifest files written with --manifest/--shard.")
+    merge_parser.add_argument("--summary", default=DEFAULT_SUMMARY_FILE, help="Path of the merged summary JSON.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    summary, problems = merge_manifests([load_manifest(p) for p in args.manifests])
+    with open(args.summary, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    for problem in problems: logging.error(problem)
+    if summary:
+        logging.info(f"{summary['tool']}: {summary['files']} file(s) in {summary['shard_count']} shard(s): "
+                     f"{summary['ok']} ok, {summary['failed']} failed, {len(summary['missing'])} not attempted.")
+    logging.info(f"Summary written to {args.summary}")
+    if problems or not summary or summary["failed"] or summary["missing"]: sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import os
+import logging
+import argparse
+
+import html_to_mdx_v2
+import html_to_mdx_v10
+from element_registry import load_element_registry
+from html_input import mapped_html
+from standard_config import load_standard_config, DEFAULT_STANDARD
+
+# --- Configuration Constants ---
+DEFAULT_LOG_FILE = "convert_site.log"
+
+
+class SharedSoups:
+    """
+    Parse-once store for a site run. Pages parsed to build the sidebar structure are kept until the
+    converter takes them, so every HTML file is read and parsed exactly once.
+    """
+
+    def __init__(self):
+        self.soups = {}
+        self.parse_count = 0
+
+    def _parse(self, html_file_path):
+        with mapped_html(html_file_path) as html_content:
+            soup = html_to_mdx_v2.parse_html(html_content)
+        self.parse_count += 1
+        return soup
+
+    def get(self, html_file_path):
+        key = os.path.normpath(os.path.abspath(html_file_path))
+        if key not in self.soups: self.soups[key] = self._parse(key)
+        return self.soups[key]
+
+    def take(self, html_file_path):
+        key = os.path.normpath(os.path.abspath(html_file_path))
+        soup = self.soups.pop(key, None)
+        return soup if soup is not None else self._parse(key)
+
+
+def mdx_key_for_html(html_file_path, abs_source_root, standard=html_to_mdx_v10.DEFAULT_STANDARD_CONFIG):
+    # Same doc keys html_to_mdx_v10 derives from sidebar hrefs: SES pages under ves/ land in the ses/ section
+    rel_path = os.path.relpath(html_file_path, abs_source_root).replace(os.sep, '/')
+    rel_no_ext = os.path.splitext(rel_path)[0]
+    section_dir, _, filename = rel_no_ext.rpartition('/')
+    if section_dir == standard.ses_html_source_dir and standard.is_ses_filename(filename):
+        return html_to_mdx_v10.normalize_html_href_to_key(filename + ".html", standard.ses_target_mdx_section_key,
+                                                          abs_source_root, standard)
+    return rel_no_ext
+
+
+def convert_site(abs_source_root, abs_target_root, logger, element_registry=None, examples_json=False,
+                 standard=html_to_mdx_v10.DEFAULT_STANDARD_CONFIG):
+    """
+    Converts every HTML page under abs_source_root and writes each MDX once, with the converter's front matter
+    already merged with the sidebar front matter html_to_mdx_v10 would add. Returns (converted, errors, parse_count).
+    With examples_json, examples go to a JSON file next to each MDX (see html_to_mdx_v2.write_examples_json).
+    """
+    shared_soups = SharedSoups()
+    cached_structures = html_to_mdx_v10.cache_all_html_sidebar_structures(abs_source_root, soup_loader=shared_soups.get,
+                                                                          standard=standard)
+    main_category_keys = html_to_mdx_v10.main_category_keys_for(abs_target_root, standard)
+    converted, errors = 0, 0
+    for html_file_path in html_to_mdx_v2.discover_html_files(abs_source_root, recursive=True):
+        try:
+            mdx_file_path = os.path.join(abs_target_root, mdx_key_for_html(html_file_path, abs_source_root, standard) + ".mdx")
+            example_dataset = {} if examples_json else None
+            soup = shared_soups.take(html_file_path)
+            try:
+                mdx_output = html_to_mdx_v2.convert_soup_to_mdx(
+                    soup, os.path.basename(html_file_path), logger,
+                    html_to_mdx_v2.html_subdirectory_for(html_file_path, abs_source_root), element_registry,
+                    example_dataset, standard)
+            finally:
+                soup.decompose()  # Each tree is converted once; free it now rather than at the next GC pass
+            existing_fm, body_content = html_to_mdx_v10.split_front_matter(mdx_output, mdx_file_path)
+            updated_fm = html_to_mdx_v10.update_sidebar_front_matter(mdx_file_path, existing_fm, abs_target_root,
+                                                                     main_category_keys, cached_structures, standard)
+            html_to_mdx_v2.write_mdx_file(mdx_file_path, html_to_mdx_v10.render_front_matter(updated_fm, body_content))
+            if example_dataset: html_to_mdx_v2.write_examples_json(mdx_file_path, example_dataset)
+            logger.info(f"Successfully converted: {html_file_path} -> {mdx_file_path}")
+            converted += 1
+        except Exception as e:
+            logger.error(f"Failed to convert {html_file_path}: {e}", exc_info=True)
+            errors += 1
+    if shared_soups.soups:
+        logger.warning(f"{len(shared_soups.soups)} sidebar source page(s) were parsed but not converted: {sorted(shared_soups.soups)}")
+    return converted, errors, shared_soups.parse_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert an ISBDM HTML tree to Docusaurus MDX with complete sidebar front matter in one pass.")
+    parser.add_argument("--standard", default=DEFAULT_STANDARD,
+                        help="Standard to convert: a name from standard_configs/ or a config YAML path.")
+    parser.add_argument("--source_html_root", help="Root directory of source HTML files. Defaults to the standard's source_html_root.")
+    parser.add_argument("--target_mdx_root", help="Root directory for the MDX output. Defaults to the standard's target_mdx_root.")
+    parser.add_argument("--log_file", default=DEFAULT_LOG_FILE, help="Log file name.")
+    parser.add_argument("--log_level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="Logging level.")
+    parser.add_argument("--element_registry", help="Elements CSV (isbd-sheets format) used to fill and cross-check RDF front matter.")
+    parser.add_argument("--sheet_snapshot_dir", help="Directory for memory-mapped snapshots of sheet CSVs.")
+    parser.add_argument("--examples_json", action="store_true",
+                        help="Export examples to <page>.examples.json for the ExampleTable component.")
+    args = parser.parse_args()
+    html_to_mdx_v10.setup_logging(args.log_level, args.log_file)
+    logger = logging.getLogger(__name__)
+
+    standard = load_standard_config(args.standard)
+    abs_source_root = os.path.abspath(args.source_html_root or standard.source_html_root)
+    abs_target_root = os.path.abspath(args.target_mdx_root or standard.target_mdx_root)
+    element_registry = load_element_registry(args.element_registry, args.sheet_snapshot_dir) if args.element_registry else None
+    logger.info(f"Converting {standard.name} '{abs_source_root}' to '{abs_target_root}'")
+    converted, errors, parse_count = convert_site(abs_source_root, abs_target_root, logger, element_registry,
+                                                     args.examples_json, standard)
+    logger.info(f"Conversion finished. {converted} file(s) written, {errors} error(s), {parse_count} HTML parse(s).")
+
+
+if __name__ == "__main__":
+    main()
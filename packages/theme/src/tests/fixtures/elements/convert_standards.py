@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import os
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import html_to_mdx_v10
+from convert_site import convert_site
+from element_registry import load_element_registry
+from standard_config import load_standard_config, available_standards
+
+# --- Configuration Constants ---
+DEFAULT_LOG_FILE = "convert_standards.log"
+DEFAULT_SITE_WORKERS = 2
+
+
+def load_site_registry(standard, sheet_snapshot_dir=None):
+    # The standard's elements CSV through the shared registry cache; a missing CSV converts without one
+    if not standard.element_registry: return None
+    if not os.path.exists(standard.element_registry):
+        logging.warning(f"{standard.name}: element registry {standard.element_registry} not found; "
+                        f"RDF front matter is taken from the HTML only.")
+        return None
+    return load_element_registry(standard.element_registry, sheet_snapshot_dir)
+
+
+def convert_standard(standard, element_registry, examples_json=False):
+    """convert_site for one standard, logging under convert_standards.<name>. Returns (converted, errors, parses, seconds)."""
+    logger = logging.getLogger(f"convert_standards.{standard.name}")
+    abs_source_root = os.path.abspath(standard.source_html_root)
+    abs_target_root = os.path.abspath(standard.target_mdx_root)
+    logger.info(f"Converting {standard.name} '{abs_source_root}' to '{abs_target_root}'")
+    started = time.perf_counter()
+    converted, errors, parse_count = convert_site(abs_source_root, abs_target_root, logger, element_registry,
+                                                  examples_json, standard)
+    return converted, errors, parse_count, time.perf_counter() - started
+
+
+def convert_standards(standards, registries, site_workers=DEFAULT_SITE_WORKERS, examples_json=False):
+    """
+    Converts several standards in this process, up to site_workers at a time. The sites share the module-level
+    caches: compiled selectors, the link-resolver memo and the element registries passed in registries
+    {name: registry}. Returns {name: (converted, errors, parses, seconds)}; a site that raised gets None.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, site_workers)) as executor:
+        futures = {standard.name: executor.submit(convert_standard, standard, registries.get(standard.name),
+                                                  examples_json)
+                   for standard in standards}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logging.error(f"{name}: conversion failed: {e}", exc_info=True)
+                results[name] = None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert several standards' HTML trees to Docusaurus MDX in one run.")
+    parser.add_argument("standards", nargs="+",
+                        help=f"Standard names from standard_configs/ ({', '.join(available_standards())}) or config "
+                             f"YAML paths. Each config's source_html_root and target_mdx_root are used.")
+    parser.add_argument("--site_workers", type=int, default=DEFAULT_SITE_WORKERS,
+                        help="Sites converted concurrently. Threads share the warm caches (and the GIL: this overlaps "
+                             "file I/O, while --workers in html_to_mdx_v2.py parallelises one site's CPU work).")
+    parser.add_argument("--sheet_snapshot_dir", help="Directory for memory-mapped snapshots of sheet CSVs.")
+    parser.add_argument("--examples_json", action="store_true",
+                        help="Export examples to <page>.examples.json for the ExampleTable component.")
+    parser.add_argument("--log_file", default=DEFAULT_LOG_FILE, help="Log file name.")
+    parser.add_argument("--log_level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="Logging level.")
+    args = parser.parse_args()
+    html_to_mdx_v10.setup_logging(args.log_level, args.log_file)
+
+    # Configs and registries load here, before the sites start, so concurrent sites never build the same cache entry
+    standards = [load_standard_config(s) for s in args.standards]
+    duplicate_names = {s.name for s in standards if sum(1 for t in standards if t.name == s.name) > 1}
+    if duplicate_names: parser.error(f"Standard(s) given more than once: {', '.join(sorted(duplicate_names))}")
+    registries = {s.name: load_site_registry(s, args.sheet_snapshot_dir) for s in standards}
+
+    started = time.perf_counter()
+    results = convert_standards(standards, registries, args.site_workers, args.examples_json)
+    total_converted, total_errors = 0, 0
+    for name, result in results.items():
+        if result is None:
+            logging.error(f"{name}: did not finish.")
+            total_errors += 1
+            continue
+        converted, errors, parse_count, seconds = result
+        logging.info(f"{name}: {converted} file(s) written, {errors} error(s), {parse_count} HTML parse(s) in {seconds:.2f}s.")
+        total_converted += converted
+        total_errors += errors
+    logging.info(f"All standards finished in {time.perf_counter() - started:.2f}s: {total_converted} file(s) written, "
+                 f"{total_errors} error(s).")
+
+
+if __name__ == "__main__":
+    main()
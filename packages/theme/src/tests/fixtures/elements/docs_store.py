@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+import yaml # PyYAML
+
+# --- Configuration Constants ---
+EXAMPLES_JSON_SUFFIX = ".examples.json"  # Written next to the MDX file when examples are exported
+BUSY_TIMEOUT_SECONDS = 30                # Pool workers share the database; a writer waits this long for the lock
+
+FRONT_MATTER_PATTERN = re.compile(r'^---\s*?\n(.*?\n)---\s*?\n?(.*)', re.DOTALL)  # As html_to_mdx_v10.split_front_matter
+MDX_LINK_PATTERN = re.compile(r'\[([^\]]*)\]\(([^)\s]+)[^)]*\)')                       # [label](target)
+JSX_LINK_PATTERN = re.compile(r'<(InLink|a)\b[^>]*?\bhref="([^"]*)"[^>]*>(.*?)</\1>', re.DOTALL)  # <InLink href=...>
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    doc TEXT PRIMARY KEY,            -- MDX path under the docs root without extension: 'statements/1025'
+    section TEXT NOT NULL,           -- First path component, '' for pages at the root
+    mdx TEXT NOT NULL,               -- The page as it is written to the docs tree, front matter included
+    examples TEXT,                   -- The page's examples JSON (--examples_json), written next to the MDX
+    front_matter TEXT NOT NULL,      -- Parsed front matter as JSON
+    title TEXT,
+    sidebar_label TEXT,
+    sidebar_level INTEGER,
+    sidebar_position INTEGER,
+    content_hash TEXT NOT NULL,
+    exported_hash TEXT,              -- content_hash as last written to the docs tree
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_section_level ON pages (section, sidebar_level);
+CREATE TABLE IF NOT EXISTS links (doc TEXT NOT NULL, target TEXT NOT NULL, label TEXT);
+CREATE INDEX IF NOT EXISTS links_doc ON links (doc);
+CREATE INDEX IF NOT EXISTS links_target ON links (target);
+CREATE TABLE IF NOT EXISTS diagnostics (
+    doc TEXT NOT NULL, code TEXT NOT NULL, fingerprint TEXT NOT NULL, occurrences INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS diagnostics_doc ON diagnostics (doc);
+CREATE INDEX IF NOT EXISTS diagnostics_code ON diagnostics (code);
+CREATE TABLE IF NOT EXISTS nav_items (
+    section TEXT NOT NULL, position INTEGER NOT NULL, doc TEXT NOT NULL, label TEXT, level INTEGER,
+    original_href TEXT, has_children INTEGER, is_last_sibling INTEGER, PRIMARY KEY (section, position)
+);
+CREATE INDEX IF NOT EXISTS nav_items_doc ON nav_items (doc);
+"""
+
+
+def section_of(doc):
+    return doc.split("/", 1)[0] if "/" in doc else ""
+
+
+def front_matter_of(mdx):
+    match = FRONT_MATTER_PATTERN.match(mdx)
+    if not match: return {}
+    try:
+        front_matter = yaml.safe_load(match.group(1))
+    except yaml.YAMLError:
+        return {}
+    return front_matter if isinstance(front_matter, dict) else {}
+
+
+def links_in(mdx):
+    """(target, label) of the InLink/anchor elements and markdown links in the MDX, in order."""
+    links = [(m.start(), m.group(2), m.group(3)) for m in JSX_LINK_PATTERN.finditer(mdx)]
+    links += [(m.start(), m.group(2), m.group(1)) for m in MDX_LINK_PATTERN.finditer(mdx)]
+    return [(target, label) for _, target, label in sorted(links)]
+
+
+def page_hash(mdx, examples):
+    return hashlib.sha1(f"{mdx}\0{examples or ''}".encode('utf-8')).hexdigest()
+
+
+class DocsStore:
+    """
+    SQLite store of converted pages: MDX, parsed front matter (sidebar keys as indexed columns), the links in
+    each body, per-page diagnostic counts and the sidebar NavItems. Writers commit per page in WAL mode, so
+    pool workers can share one database file. export() writes only pages changed since their last export.
+    """
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        os.makedirs(os.path.dirname(os.path.abspath(store_path)), exist_ok=True)
+        self.lock = threading.Lock()  # The async pipelines write from I/O worker threads
+        self.connection = sqlite3.connect(store_path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def put_page(self, doc, mdx, examples=None, diagnostic_counts=None):
+        """
+        Adds or replaces a page. examples is the examples JSON text, diagnostic_counts the page's
+        [((code, fingerprint), occurrences)] (see conversion_diagnostics.DiagnosticsSummary.counts); None
+        keeps the diagnostics already stored.
+        """
+        front_matter = front_matter_of(mdx)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO pages (doc, section, mdx, examples, front_matter, title, sidebar_label, sidebar_level, "
+                "sidebar_position, content_hash, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (doc) DO UPDATE SET mdx = excluded.mdx, examples = excluded.examples, "
+                "front_matter = excluded.front_matter, title = excluded.title, sidebar_label = excluded.sidebar_label, "
+                "sidebar_level = excluded.sidebar_level, sidebar_position = excluded.sidebar_position, "
+                "content_hash = excluded.content_hash, updated = excluded.updated",
+                (doc, section_of(doc), mdx, examples, json.dumps(front_matter, ensure_ascii=False, default=str),
+                 front_matter.get("title"), front_matter.get("sidebar_label"), front_matter.get("sidebar_level"),
+                 front_matter.get("sidebar_position"), page_hash(mdx, examples), time.time()))
+            self.connection.execute("DELETE FROM links WHERE doc = ?", (doc,))
+            self.connection.executemany("INSERT INTO links (doc, target, label) VALUES (?, ?, ?)",
+                                        [(doc, target, label) for target, label in links_in(mdx)])
+            if diagnostic_counts is not None:
+                self.connection.execute("DELETE FROM diagnostics WHERE doc = ?", (doc,))
+                self.connection.executemany(
+                    "INSERT INTO diagnostics (doc, code, fingerprint, occurrences) VALUES (?, ?, ?, ?)",
+                    [(doc, code, fingerprint, occurrences) for (code, fingerprint), occurrences in diagnostic_counts])
+
+    def update_mdx(self, doc, mdx):
+        """Replaces a stored page's MDX, keeping its examples and diagnostics. Returns False if it was unchanged."""
+        with self.lock:
+            row = self.connection.execute("SELECT mdx, examples FROM pages WHERE doc = ?", (doc,)).fetchone()
+        if row and row[0] == mdx: return False
+        self.put_page(doc, mdx, row[1] if row else None)
+        return True
+
+    def has_page(self, doc):
+        with self.lock:
+            return self.connection.execute("SELECT 1 FROM pages WHERE doc = ?", (doc,)).fetchone() is not None
+
+    def page_mdx(self):
+        """(doc, mdx) of every stored page, in doc order."""
+        with self.lock:
+            return self.connection.execute("SELECT doc, mdx FROM pages ORDER BY doc").fetchall()
+
+    def put_nav_items(self, cached_structures):
+        """Replaces the stored sidebar of every section in cached_structures ({section: [NavItem]})."""
+        with self.lock, self.connection:
+            for section, nav_items in cached_structures.items():
+                self.connection.execute("DELETE FROM nav_items WHERE section = ?", (section,))
+                self.connection.executemany(
+                    "INSERT INTO nav_items (section, position, doc, label, level, original_href, has_children, "
+                    "is_last_sibling) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(section, position, item.normalized_key, item.label, item.html_level, item.original_href,
+                      int(item.has_children_in_html), int(item.is_last_sibling))
+                     for position, item in enumerate(nav_items, 1)])
+
+    def query_docs(self, section=None, min_sidebar_level=None, diagnostic_code=None):
+        """Docs matching every given condition, answered from the indexes."""
+        conditions, params = [], []
+        if section is not None: conditions.append("section = ?"); params.append(section)
+        if min_sidebar_level is not None: conditions.append("sidebar_level >= ?"); params.append(min_sidebar_level)
+        if diagnostic_code is not None:
+            conditions.append("doc IN (SELECT doc FROM diagnostics WHERE code = ?)"); params.append(diagnostic_code)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return [row[0] for row in self.connection.execute(f"SELECT doc FROM pages{where} ORDER BY doc", params)]
+
+    def export(self, docs_root, examples_suffix=EXAMPLES_JSON_SUFFIX, everything=False):
+        """Writes pages changed since their last export (or every page) under docs_root. Returns the number written."""
+        query = "SELECT doc, mdx, examples, content_hash FROM pages"
+        if not everything: query += " WHERE exported_hash IS NULL OR exported_hash != content_hash"
+        written = 0
+        with self.lock:
+            changed = self.connection.execute(query).fetchall()
+        for doc, mdx, examples, digest in changed:
+            mdx_file_path = os.path.join(docs_root, *doc.split("/")) + ".mdx"
+            os.makedirs(os.path.dirname(mdx_file_path), exist_ok=True)
+            with open(mdx_file_path, 'w', encoding='utf-8') as f:
+                f.write(mdx)
+            if examples is not None:
+                with open(os.path.splitext(mdx_file_path)[0] + examples_suffix, 'w', encoding='utf-8') as f:
+                    f.write(examples)
+            with self.lock, self.connection:
+                self.connection.execute("UPDATE pages SET exported_hash = ? WHERE doc = ?", (digest, doc))
+            written += 1
+        return written
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or query a converted-docs store written by html_to_mdx_v2.py "
+                                                 "and html_to_mdx_v10.py --store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Write pages changed since the last export to the docs tree.")
+    export_parser.add_argument("store", help="Store database file.")
+    export_parser.add_argument("docs_root", help="Docs directory to write the MDX files under.")
+    export_parser.add_argument("--all", action="store_true", help="Write every page, changed or not.")
+    query_parser = subparsers.add_parser("query", help="List the docs matching all the given conditions.")
+    query_parser.add_argument("store", help="Store database file.")
+    query_parser.add_argument("--section", help="Section (first path component; '' for root pages).")
+    query_parser.add_argument("--min_sidebar_level", type=int, help="Minimum sidebar_level.")
+    query_parser.add_argument("--diagnostic", help="Only pages with this diagnostic code.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    with DocsStore(args.store) as store:
+        if args.command == "export":
+            written = store.export(args.docs_root, everything=args.all)
+            logging.info(f"Exported {written} page(s) from {args.store} to {args.docs_root}.")
+        else:
+            for doc in store.query_docs(args.section, args.min_sidebar_level, args.diagnostic): print(doc)
+
+
+if __name__ == "__main__":
+    main()
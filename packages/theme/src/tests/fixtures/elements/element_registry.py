@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+import os
+import logging
+from collections import Counter
+from isbd_sheets import load_sheet
+
+# --- Configuration Constants ---
+DEFAULT_ELEMENTS_CSV = "output/isbd-sheets/isbd-elements/isbd-elements.csv"
+
+# CURIE prefixes used by the isbd-sheets exports. Values in 'uri', 'rdfs:domain', 'rdfs:subPropertyOf' etc.
+# are written as CURIEs ('isbd:elements/P1004') and expanded against this map.
+CURIE_PREFIXES = {
+    "isbd": "http://iflastandards.info/ns/isbd/",
+    "isbdm": "http://iflastandards.info/ns/isbdm/",
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+}
+
+# rdf:type values mapped onto the 'type' key used in the element front matter
+RDF_TYPE_TO_FRONTMATTER_TYPE = {
+    "owl:DatatypeProperty": "DatatypeProperty",
+    "owl:ObjectProperty": "ObjectProperty",
+    "owl:Class": "Class",
+}
+
+
+def expand_curie(value, prefixes=CURIE_PREFIXES):
+    if not value or "://" in value: return value
+    prefix, sep, local = value.partition(":")
+    if sep and prefix in prefixes: return prefixes[prefix] + local
+    return value
+
+
+def in_namespace(uri, namespace):
+    """
+    True when the expanded uri is a term of namespace: under it and not the namespace itself. A namespace
+    without a trailing '/' or '#' (a vocabulary such as .../isbd/terms/mediatype) has its terms under '<namespace>/'.
+    """
+    if not uri or not namespace: return False
+    if not namespace.endswith(('/', '#')): namespace += '/'
+    return uri.startswith(namespace) and len(uri) > len(namespace)
+
+
+def sheet_namespace(curies, prefixes=CURIE_PREFIXES):
+    """
+    The namespace a sheet's rows belong to: its vocabulary row's URI (the one ending in '/'), or failing
+    that the namespace most of its rows share.
+    """
+    uris = [expand_curie(curie, prefixes) for curie in curies if curie]
+    vocabulary_uri = next((uri for uri in uris if uri.endswith('/')), None)
+    if vocabulary_uri: return vocabulary_uri
+    namespaces = Counter(uri.rsplit('/', 1)[0] + '/' for uri in uris if '/' in uri)
+    return namespaces.most_common(1)[0][0] if namespaces else None
+
+
+# --- Data Structures ---
+class ElementRecord:
+    def __init__(self, uri, curie, row):
+        self.uri = uri
+        self.curie = curie
+        self.row = row  # isbd_sheets.SheetRow; cells are decoded on access
+        self.local_id = uri.rstrip('/').rsplit('/', 1)[-1]
+
+    def literals(self, property_name, lang="en"):
+        return self.row.values(property_name, lang)
+
+    def literal(self, property_name, lang="en", default=""):
+        values = self.literals(property_name, lang)
+        return values[0] if values else default
+
+    def resources(self, property_name):
+        return [expand_curie(v) for v in self.row.values(property_name)]
+
+    def resource(self, property_name):
+        values = self.resources(property_name)
+        return values[0] if values else None
+
+    @property
+    def rdf_type(self):
+        return self.row.get("rdf:type")
+
+    @property
+    def label(self):
+        return self.literal("rdfs:label") or self.literal("skos:prefLabel")
+
+    def __repr__(self):
+        return f"ElementRecord(uri='{self.uri}', type='{self.rdf_type}', label='{self.label}')"
+
+
+class ElementRegistry:
+    def __init__(self, source_path=None):
+        self.source_path = source_path
+        self.by_uri = {}
+        self.by_curie = {}
+        self.sub_types_by_uri = {}  # parent uri -> [child uri, ...], from rdfs:subPropertyOf/subClassOf and reg:hasSub*
+
+    def __len__(self):
+        return len(self.by_uri)
+
+    def __contains__(self, uri_or_curie):
+        return self.get(uri_or_curie) is not None
+
+    def add(self, record):
+        self.by_uri[record.uri] = record
+        self.by_curie[record.curie] = record
+
+    def get(self, uri_or_curie):
+        if not uri_or_curie: return None
+        return self.by_uri.get(uri_or_curie) or self.by_curie.get(uri_or_curie)
+
+    def resolve_element_uri(self, uri_base, element_id):
+        """
+        Returns the registered URI for a numeric element id, checking the property ('P') and class ('C')
+        forms, or None when neither is registered under uri_base.
+        """
+        for type_prefix in ("P", "C"):
+            candidate = f"{uri_base}{type_prefix}{element_id}"
+            if candidate in self.by_uri: return candidate
+        return None
+
+    def label_for(self, uri_or_curie, default=""):
+        record = self.get(uri_or_curie)
+        return record.label if record else default
+
+    def sub_types(self, uri_or_curie):
+        record = self.get(uri_or_curie)
+        return [self.by_uri[u] for u in self.sub_types_by_uri.get(record.uri, []) if u in self.by_uri] if record else []
+
+    def super_type(self, uri_or_curie):
+        record = self.get(uri_or_curie)
+        if not record: return None
+        return self.get(record.resource("rdfs:subPropertyOf") or record.resource("rdfs:subClassOf"))
+
+    def index_relationships(self):
+        self.sub_types_by_uri = {}
+        for record in self.by_uri.values():
+            parents = record.resources("rdfs:subPropertyOf") + record.resources("rdfs:subClassOf")
+            for parent_uri in parents:
+                self._link_sub_type(parent_uri, record.uri)
+            for child_uri in record.resources("reg:hasSubproperty") + record.resources("reg:hasSubClass"):
+                self._link_sub_type(record.uri, child_uri)
+
+    def _link_sub_type(self, parent_uri, child_uri):
+        children = self.sub_types_by_uri.setdefault(parent_uri, [])
+        if child_uri not in children: children.append(child_uri)
+
+
+# --- Loading ---
+_registry_cache = {}  # (abs_path, mtime) -> ElementRegistry, so a batch run parses each CSV once
+
+
+def build_element_registry(csv_path, snapshot_dir=None):
+    registry = ElementRegistry(source_path=csv_path)
+    sheet = load_sheet(csv_path, snapshot_dir)
+    if ("uri", None, 0) not in sheet.column_map:
+        logging.error(f"Element CSV {csv_path} has no 'uri' column.")
+        return registry
+    curies = sheet.column("uri")
+    namespace = sheet_namespace(curies)
+    for row_index, curie in enumerate(curies):
+        uri = expand_curie(curie)
+        # Skips blank rows, the vocabulary row itself and rows that are not elements (the trailing RegStatus row)
+        if not in_namespace(uri, namespace):
+            if curie: logging.debug(f"Element CSV {csv_path}: skipped {curie}, not in {namespace}.")
+            continue
+        registry.add(ElementRecord(uri, curie, sheet.row(row_index)))
+    registry.index_relationships()
+    logging.info(f"Loaded {len(registry)} element(s) into registry from {csv_path}")
+    return registry
+
+
+def load_element_registry(csv_path=DEFAULT_ELEMENTS_CSV, snapshot_dir=None):
+    abs_path = os.path.abspath(csv_path)
+    cache_key = (abs_path, os.path.getmtime(abs_path))
+    if cache_key not in _registry_cache:
+        _registry_cache[cache_key] = build_element_registry(abs_path, snapshot_dir)
+    return _registry_cache[cache_key]
+
+
+def rdf_frontmatter_from_record(record, registry):
+    """
+    Builds the RDF front matter fields for an element from its registry record.
+    Domain and range are given as labels, matching what the HTML Element reference block shows.
+    """
+    domain_uri = record.resource("rdfs:domain")
+    range_uri = record.resource("rdfs:range")
+    return {
+        "definition": record.literal("skos:definition"),
+        "scopeNote": " ".join(record.literals("skos:scopeNote")),
+        "domain": registry.label_for(domain_uri, domain_uri or ""),
+        "range": registry.label_for(range_uri, range_uri or ""),
+        "type": RDF_TYPE_TO_FRONTMATTER_TYPE.get(record.rdf_type),
+    }
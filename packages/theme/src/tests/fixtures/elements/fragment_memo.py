@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+# --- Configuration Constants ---
+DEFAULT_MEMO_ENTRIES = 4096  # Rendered fragments kept; ISBDM's repeated SeeAlso/guidance fragments fit easily
+KEY_DIGEST_BYTES = 16
+
+
+class FragmentMemo:
+    """
+    Bounded LRU memo of rendered inline fragments, shared by every page of a run. Entries are keyed by a
+    digest of the fragment's HTML plus the render context (e.g. is_for_seealso_context and the standard), so
+    a boilerplate paragraph repeated across pages is parsed and rendered once. Counts hits, misses and the
+    fragment bytes not re-rendered; max_entries 0 turns the memo off.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MEMO_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> rendered output, least recently used first
+        self.lock = threading.Lock()  # conversion_api callers may convert from several threads
+        self.hits = self.misses = self.bytes_saved = self.evictions = 0
+
+    def render(self, fragment, render_fn, *context):
+        """render_fn()'s result for this fragment and context, from the memo when it was rendered before."""
+        if not self.max_entries: return render_fn()
+        encoded = fragment.encode('utf-8')
+        key = (hashlib.blake2b(encoded, digest_size=KEY_DIGEST_BYTES).digest(), *context)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                self.bytes_saved += len(encoded)
+                return self.entries[key]
+        rendered = render_fn()
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = rendered
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return rendered
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.bytes_saved = self.evictions = 0
+
+    def counts(self):
+        # (hits, misses, bytes saved, evictions): what a pool worker sends for the parent to merge()
+        return (self.hits, self.misses, self.bytes_saved, self.evictions)
+
+    def merge(self, counts):
+        hits, misses, bytes_saved, evictions = counts
+        with self.lock:
+            self.hits += hits; self.misses += misses; self.bytes_saved += bytes_saved; self.evictions += evictions
+
+    def summary_lines(self):
+        lookups = self.hits + self.misses
+        if not self.max_entries: return ["Fragment memo: off."]
+        if not lookups: return ["Fragment memo: no fragments rendered."]
+        return [f"Fragment memo: {self.hits} hit(s) of {lookups} fragment(s) ({self.hits / lookups:.1%}), "
+                f"{self.bytes_saved / 1024:.1f} KiB of fragment HTML not re-rendered, {self.evictions} eviction(s) "
+                f"(max {self.max_entries} entries)."]
+
+
+def counts_delta(after, before):
+    return tuple(a - b for a, b in zip(after, before))
+
+
+def log_memo_stats(memo, logger=None):
+    for line in memo.summary_lines():
+        (logger or logging).info(line)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import re
+import mmap
+import codecs
+from contextlib import contextmanager
+
+try:
+    import lxml  # noqa: F401  Parses bytes in C, decoding with the encoding it is given
+    BYTES_PARSER = 'lxml'
+except ImportError:
+    BYTES_PARSER = 'html.parser'  # BeautifulSoup decodes the bytes itself first
+
+# --- Configuration Constants ---
+DEFAULT_ENCODING = 'utf-8'
+ENCODING_PRESCAN_BYTES = 1024     # As in the HTML spec's prescan, <meta charset> must appear this early
+MMAP_MIN_BYTES = 256 * 1024       # Smaller pages are read in one call; mapping them costs more than it saves
+
+BYTE_ORDER_MARKS = ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be'))
+META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+
+
+def is_byte_input(html):
+    return isinstance(html, (bytes, bytearray, mmap.mmap))
+
+
+def declared_encoding(raw, default=DEFAULT_ENCODING):
+    """The encoding a page declares by byte order mark or <meta charset> near its start, else default."""
+    head = bytes(raw[:ENCODING_PRESCAN_BYTES])
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if head.startswith(bom): return encoding
+    match = META_CHARSET.search(head)
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:
+            pass
+    return default
+
+
+def read_html_bytes(html_file_path):
+    """The page's raw bytes in one read, for callers that keep the content beyond the file's lifetime."""
+    with open(html_file_path, 'rb') as f:
+        return f.read()
+
+
+@contextmanager
+def mapped_html(html_file_path):
+    """
+    The page's raw bytes for the duration of the with block: memory-mapped for pages of at least
+    MMAP_MIN_BYTES, so the region pre-scan reads the page cache directly and only the slices it keeps are
+    copied, otherwise read in one call.
+    """
+    with open(html_file_path, 'rb') as f:
+        size = f.seek(0, 2)
+        if size < MMAP_MIN_BYTES:
+            f.seek(0)
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def whole_bytes(raw):
+    # BeautifulSoup treats anything with read() as a file, which would move an mmap's position; give it bytes
+    return raw[:] if isinstance(raw, mmap.mmap) else raw
+
+
+def decode_html(raw):
+    return bytes(raw).decode(declared_encoding(raw))
@@ -2,94 +2,154 @@
 import os
 import re
 import yaml # PyYAML
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
 import argparse
+import difflib
+import json
 import logging
 from collections import defaultdict # Not strictly used in this version, but good for complex grouping
 import shutil
+from array import array
+from functools import lru_cache
+from conversion_pipeline import run_pipeline, log_pipeline_stats, DEFAULT_PREFETCH, DEFAULT_WRITE_BEHIND, DEFAULT_IO_WORKERS
+from conversion_shards import ShardManifest, parse_shard_spec, select_shard, shard_suffixed, DEFAULT_MANIFEST_FILE
+from conversion_journal import ProgressJournal, content_hash, DEFAULT_FSYNC_BATCH
+from page_regions import find_all_regions, count_in
+from html_input import BYTES_PARSER, declared_encoding, mapped_html, whole_bytes
+from standard_config import load_standard_config, DEFAULT_STANDARD
+from docs_store import DocsStore
 
 # --- Configuration Constants ---
-DEFAULT_SOURCE_HTML_ROOT = "ISBDM/docs/"
-DEFAULT_TARGET_MDX_ROOT = "docs/"
-
-# MDX file paths (relative to TARGET_MDX_ROOT) that are main category pages.
-# These get CLASS_MAIN_CATEGORY_PAGE. Their children's absolute level starts from their level + 1.
-# Format: 'path/to/index.mdx' or 'path/to/doc.mdx'
-MAIN_CATEGORY_INDEX_FILES_CONFIG = [
-    "index.mdx", # Site root index, if it has its own sidebar structure defined in HTML
-    "intro/index.mdx",
-    "assess/index.mdx",
-    "elements/index.mdx",
-    "values/index.mdx",
-    "fullex/index.mdx", # User confirmed this is an expandable category
-    "glossary/index.mdx",
-    "about/index.mdx",
-]
+# Site-specific settings (roots, main category pages, SES, section config) live in standard_configs/<name>.yaml.
+# Functions take a StandardConfig and default to this one.
+DEFAULT_STANDARD_CONFIG = load_standard_config(DEFAULT_STANDARD)
+DEFAULT_SOURCE_HTML_ROOT = DEFAULT_STANDARD_CONFIG.source_html_root
+DEFAULT_TARGET_MDX_ROOT = DEFAULT_STANDARD_CONFIG.target_mdx_root
+DEFAULT_JOURNAL_FILE = "generate_sidebar_frontmatter.journal.jsonl"
 
 # CSS class names
 CLASS_MAIN_CATEGORY_PAGE = "menu-item--sidebar-category-page"
 # CLASS_FILE_SECTION_START is removed from Python generation for now,
 # TS script will determine categories more dynamically or rely on user's manual FM edits for these.
 
-# Special handling for 'relationships' section sidebar source HTMLs
-RELATIONSHIPS_HTML_CONFIG_PATHS = [ # Relative to SOURCE_HTML_ROOT
-    "relationships/index.html", "relationships/general.html", "relationships/agents.html",
-    "relationships/resources.html", "relationships/placetimes.html", "relationships/nomens.html",
-]
-
-# SES (String Encoding Schemes) specific configuration
-SES_HTML_SOURCE_DIR_FROM_ROOT = "ves" # Source HTMLs are in ISBDM/docs/ves/
-SES_HTML_INDEX_FILENAME = "ISBDMSES.html" # This HTML in .../ves/ provides SES hierarchy
-SES_TARGET_MDX_SECTION_KEY = "ses"    # Target MDX dir (docs/ses/) uses this key
-
-# SECTION_CONFIG: Defines how HTML source dirs/files map to MDX sections and their base absolute levels.
-# 'mdx_section_key': Key for cached_structures and how MDX files in docs/<mdx_section_key>/ map.
-# 'source_html_dir': Directory under SOURCE_HTML_ROOT where HTMLs are.
-# 'source_html_file': Specific HTML file in source_html_dir to parse for this section's nav.
-# 'index_doc_absolute_level': The absolute sidebar_level for this section's *index.mdx* page.
-# 'children_absolute_base_level': The absolute sidebar_level for the *first level of children* parsed from source_html_file.
-SECTION_CONFIG = {
-    "root_index": {"source_html_dir": "", "source_html_file": "index.html", "index_doc_absolute_level": 1, "children_absolute_base_level": 1}, # For docs/index.mdx items
-    "intro":    {"source_html_dir": "intro", "source_html_file": "index.html", "index_doc_absolute_level": 1, "children_absolute_base_level": 2},
-    "assess":   {"source_html_dir": "assess", "source_html_file": "index.html", "index_doc_absolute_level": 1, "children_absolute_base_level": 2},
-    "elements": {"source_html_dir": "elements", "source_html_file": "index.html", "index_doc_absolute_level": 1, "children_absolute_base_level": 2},
-    "statements": {"source_html_dir": "statements", "source_html_file": "index.html", "index_doc_absolute_level": 2, "children_absolute_base_level": 3},
-    "notes":    {"source_html_dir": "notes", "source_html_file": "index.html", "index_doc_absolute_level": 2, "children_absolute_base_level": 3},
-    "attributes": {"source_html_dir": "attributes", "source_html_file": "index.html", "index_doc_absolute_level": 2, "children_absolute_base_level": 3}, # Or 1022.html
-    "relationships": { # Children of 'elements' main category
-        "source_html_dir": "relationships", 
-        "source_html_files": RELATIONSHIPS_HTML_CONFIG_PATHS, # List of HTMLs to combine
-        "index_doc_absolute_level": 2, # For docs/relationships/index.mdx
-        "children_absolute_base_level": 3 # For items like agents.mdx, or items within agents.mdx's own list
-    },
-    "values":   {"source_html_dir": "values", "source_html_file": "index.html", "index_doc_absolute_level": 1, "children_absolute_base_level": 2},
-    "ves":      {"source_html_dir": "ves", "source_html_file": "index.html", "index_doc_absolute_level": 2, "children_absolute_base_level": 3}, # Vocabularies
-    "ses": { # String Encoding Schemes - special source
-        "source_html_dir": SES_HTML_SOURCE_DIR_FROM_ROOT, # HTMLs are in "ves"
-        "source_html_file": SES_HTML_INDEX_FILENAME,    # ISBDMSES.html
-        "index_doc_absolute_level": 2, # For docs/ses/index.mdx
-        "children_absolute_base_level": 3 # For items in ISBDMSES.html list
-    },
-    "fullex":   {"source_html_dir": "fullex", "source_html_file": "index.html", "index_doc_absolute_level": 1, "children_absolute_base_level": 2},
-    "glossary": {"source_html_dir": "glossary", "source_html_file": "index.html", "index_doc_absolute_level": 1, "children_absolute_base_level": 2},
-    "about":    {"source_html_dir": "about", "source_html_file": "index.html", "index_doc_absolute_level": 1, "children_absolute_base_level": 2},
-}
-
+# Sidebar nav lookup, compiled once. Sidebar source pages are parsed with only their section navs kept
+# (the strainer sees the raw class attribute, hence the token regex).
+NAV_CONTAINER_SELECTOR = soupsieve.compile('div.col-md-5 nav.navISBDMSection, div.col-md-6 nav.navISBDMSection, div.col-md-12 nav.navISBDMSection, nav.navISBDMSection')
+MAX_NAV_ANCESTOR_DEPTH = 64 # Ancestor "is last" flags are packed into one 64-bit mask per item
+SIDEBAR_NAV_STRAINER = SoupStrainer('nav', class_=re.compile(r'(?<!\S)navISBDMSection(?!\S)'))
 
 # --- Data Structures ---
+class NavSection:
+    """
+    Struct-of-arrays storage for one section's sidebar items: levels, positions and flag bits in typed arrays,
+    and each item's ancestor "is last sibling" flags as a bitmask (bit i = ancestor at depth i) plus a count.
+    NavItems are views into it, so a large vocabulary costs a few bytes per item here instead of a dict and a list.
+    """
+    FLAG_LAST_SIBLING = 1
+    FLAG_HAS_CHILDREN = 2
+
+    def __init__(self):
+        self.levels = array('H')
+        self.positions = array('I')
+        self.flags = bytearray()
+        self.ancestor_masks = array('Q')
+        self.ancestor_counts = array('B')
+
+    def __len__(self):
+        return len(self.levels)
+
+    def append(self, html_level, html_position):
+        self.levels.append(html_level)
+        self.positions.append(html_position)
+        self.flags.append(0)
+        self.ancestor_masks.append(0)
+        self.ancestor_counts.append(0)
+        return len(self.levels) - 1
+
+    @classmethod
+    def collect(cls, nav_items):
+        """
+        Returns a section holding exactly nav_items, in list order, with cleared flags. The items' own section
+        is reused when they already are all of it in order (a single page in position order); otherwise the
+        levels/positions are copied into a new section and the items rebound to it.
+        """
+        section = nav_items[0].section if nav_items else cls()
+        if len(section) == len(nav_items) and all(item.section is section and item.index == i for i, item in enumerate(nav_items)):
+            section.flags = bytearray(len(nav_items))
+            return section
+        section = cls()
+        section.levels = array('H', [item.section.levels[item.index] for item in nav_items])
+        section.positions = array('I', [item.section.positions[item.index] for item in nav_items])
+        section.flags = bytearray(len(nav_items))
+        section.ancestor_masks = array('Q', bytes(8 * len(nav_items)))
+        section.ancestor_counts = array('B', bytes(len(nav_items)))
+        for i, item in enumerate(nav_items):
+            item.section, item.index = section, i
+        return section
+
+    def has_flag(self, index, flag):
+        return bool(self.flags[index] & flag)
+
+    def set_flag(self, index, flag, value):
+        self.flags[index] = (self.flags[index] | flag) if value else (self.flags[index] & ~flag)
+
+    def ancestor_is_last(self, index, depth, default=True):
+        if depth >= self.ancestor_counts[index]: return default
+        return bool(self.ancestor_masks[index] >> depth & 1)
+
+
 class NavItem:
+    __slots__ = ("original_href", "normalized_key", "label", "source_html_file_path", "mdx_path", "section", "index")
+
     def __init__(self, original_href, normalized_key, label, html_level, # html_level is NOW ABSOLUTE
-                 html_position_in_section, source_html_file_path, mdx_path=None):
+                 html_position_in_section, source_html_file_path, mdx_path=None, section=None):
         self.original_href = original_href
         self.normalized_key = normalized_key
         self.label = label
-        self.html_level = html_level # This will be the absolute level
-        self.html_position_in_section = html_position_in_section
         self.source_html_file_path = source_html_file_path
         self.mdx_path = mdx_path
-        self.is_last_sibling = False
-        self.ancestor_is_last_flags = []
-        self.has_children_in_html = False # New flag
+        # Level, position and hierarchy flags live in the section's arrays
+        self.section = section if section is not None else NavSection()
+        self.index = self.section.append(html_level, html_position_in_section)
+
+    @property
+    def html_level(self): # This will be the absolute level
+        return self.section.levels[self.index]
+
+    @html_level.setter
+    def html_level(self, value):
+        self.section.levels[self.index] = value
+
+    @property
+    def html_position_in_section(self):
+        return self.section.positions[self.index]
+
+    @html_position_in_section.setter
+    def html_position_in_section(self, value):
+        self.section.positions[self.index] = value
+
+    @property
+    def is_last_sibling(self):
+        return self.section.has_flag(self.index, NavSection.FLAG_LAST_SIBLING)
+
+    @is_last_sibling.setter
+    def is_last_sibling(self, value):
+        self.section.set_flag(self.index, NavSection.FLAG_LAST_SIBLING, value)
+
+    @property
+    def has_children_in_html(self):
+        return self.section.has_flag(self.index, NavSection.FLAG_HAS_CHILDREN)
+
+    @has_children_in_html.setter
+    def has_children_in_html(self, value):
+        self.section.set_flag(self.index, NavSection.FLAG_HAS_CHILDREN, value)
+
+    @property
+    def ancestor_is_last_flags(self):
+        # Decoded on demand; generate_sidebar_prefix reads the bitmask directly
+        return [self.section.ancestor_is_last(self.index, depth)
+                for depth in range(self.section.ancestor_counts[self.index])]
 
     def __repr__(self):
         return (f"NavItem(key='{self.normalized_key}', lbl='{self.label}', abs_lvl={self.html_level}, "
@@ -120,22 +180,33 @@ def normalize_mdx_path_to_key(mdx_file_path, base_dir):
     return os.path.normpath(path_no_ext).replace(os.sep, '/')
 
 
-def normalize_html_href_to_key(href, source_html_section_key, source_html_root_abs):
+def normalize_html_href_to_key(href, source_html_section_key, source_html_root_abs, standard=DEFAULT_STANDARD_CONFIG):
     # source_html_section_key is like "attributes", "ves", or for SES it could be "ses" if we map it early
-    if not href: return None
+    # The key comes from the cache; the warning is logged on every call, so each page that links a bad href reports it
+    normalized, unmatched_absolute = _resolve_html_href(href, source_html_section_key, source_html_root_abs, standard)
+    if unmatched_absolute:
+        logging.warning(f"Found absolute href '{href}' not matching known root structure in section '{source_html_section_key}'.")
+    return normalized
+
+
+@lru_cache(maxsize=65536) # Shared link resolution: the same hrefs recur on every page of a section, and across sites in one run
+def _resolve_html_href(href, source_html_section_key, source_html_root_abs, standard):
+    # (key, whether href is an absolute path outside the site); logs nothing, so caching it drops no warnings
+    if not href: return None, False
 
     # Handle SES specific mapping: if source_html_section_key indicates SES context
-    if source_html_section_key == SES_TARGET_MDX_SECTION_KEY: # If we know this href is for an SES doc
+    ses_section_key = standard.ses_target_mdx_section_key
+    if ses_section_key and source_html_section_key == ses_section_key: # If we know this href is for an SES doc
         filename_no_ext, _ = os.path.splitext(os.path.basename(href))
-        if filename_no_ext.upper() == "ISBDMSES": # from ISBDM/docs/ves/ISBDMSES.html
-             return f"{SES_TARGET_MDX_SECTION_KEY}/index"
+        if filename_no_ext.upper() == standard.ses_filename_marker: # from ISBDM/docs/ves/ISBDMSES.html
+             return f"{ses_section_key}/index", False
         # Assumes hrefs like "ISBDMSES1023.html" come from ISBDMSES.html within .../ves/
-        if "ISBDMSES" in filename_no_ext.upper():
-            return f"{SES_TARGET_MDX_SECTION_KEY}/{filename_no_ext}"
+        if standard.is_ses_filename(filename_no_ext):
+            return f"{ses_section_key}/{filename_no_ext}", False
         # If other files from ves/ISBDMSES.html are linked but not ISBDMSES*, they need careful handling
         # For now, assume ISBDMSES.html only links to ISBDMSES*.html files for the SES section.
 
-    path_part = ""
+    path_part, unmatched_absolute = "", False
     # Check for full local paths if script is run from a deep directory (less likely)
     # More likely are /ISBDM/docs/... or relative paths from within a section's HTML
     # source_html_root_abs is like /abs/path/to/ISBDM/docs
@@ -143,11 +214,10 @@ def normalize_html_href_to_key(href, source_html_section_key, source_html_root_a
 
     if href.startswith(source_html_root_abs):
         path_part = href[len(source_html_root_abs):].lstrip("/")
-    elif href.startswith("/ISBDM/docs/"):
-         path_part = href[len("/ISBDM/docs/"):].lstrip("/")
+    elif href.startswith(standard.docs_href_prefix):
+         path_part = href[len(standard.docs_href_prefix):].lstrip("/")
     elif href.startswith("/"):
-        logging.warning(f"Found absolute href '{href}' not matching known root structure in section '{source_html_section_key}'.")
-        path_part = href.lstrip("/") # May lead to incorrect key
+        path_part, unmatched_absolute = href.lstrip("/"), True # May lead to incorrect key
     else: # Relative path like "1022.html" or "sub/file.html" from within source_html_section_key directory
         path_part = os.path.join(source_html_section_key, href) # Assumes source_html_section_key is the dir name
 
@@ -164,23 +234,38 @@ def normalize_html_href_to_key(href, source_html_section_key, source_html_root_a
         # This logic might need refinement based on ISBDM/docs/index.html structure.
         pass
 
-    return normalized
+    return normalized, unmatched_absolute
 
 
 # --- Core Parsing and Hierarchy Logic ---
+def load_html_soup(html_file_path):
+    # Raw bytes (mapped for large pages) go undecoded to the parser with the page's declared encoding
+    with mapped_html(html_file_path) as html_content:
+        encoding = declared_encoding(html_content)
+        # Pre-scan for the sidebar navs and parse only their markup; the strainer handles anything the scan can't pin down
+        nav_regions = find_all_regions(html_content, 'nav', ('navISBDMSection',))
+        if nav_regions and count_in(html_content, 'navISBDMSection', [(0, len(html_content))]) == \
+                count_in(html_content, 'navISBDMSection', nav_regions):
+            return BeautifulSoup(b"\n".join(html_content[a:b] for a, b in nav_regions), BYTES_PARSER,
+                                 from_encoding=encoding)
+        return BeautifulSoup(whole_bytes(html_content), BYTES_PARSER, parse_only=SIDEBAR_NAV_STRAINER,
+                             from_encoding=encoding)
+
 def parse_html_sidebar_nav(html_file_path, 
                            source_html_section_key_for_norm, # e.g. "attributes", "ves" (for SES items), "intro"
                            source_html_root_abs,
-                           children_absolute_base_level): # The absolute level for 0-indent items in this HTML
+                           children_absolute_base_level, # The absolute level for 0-indent items in this HTML
+                           soup_loader=load_html_soup, # Callers holding parsed pages can hand out their soups instead
+                           standard=DEFAULT_STANDARD_CONFIG):
     nav_items = []
+    nav_section = NavSection() # Shared by this page's items until determine_hierarchy_properties regroups them
     try:
-        with open(html_file_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
+        soup = soup_loader(html_file_path)
     except FileNotFoundError:
         logging.error(f"HTML file not found: {html_file_path}")
         return nav_items
 
-    nav_container_candidates = soup.select('div.col-md-5 nav.navISBDMSection, div.col-md-6 nav.navISBDMSection, div.col-md-12 nav.navISBDMSection, nav.navISBDMSection')
+    nav_container_candidates = NAV_CONTAINER_SELECTOR.select(soup)
     
     item_position_counter = 0
     for nav_container in nav_container_candidates:
@@ -199,9 +284,9 @@ def parse_html_sidebar_nav(html_file_path,
                 absolute_level = children_absolute_base_level + local_indent_depth
 
                 # If parsing ISBDM/docs/ves/ISBDMSES.html, the normalized key needs to point to "ses/..."
-                current_section_key_for_norm = SES_TARGET_MDX_SECTION_KEY if source_html_section_key_for_norm == SES_HTML_SOURCE_DIR_FROM_ROOT and "ISBDMSES" in html_file_path else source_html_section_key_for_norm
+                current_section_key_for_norm = standard.ses_target_mdx_section_key if source_html_section_key_for_norm == standard.ses_html_source_dir and standard.is_ses_filename(html_file_path) else source_html_section_key_for_norm
                 
-                normalized_key = normalize_html_href_to_key(href, current_section_key_for_norm, source_html_root_abs)
+                normalized_key = normalize_html_href_to_key(href, current_section_key_for_norm, source_html_root_abs, standard)
                 if not normalized_key:
                     logging.warning(f"Could not normalize href '{href}' in {html_file_path} for section key '{current_section_key_for_norm}'. Skipping item '{label}'.")
                     continue
@@ -210,54 +295,78 @@ def parse_html_sidebar_nav(html_file_path,
                     original_href=href, normalized_key=normalized_key, label=label,
                     html_level=absolute_level, # Store ABSOLUTE level
                     html_position_in_section=item_position_counter,
-                    source_html_file_path=html_file_path
+                    source_html_file_path=html_file_path,
+                    section=nav_section
                 ))
     return nav_items
 
 def determine_hierarchy_properties(section_nav_items: list[NavItem]):
-    # ... (This function remains largely the same as in the previous complete Python script)
+    # Rebinds the (sorted, deduplicated) items to one NavSection and fills its flags in two linear passes.
     # It operates on the .html_level which is now absolute.
     if not section_nav_items: return
+    section = NavSection.collect(section_nav_items)
+    levels, flags, item_count = section.levels, section.flags, len(section)
+    LAST_SIBLING, HAS_CHILDREN = NavSection.FLAG_LAST_SIBLING, NavSection.FLAG_HAS_CHILDREN
+
+    # Pass 1 (backwards): an item is the last sibling unless a later item at its level comes before a shallower one.
+    # later_levels holds, increasing, the levels of later items not yet closed off by a shallower item.
+    later_levels = []
+    for i in range(item_count - 1, -1, -1):
+        level = levels[i]
+        while later_levels and later_levels[-1] > level: later_levels.pop()
+        if later_levels and later_levels[-1] == level: continue
+        flags[i] = LAST_SIBLING
+        later_levels.append(level)
+
+    # Pass 2: ancestor "is last" flags as a bitmask stack, and has_children_in_html
+    ancestor_masks, ancestor_counts = section.ancestor_masks, section.ancestor_counts
+    ancestor_mask, ancestor_count = 0, 0
+    for i in range(item_count):
+        level = levels[i]
+        if ancestor_count >= level:
+            ancestor_count = level - 1
+            ancestor_mask &= (1 << ancestor_count) - 1
+        if ancestor_count >= MAX_NAV_ANCESTOR_DEPTH:
+            raise ValueError(f"Sidebar nesting deeper than {MAX_NAV_ANCESTOR_DEPTH} levels at '{section_nav_items[i].normalized_key}'.")
+        ancestor_masks[i] = ancestor_mask
+        ancestor_counts[i] = ancestor_count
+        if flags[i] & LAST_SIBLING: ancestor_mask |= 1 << ancestor_count
+        ancestor_count += 1
 
-    # Pass 1: Determine is_last_sibling for all items
-    for i, current_item in enumerate(section_nav_items):
-        current_item.is_last_sibling = True 
-        for j in range(i + 1, len(section_nav_items)):
-            next_item = section_nav_items[j]
-            if next_item.html_level == current_item.html_level:
-                current_item.is_last_sibling = False; break
-            if next_item.html_level < current_item.html_level:
-                break
-    
-    # Pass 2: Determine ancestor_is_last_flags and has_children_in_html
-    parent_is_last_at_level_stack = [] 
-    for i, item in enumerate(section_nav_items):
-        while len(parent_is_last_at_level_stack) >= item.html_level:
-            parent_is_last_at_level_stack.pop()
-        item.ancestor_is_last_flags = list(parent_is_last_at_level_stack)
-        if len(parent_is_last_at_level_stack) < item.html_level :
-             parent_is_last_at_level_stack.append(item.is_last_sibling)
-        else: 
-             parent_is_last_at_level_stack[item.html_level -1] = item.is_last_sibling
-        
         # Determine if item has children in this HTML structure
-        if i + 1 < len(section_nav_items) and section_nav_items[i+1].html_level > item.html_level:
-            item.has_children_in_html = True
+        if i + 1 < item_count and levels[i + 1] > level:
+            flags[i] |= HAS_CHILDREN
 
 def generate_sidebar_prefix(nav_item: NavItem):
     # ... (This function remains the same, uses absolute nav_item.html_level)
     if nav_item.html_level < 2: return None
     prefix_parts = []
     for i in range(nav_item.html_level - 1):
-        is_ancestor_last = nav_item.ancestor_is_last_flags[i] if i < len(nav_item.ancestor_is_last_flags) else True
+        is_ancestor_last = nav_item.section.ancestor_is_last(nav_item.index, i)
         prefix_parts.append("   " if is_ancestor_last else "│  ")
     prefix_parts.append("└─ " if nav_item.is_last_sibling else "├─ ")
     return "".join(prefix_parts)
 
-def cache_all_html_sidebar_structures(source_html_root_abs):
+def sidebar_class_and_prefix(nav_item: NavItem, mdx_key, main_category_keys):
+    # Main category pages get CLASS_MAIN_CATEGORY_PAGE and never a prefix; other items from absolute level 2 get one
+    if mdx_key in main_category_keys:
+        return CLASS_MAIN_CATEGORY_PAGE, None
+    return None, generate_sidebar_prefix(nav_item) if nav_item.html_level >= 2 else None
+
+def sidebar_source_html_paths(source_html_root_abs, standard=DEFAULT_STANDARD_CONFIG):
+    # Every HTML file cache_all_html_sidebar_structures reads, in section_config order
+    paths = []
+    for config in standard.section_config.values():
+        if "source_html_files" in config:
+            paths.extend(os.path.join(source_html_root_abs, p) for p in config["source_html_files"])
+        else:
+            paths.append(os.path.join(source_html_root_abs, config["source_html_dir"], config["source_html_file"]))
+    return [os.path.normpath(p) for p in paths]
+
+def cache_all_html_sidebar_structures(source_html_root_abs, soup_loader=load_html_soup, standard=DEFAULT_STANDARD_CONFIG):
     cached_structures = {} # Key: target_mdx_section_key (e.g., "attributes", "ses"), Value: list[NavItem]
 
-    for mdx_section_key_target, config in SECTION_CONFIG.items():
+    for mdx_section_key_target, config in standard.section_config.items():
         logging.info(f"Configuring section: {mdx_section_key_target}")
         
         children_base_abs_level = config["children_absolute_base_level"]
@@ -277,7 +386,8 @@ def cache_all_html_sidebar_structures(source_html_root_abs):
                 items_from_html = parse_html_sidebar_nav(html_file_abs_path, 
                                                          section_key_for_norm, 
                                                          source_html_root_abs, 
-                                                         children_base_abs_level)
+                                                         children_base_abs_level,
+                                                         soup_loader, standard)
                 for item in items_from_html:
                     pos_counter += 1
                     item.html_position_in_section = pos_counter
@@ -300,7 +410,8 @@ def cache_all_html_sidebar_structures(source_html_root_abs):
                    html_file_abs_path, 
                    norm_key_context, # Use target section key for context, esp. for SES mapping
                    source_html_root_abs,
-                   children_base_abs_level
+                   children_base_abs_level,
+                   soup_loader, standard
                 )
             else:
                 logging.warning(f"HTML source {html_file_abs_path} not found for section {mdx_section_key_target}")
@@ -309,7 +420,7 @@ def cache_all_html_sidebar_structures(source_html_root_abs):
             current_section_items.sort(key=lambda x: x.html_position_in_section)
             determine_hierarchy_properties(current_section_items)
             cached_structures[mdx_section_key_target] = current_section_items
-            logging.debug(f"Cached {len(current_section_items)} items for section '{mdx_section_key_target}'. First: {current_section_items[0] if current_section_items else 'N/A'}")
+            logging.debug("Cached %d items for section '%s'. First: %r", len(current_section_items), mdx_section_key_target, current_section_items[0]) # repr only built when DEBUG is on
         else:
             logging.info(f"No items parsed for section '{mdx_section_key_target}'.")
 
@@ -324,13 +435,13 @@ def get_mdx_nav_item_from_cache(mdx_file_path_abs, target_mdx_root_abs, cached_s
     # If mdx_key_full is "elements/statements/index", section_key should be "statements"
     # If mdx_key_full is "elements/index", section_key should be "elements"
     # If mdx_key_full is "intro/index", section_key should be "intro"
-    # If mdx_key_full is "index", section_key should be "root_index" (as defined in SECTION_CONFIG)
+    # If mdx_key_full is "index", section_key should be "root_index" (as defined in section_config)
 
     section_key_from_mdx = ""
     if mdx_key_full == "index":
         section_key_from_mdx = "root_index"
     elif len(parts) == 1: # e.g. "somefile" (if docs/somefile.mdx exists, unlikely for sections)
-        section_key_from_mdx = parts[0] # This would need its own SECTION_CONFIG entry
+        section_key_from_mdx = parts[0] # This would need its own section_config entry
     elif len(parts) > 1:
         # Is docs/elements/index.mdx (key "elements/index") part of "elements" section NavItems
         # or is docs/elements/statements/index.mdx (key "elements/statements/index") part of "statements"?
@@ -342,7 +453,7 @@ def get_mdx_nav_item_from_cache(mdx_file_path_abs, target_mdx_root_abs, cached_s
             pass # Good
         elif len(parts) > 1 and "/".join(parts[:2]) in cached_structures: # e.g. "elements/statements"
             section_key_from_mdx = "/".join(parts[:2])
-        # This needs to be robust: map MDX path to the key used in SECTION_CONFIG and thus cached_structures.
+        # This needs to be robust: map MDX path to the key used in section_config and thus cached_structures.
         # For now, assume simple top-level directory name matches section_key
         if section_key_from_mdx == "docs": # should not happen with relpath
              section_key_from_mdx = "root_index"
@@ -361,25 +472,59 @@ def get_mdx_nav_item_from_cache(mdx_file_path_abs, target_mdx_root_abs, cached_s
     logging.debug(f"No NavItem for MDX key '{mdx_key_full}' in section '{section_key_from_mdx}' structure after checking {len(nav_item_list)} items.")
     return None
 
+# --- Sidebar JSON Export ---
+def build_sidebars_json(cached_structures, main_category_keys):
+    """
+    Serialises the cached NavItem lists as Docusaurus sidebar doc items, one list per section in position order.
+    sidebar_level and sidebar_prefix are precomputed into customProps so no MDX front matter is needed for them.
+    """
+    sections = {}
+    for section_key, nav_items in cached_structures.items():
+        items = []
+        for nav_item in nav_items:
+            class_name, prefix = sidebar_class_and_prefix(nav_item, nav_item.normalized_key, main_category_keys)
+            item = {"type": "doc", "id": nav_item.normalized_key, "label": nav_item.label}
+            if class_name: item["className"] = class_name
+            item["customProps"] = {"sidebar_level": nav_item.html_level}
+            if prefix: item["customProps"]["sidebar_prefix"] = prefix
+            items.append(item)
+        sections[section_key] = items
+    return {"sections": sections}
+
+def write_sidebars_json(sidebars_json_path, cached_structures, main_category_keys, dry_run=False):
+    sidebars_data = build_sidebars_json(cached_structures, main_category_keys)
+    item_count = sum(len(items) for items in sidebars_data["sections"].values())
+    if dry_run:
+        logging.info(f"[DRY RUN] Would write {item_count} sidebar item(s) to {sidebars_json_path}")
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(sidebars_json_path)), exist_ok=True)
+    with open(sidebars_json_path, 'w', encoding='utf-8') as f:
+        json.dump(sidebars_data, f, ensure_ascii=False, separators=(',', ':'))
+    logging.info(f"Wrote {item_count} sidebar item(s) in {len(sidebars_data['sections'])} section(s) to {sidebars_json_path}")
+
 # --- Front Matter Read/Write (same as before) ---
-def read_front_matter(mdx_file_path): # ... (same)
-    try:
-        with open(mdx_file_path, 'r', encoding='utf-8') as f: content = f.read()
-    except FileNotFoundError: return {}, ""
+def split_front_matter(content, source_label=""):
     fm_match = re.match(r'^---\s*?\n(.*?\n)---\s*?\n?(.*)', content, re.DOTALL)
     if fm_match:
         fm_str, body_content = fm_match.group(1), fm_match.group(2) if fm_match.group(2) is not None else ""
         try:
             fm_dict = yaml.safe_load(fm_str)
             return (fm_dict if isinstance(fm_dict, dict) else {}), body_content
-        except yaml.YAMLError as e: logging.error(f"YAML err in {mdx_file_path}: {e}"); return {}, content
+        except yaml.YAMLError as e: logging.error(f"YAML err in {source_label}: {e}"); return {}, content
     return {}, content
 
-def write_front_matter(mdx_file_path, front_matter_dict, body_content, dry_run=False, dry_run_output_dir=None, target_mdx_root_abs=None): # ... (same, but added target_mdx_root_abs for dry_run pathing)
+def read_front_matter(mdx_file_path): # ... (same)
+    try:
+        with open(mdx_file_path, 'r', encoding='utf-8') as f: content = f.read()
+    except FileNotFoundError: return {}, ""
+    return split_front_matter(content, mdx_file_path)
+
+def render_front_matter(front_matter_dict, body_content):
     if "customProps" in front_matter_dict and not front_matter_dict["customProps"]: del front_matter_dict["customProps"]
-    final_content = body_content.lstrip() if not front_matter_dict else f"---\n{yaml.dump(front_matter_dict, sort_keys=False, allow_unicode=True, default_flow_style=False, width=1000)}---\n{body_content}"
+    return body_content.lstrip() if not front_matter_dict else f"---\n{yaml.dump(front_matter_dict, sort_keys=False, allow_unicode=True, default_flow_style=False, width=1000)}---\n{body_content}"
+
+def write_mdx_content(mdx_file_path, final_content, dry_run=False, dry_run_output_dir=None, target_mdx_root_abs=None):
     if dry_run:
-        logging.info(f"[DRY RUN] Would write to {mdx_file_path} (FM keys: {list(front_matter_dict.keys())})")
         if dry_run_output_dir and target_mdx_root_abs: # Ensure target_mdx_root_abs is available
             rel_path = os.path.relpath(mdx_file_path, target_mdx_root_abs)
             dry_run_file_path = os.path.join(dry_run_output_dir, rel_path)
@@ -390,13 +535,84 @@ def write_front_matter(mdx_file_path, front_matter_dict, body_content, dry_run=F
         with open(mdx_file_path, 'w', encoding='utf-8') as f: f.write(final_content)
     except Exception as e: logging.error(f"Error writing FM to {mdx_file_path}: {e}")
 
-
-def process_single_mdx_file(mdx_file_path_abs, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, dry_run, dry_run_output_dir):
-    # ... (main logic as before, but use absolute levels from NavItem.html_level for decisions)
-    logging.info(f"Processing MDX: {mdx_file_path_abs}")
+def write_front_matter(mdx_file_path, front_matter_dict, body_content, dry_run=False, dry_run_output_dir=None, target_mdx_root_abs=None): # ... (same, but added target_mdx_root_abs for dry_run pathing)
+    final_content = render_front_matter(front_matter_dict, body_content)
+    if dry_run: logging.info(f"[DRY RUN] Would write to {mdx_file_path} (FM keys: {list(front_matter_dict.keys())})")
+    write_mdx_content(mdx_file_path, final_content, dry_run, dry_run_output_dir, target_mdx_root_abs)
+
+
+# --- Dry Run Reports ---
+def front_matter_delta(old_fm, new_fm, key_prefix=""):
+    """
+    Key-level differences between two front matter dicts. Nested dicts (e.g. customProps) are compared per key,
+    reported with dotted paths such as 'customProps.sidebar_prefix'.
+    """
+    delta = {"added": {}, "removed": {}, "changed": {}}
+    for key in list(old_fm.keys()) + [k for k in new_fm.keys() if k not in old_fm]:
+        path = f"{key_prefix}{key}"
+        if key not in new_fm:
+            delta["removed"][path] = old_fm[key]
+        elif key not in old_fm:
+            delta["added"][path] = new_fm[key]
+        elif isinstance(old_fm[key], dict) and isinstance(new_fm[key], dict):
+            nested = front_matter_delta(old_fm[key], new_fm[key], f"{path}.")
+            for kind in delta: delta[kind].update(nested[kind])
+        elif old_fm[key] != new_fm[key]:
+            delta["changed"][path] = {"old": old_fm[key], "new": new_fm[key]}
+    return delta
+
+def render_front_matter_yaml(front_matter_dict):
+    fm = {k: v for k, v in front_matter_dict.items() if not (k == "customProps" and not v)}
+    return yaml.dump(fm, sort_keys=False, allow_unicode=True, default_flow_style=False, width=1000) if fm else ""
+
+def build_dry_run_report(mdx_files, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, standard=DEFAULT_STANDARD_CONFIG):
+    """
+    Computes sidebar front matter deltas in memory for every MDX file. Only front matter is kept; bodies are
+    read to locate the front matter and then dropped. Returns (report dict, {rel_path: unified diff text}).
+    """
+    report_files, diffs = {}, {}
+    totals = {"files": 0, "changed": 0, "errors": 0, "keys_added": 0, "keys_removed": 0, "keys_changed": 0}
+    for mdx_file_path in mdx_files:
+        rel_path = os.path.relpath(mdx_file_path, target_mdx_root_abs).replace(os.sep, '/')
+        totals["files"] += 1
+        try:
+            existing_fm, _ = read_front_matter(mdx_file_path)
+            updated_fm = update_sidebar_front_matter(mdx_file_path, existing_fm, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, standard)
+        except Exception as e:
+            logging.error(f"Unhandled error processing {mdx_file_path}: {e}", exc_info=True)
+            totals["errors"] += 1
+            continue
+        delta = front_matter_delta(existing_fm, updated_fm)
+        if not any(delta.values()): continue
+        totals["changed"] += 1
+        for kind in ("added", "removed", "changed"): totals[f"keys_{kind}"] += len(delta[kind])
+        report_files[rel_path] = {kind: values for kind, values in delta.items() if values}
+        diffs[rel_path] = "".join(difflib.unified_diff(
+            render_front_matter_yaml(existing_fm).splitlines(keepends=True),
+            render_front_matter_yaml(updated_fm).splitlines(keepends=True),
+            fromfile=f"a/{rel_path}", tofile=f"b/{rel_path}"))
+    return {"summary": totals, "files": report_files}, diffs
+
+def write_dry_run_report(report_path, report, diffs):
+    # '.diff'/'.patch' paths get one aggregated unified diff of the front matter; anything else gets JSON
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        if report_path.endswith((".diff", ".patch")):
+            f.writelines(diffs[rel_path] for rel_path in sorted(diffs))
+        else:
+            json.dump(report, f, ensure_ascii=False, indent=1, default=str)
+    summary = report["summary"]
+    logging.info(f"[DRY RUN] Report written to {report_path}: {summary['changed']} of {summary['files']} file(s) would change "
+                 f"(+{summary['keys_added']} -{summary['keys_removed']} ~{summary['keys_changed']} keys, {summary['errors']} error(s)).")
+
+def main_category_keys_for(target_mdx_root_abs, standard=DEFAULT_STANDARD_CONFIG):
+    # The standard's main category pages as the keys normalize_mdx_path_to_key generates, e.g. "intro/index.mdx" -> "intro/index"
+    return {normalize_mdx_path_to_key(os.path.join(target_mdx_root_abs, p), target_mdx_root_abs): True
+            for p in standard.main_category_index_files}
+
+def update_sidebar_front_matter(mdx_file_path_abs, existing_fm, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, standard=DEFAULT_STANDARD_CONFIG):
+    # Returns a copy of existing_fm with the sidebar keys this script manages set (or removed) from the cached NavItems
     nav_item = get_mdx_nav_item_from_cache(mdx_file_path_abs, target_mdx_root_abs, cached_structures)
-    existing_fm, body_content = read_front_matter(mdx_file_path_abs)
-    
     updated_fm = dict(existing_fm) # Start with existing FM
 
     if not nav_item:
@@ -405,9 +621,8 @@ def process_single_mdx_file(mdx_file_path_abs, target_mdx_root_abs, main_categor
         for key_to_remove in ["sidebar_label", "sidebar_level", "sidebar_position", "sidebar_class_name"]:
             if key_to_remove in updated_fm: del updated_fm[key_to_remove]
         if "customProps" in updated_fm and isinstance(updated_fm["customProps"], dict) and "sidebar_prefix" in updated_fm["customProps"]:
-            del updated_fm["customProps"]["sidebar_prefix"]
-        write_front_matter(mdx_file_path_abs, updated_fm, body_content, dry_run, dry_run_output_dir, target_mdx_root_abs)
-        return True
+            updated_fm["customProps"] = {k: v for k, v in updated_fm["customProps"].items() if k != "sidebar_prefix"}
+        return updated_fm
 
     # 1. Core FM fields from NavItem (html_level is now absolute)
     updated_fm["sidebar_label"] = nav_item.label
@@ -415,13 +630,13 @@ def process_single_mdx_file(mdx_file_path_abs, target_mdx_root_abs, main_categor
     updated_fm["sidebar_position"] = nav_item.html_position_in_section
 
     # 2. Assign sidebar_class_name
-    assigned_class = None
     mdx_path_relative_norm = normalize_mdx_path_to_key(mdx_file_path_abs, target_mdx_root_abs)
+    # main_category_files_abs_normalized contains paths like "elements/index"
+    assigned_class, prefix = sidebar_class_and_prefix(nav_item, mdx_path_relative_norm, main_category_files_abs_normalized)
 
-    if mdx_path_relative_norm in main_category_files_abs_normalized: # main_category_files_abs_normalized contains paths like "elements/index"
-        assigned_class = CLASS_MAIN_CATEGORY_PAGE
-        # Validate if this main category page's absolute level is consistent (e.g., 1 or 2 based on SECTION_CONFIG)
-        expected_level = SECTION_CONFIG.get(mdx_path_relative_norm.split('/')[0], {}).get("index_doc_absolute_level")
+    if assigned_class:
+        # Validate if this main category page's absolute level is consistent (e.g., 1 or 2 based on section_config)
+        expected_level = standard.section_config.get(mdx_path_relative_norm.split('/')[0], {}).get("index_doc_absolute_level")
         if expected_level and nav_item.html_level != expected_level:
              logging.warning(f"Main category {mdx_path_relative_norm} has html_level {nav_item.html_level} but config implies {expected_level}")
 
@@ -439,57 +654,149 @@ def process_single_mdx_file(mdx_file_path_abs, target_mdx_root_abs, main_categor
     elif "sidebar_class_name" in updated_fm and updated_fm["sidebar_class_name"] == CLASS_MAIN_CATEGORY_PAGE:
         del updated_fm["sidebar_class_name"] # Remove if no longer a main cat page
 
-    # 3. Generate and assign sidebar_prefix
-    prefix = None
-    # No prefix if it's a main category page OR if item's absolute level < 2
-    if not assigned_class and nav_item.html_level >= 2: 
-        prefix = generate_sidebar_prefix(nav_item)
-    
+    # 3. Assign sidebar_prefix (none for main category pages or items with absolute level < 2)
     if "customProps" not in updated_fm or not isinstance(updated_fm.get("customProps"), dict):
         updated_fm["customProps"] = {}
+    else:
+        updated_fm["customProps"] = dict(updated_fm["customProps"])
     if prefix:
         updated_fm["customProps"]["sidebar_prefix"] = prefix
     elif "sidebar_prefix" in updated_fm["customProps"]:
         del updated_fm["customProps"]["sidebar_prefix"]
-            
-    write_front_matter(mdx_file_path_abs, updated_fm, body_content, dry_run, dry_run_output_dir, target_mdx_root_abs)
-    return True
+    return updated_fm
+
+
+def process_single_mdx_file(mdx_file_path_abs, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, dry_run, dry_run_output_dir, content=None, standard=DEFAULT_STANDARD_CONFIG):
+    # Returns the written content; pass content when the file has already been read
+    logging.info(f"Processing MDX: {mdx_file_path_abs}")
+    existing_fm, body_content = read_front_matter(mdx_file_path_abs) if content is None else split_front_matter(content, mdx_file_path_abs)
+    updated_fm = update_sidebar_front_matter(mdx_file_path_abs, existing_fm, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, standard)
+    if dry_run: logging.info(f"[DRY RUN] Would write to {mdx_file_path_abs} (FM keys: {list(updated_fm.keys())})")
+    final_content = render_front_matter(updated_fm, body_content)
+    write_mdx_content(mdx_file_path_abs, final_content, dry_run, dry_run_output_dir, target_mdx_root_abs)
+    return final_content
+
+def process_store_pages(store, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, single_dir=None, shard=None, dry_run=False, standard=DEFAULT_STANDARD_CONFIG):
+    """
+    process_single_mdx_file for the pages of a docs store (html_to_mdx_v2.py --store): the front matter is
+    updated in the store, and pages whose MDX comes out unchanged are left alone, so the next
+    docs_store.py export only writes what changed. Returns (processed, updated, errors).
+    """
+    paths = {os.path.join(target_mdx_root_abs, *doc.split('/')) + ".mdx": (doc, mdx) for doc, mdx in store.page_mdx()
+             if not single_dir or doc.startswith(single_dir.strip('/') + '/')}
+    processed, updated, errors = 0, 0, 0
+    for mdx_file_path_abs in select_shard(paths, target_mdx_root_abs, shard):
+        doc, mdx = paths[mdx_file_path_abs]
+        try:
+            existing_fm, body_content = split_front_matter(mdx, doc)
+            updated_fm = update_sidebar_front_matter(mdx_file_path_abs, existing_fm, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, standard)
+            final_content = render_front_matter(updated_fm, body_content)
+            if dry_run:
+                if final_content != mdx: logging.info(f"[DRY RUN] Would update {doc} in the store")
+            elif store.update_mdx(doc, final_content):
+                updated += 1
+            processed += 1
+        except Exception as e:
+            logging.error(f"Unhandled error processing stored page {doc}: {e}", exc_info=True)
+            errors += 1
+    return processed, updated, errors
+
+def discover_mdx_files(paths_to_walk):
+    mdx_files = []
+    for path_to_process in paths_to_walk:
+        for dirpath, _, filenames in os.walk(path_to_process):
+            for filename in filenames:
+                if filename.endswith(".mdx"):
+                    mdx_files.append(os.path.join(dirpath, filename))
+    # The target root is walked recursively alongside its subdirs, so drop repeats (order kept)
+    return list(dict.fromkeys(mdx_files))
+
+def process_mdx_files_async(mdx_files, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, dry_run, dry_run_output_dir,
+                            prefetch=DEFAULT_PREFETCH, write_behind=DEFAULT_WRITE_BEHIND, io_workers=DEFAULT_IO_WORKERS, manifest=None, journal=None,
+                            standard=DEFAULT_STANDARD_CONFIG):
+    # Same work as process_single_mdx_file, split so reads and writes overlap with front matter generation
+    def read_job(mdx_file_path):
+        with open(mdx_file_path, 'r', encoding='utf-8') as f: return f.read()
+
+    def update_job(mdx_file_path, content):
+        if journal and journal.is_done(mdx_file_path, content_hash(content)): return None
+        existing_fm, body_content = split_front_matter(content, mdx_file_path)
+        updated_fm = update_sidebar_front_matter(mdx_file_path, existing_fm, target_mdx_root_abs, main_category_files_abs_normalized, cached_structures, standard)
+        return render_front_matter(updated_fm, body_content)
+
+    def write_job(mdx_file_path, final_content):
+        if final_content is None:
+            logging.info(f"Skipped (unchanged since last run): {mdx_file_path}")
+        else:
+            write_mdx_content(mdx_file_path, final_content, dry_run, dry_run_output_dir, target_mdx_root_abs)
+            if journal: journal.record(mdx_file_path, content_hash(final_content), "ok")
+            logging.info(f"{'[DRY RUN] ' if dry_run else ''}Processed MDX: {mdx_file_path}")
+        if manifest: manifest.record(mdx_file_path, "ok")
+
+    def on_error(mdx_file_path, stage, exc):
+        logging.error(f"Unhandled error processing {mdx_file_path} ({stage}): {exc}", exc_info=exc)
+        if manifest: manifest.record(mdx_file_path, "failed", error=f"{stage}: {exc}")
+        if journal: journal.record(mdx_file_path, None, "failed", error=f"{stage}: {exc}")
+
+    return run_pipeline(mdx_files, read_job, update_job, write_job, prefetch=prefetch, write_behind=write_behind,
+                        io_workers=io_workers, on_error=on_error)
 
 def main():
     # ... (argparse setup same as before) ...
     parser = argparse.ArgumentParser(description="Generate Docusaurus sidebar front matter from HTML structures.")
-    parser.add_argument("--source_html_root", default=DEFAULT_SOURCE_HTML_ROOT, help="Root directory of source HTML files.")
-    parser.add_argument("--target_mdx_root", default=DEFAULT_TARGET_MDX_ROOT, help="Root directory of target Docusaurus MDX files.")
+    parser.add_argument("--standard", default=DEFAULT_STANDARD, help="Standard config: a name from standard_configs/ or a path to a YAML config.")
+    parser.add_argument("--source_html_root", help="Root directory of source HTML files. Defaults to the standard's source_html_root.")
+    parser.add_argument("--target_mdx_root", help="Root directory of target Docusaurus MDX files. Defaults to the standard's target_mdx_root.")
     parser.add_argument("--single_dir", help="Process only a single MDX subdirectory (e.g., 'attributes' or 'ses'). Relative to target_mdx_root.")
     parser.add_argument("--log_file", default="generate_sidebar_frontmatter.log", help="Log file name.")
     parser.add_argument("--log_level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help="Logging level.")
     parser.add_argument("--dry_run", action="store_true", help="Perform a dry run without writing to MDX files.")
     parser.add_argument("--dry_run_output", help="Directory to write modified files during a dry run. (e.g. 'dry_run_output')")
+    parser.add_argument("--dry_run_report", help="With --dry_run: write front matter deltas to this file (JSON, or a unified diff if it ends in .diff/.patch) instead of copying files.")
+    parser.add_argument("--sidebars_json", help="Export the sidebar structure to this JSON file instead of rewriting MDX front matter.")
+    parser.add_argument("--store", help="Update the pages in this docs store (written by html_to_mdx_v2.py --store) instead of the MDX files under target_mdx_root, and store the sidebar NavItems there. docs_store.py export then writes the changed pages.")
+    parser.add_argument("--shard", type=parse_shard_spec, help="Process only shard i of N (e.g. 2/4) of the MDX files, partitioned by a stable hash of their path under target_mdx_root. The log and manifest names get a shard suffix.")
+    parser.add_argument("--manifest", help=f"Write a result manifest (JSON) for conversion_shards.py merge. Defaults to {DEFAULT_MANIFEST_FILE} (shard-suffixed) when --shard is given.")
+    parser.add_argument("--journal", help=f"Append each finished MDX file (hash of the written content and outcome) to this progress journal. Defaults to {DEFAULT_JOURNAL_FILE} (shard-suffixed) with --resume. Ignored for dry runs.")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run from its journal: skip files this script already wrote and that are unchanged since, retry failures and everything not yet done.")
+    parser.add_argument("--fsync_batch", type=int, default=DEFAULT_FSYNC_BATCH, help="Journal records written between fsyncs.")
+    parser.add_argument("--async_io", action="store_true", help="Overlap MDX reads and writes with front matter generation using an asyncio pipeline.")
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH, help="With --async_io: max MDX files read ahead.")
+    parser.add_argument("--write_behind", type=int, default=DEFAULT_WRITE_BEHIND, help="With --async_io: max updated files queued for writing.")
+    parser.add_argument("--io_workers", type=int, default=DEFAULT_IO_WORKERS, help="With --async_io: concurrent file reads/writes.")
     args = parser.parse_args()
-    setup_logging(args.log_level, args.log_file)
+    setup_logging(args.log_level, shard_suffixed(args.log_file, args.shard))
     
-    abs_source_html_root = os.path.abspath(args.source_html_root)
-    abs_target_mdx_root = os.path.abspath(args.target_mdx_root)
-
-    # Normalize MAIN_CATEGORY_INDEX_FILES_CONFIG to match keys generated by normalize_mdx_path_to_key
-    # e.g., "intro/index.mdx" -> "intro/index"
-    main_category_files_abs_normalized = {
-        normalize_mdx_path_to_key(os.path.join(abs_target_mdx_root, p), abs_target_mdx_root): True 
-        for p in MAIN_CATEGORY_INDEX_FILES_CONFIG
-    }
+    standard = load_standard_config(args.standard)
+    abs_source_html_root = os.path.abspath(args.source_html_root or standard.source_html_root)
+    abs_target_mdx_root = os.path.abspath(args.target_mdx_root or standard.target_mdx_root)
+
+    main_category_files_abs_normalized = main_category_keys_for(abs_target_mdx_root, standard)
     
     dry_run_output_abs = None
-    if args.dry_run and args.dry_run_output:
+    if args.dry_run and args.dry_run_output and not args.dry_run_report:
         dry_run_output_abs = os.path.abspath(args.dry_run_output)
         if os.path.exists(dry_run_output_abs): shutil.rmtree(dry_run_output_abs)
         os.makedirs(dry_run_output_abs, exist_ok=True)
         logging.info(f"DRY RUN: Outputting modified files to {dry_run_output_abs}")
 
+    logging.info(f"Standard: {standard.name}")
     logging.info(f"Source HTML Root: {abs_source_html_root}")
     logging.info(f"Target MDX Root: {abs_target_mdx_root}")
 
     # Pass abs_source_html_root to cache_all_html_sidebar_structures for its internal path joining
-    cached_sidebar_data = cache_all_html_sidebar_structures(abs_source_html_root)
+    cached_sidebar_data = cache_all_html_sidebar_structures(abs_source_html_root, standard=standard)
+    if args.store:
+        with DocsStore(args.store) as store:
+            if not args.dry_run: store.put_nav_items(cached_sidebar_data)
+            if not args.sidebars_json:
+                processed, updated, errors = process_store_pages(store, abs_target_mdx_root, main_category_files_abs_normalized, cached_sidebar_data,
+                                                                 args.single_dir, args.shard, args.dry_run, standard)
+                logging.info(f"Processing complete. Stored pages processed: {processed}, updated: {updated}. Errors: {errors}")
+                return
+    if args.sidebars_json:
+        write_sidebars_json(args.sidebars_json, cached_sidebar_data, main_category_files_abs_normalized, args.dry_run)
+        return
     # ... (rest of main loop processing MDX files, same as before, passing target_mdx_root_abs to write_front_matter for dry_run) ...
     num_processed, num_skipped = 0, 0
     paths_to_walk = []
@@ -508,21 +815,53 @@ def main():
                 paths_to_walk.append(full_path)
         logging.info(f"Processing all MDX files under {abs_target_mdx_root}")
 
-    for path_to_process in paths_to_walk:
-        for dirpath, _, filenames in os.walk(path_to_process):
-            for filename in filenames:
-                if filename.endswith(".mdx"):
-                    mdx_file_path = os.path.join(dirpath, filename)
-                    if args.dry_run and dry_run_output_abs is None: # Minimal dry run if no output dir
-                        logging.info(f"[DRY RUN] Would process: {mdx_file_path}")
-                        num_processed +=1
-                        continue
-                    try:
-                        if process_single_mdx_file(mdx_file_path, abs_target_mdx_root, main_category_files_abs_normalized, cached_sidebar_data, args.dry_run, dry_run_output_abs):
-                            num_processed += 1
-                    except Exception as e:
-                        logging.error(f"Unhandled error processing {mdx_file_path}: {e}", exc_info=True)
-                        num_skipped += 1
+    discovered_mdx_files = discover_mdx_files(paths_to_walk)
+    mdx_files = select_shard(discovered_mdx_files, abs_target_mdx_root, args.shard)
+    manifest_path = args.manifest or (DEFAULT_MANIFEST_FILE if args.shard else None)
+    manifest = ShardManifest("html_to_mdx_v10", abs_target_mdx_root, args.shard, discovered_mdx_files, mdx_files) if manifest_path else None
+    if args.shard:
+        logging.info(f"Shard {args.shard[0]}/{args.shard[1]}: {len(mdx_files)} of {len(discovered_mdx_files)} MDX file(s).")
+    if args.dry_run and args.dry_run_report:
+        report, diffs = build_dry_run_report(mdx_files, abs_target_mdx_root, main_category_files_abs_normalized, cached_sidebar_data, standard)
+        write_dry_run_report(args.dry_run_report, report, diffs)
+        return
+    # The journal hashes what this script wrote into the target tree, so a dry run has nothing to journal
+    journal_path = args.journal or (DEFAULT_JOURNAL_FILE if args.resume else None)
+    journal = ProgressJournal(shard_suffixed(journal_path, args.shard), abs_target_mdx_root, resume=args.resume,
+                              fsync_batch=args.fsync_batch) if journal_path and not args.dry_run else None
+    if args.async_io and not (args.dry_run and dry_run_output_abs is None):
+        stats = process_mdx_files_async(mdx_files, abs_target_mdx_root, main_category_files_abs_normalized, cached_sidebar_data,
+                                        args.dry_run, dry_run_output_abs, args.prefetch, args.write_behind, args.io_workers, manifest, journal, standard)
+        log_pipeline_stats(stats)
+        num_processed, num_skipped = stats.files_ok, stats.files_failed
+        mdx_files = []
+
+    for mdx_file_path in mdx_files:
+        if args.dry_run and dry_run_output_abs is None: # Minimal dry run if no output dir
+            logging.info(f"[DRY RUN] Would process: {mdx_file_path}")
+            num_processed +=1
+            if manifest: manifest.record(mdx_file_path, "ok")
+            continue
+        try:
+            content = None
+            if journal:
+                with open(mdx_file_path, 'r', encoding='utf-8') as f: content = f.read()
+                if journal.is_done(mdx_file_path, content_hash(content)):
+                    logging.info(f"Skipped (unchanged since last run): {mdx_file_path}")
+                    num_processed += 1
+                    if manifest: manifest.record(mdx_file_path, "ok")
+                    continue
+            final_content = process_single_mdx_file(mdx_file_path, abs_target_mdx_root, main_category_files_abs_normalized, cached_sidebar_data, args.dry_run, dry_run_output_abs, content, standard)
+            num_processed += 1
+            if journal: journal.record(mdx_file_path, content_hash(final_content), "ok")
+            if manifest: manifest.record(mdx_file_path, "ok")
+        except Exception as e:
+            logging.error(f"Unhandled error processing {mdx_file_path}: {e}", exc_info=True)
+            num_skipped += 1
+            if manifest: manifest.record(mdx_file_path, "failed", error=e)
+            if journal: journal.record(mdx_file_path, None, "failed", error=e)
+    if journal: journal.close()
+    if manifest: manifest.write(shard_suffixed(manifest_path, args.shard))
     logging.info(f"Processing complete. MDX files processed/attempted: {num_processed}. Errors/Skipped: {num_skipped}")
 
 
@@ -1,9 +1,48 @@
+import gc
 import os
 import re
+import json
+import time
 import argparse
 import logging
-from bs4 import BeautifulSoup, NavigableString, Tag
+import soupsieve
+from collections import namedtuple
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
+from element_registry import load_element_registry, rdf_frontmatter_from_record
+from conversion_pipeline import run_pipeline, log_pipeline_stats, DEFAULT_PREFETCH, DEFAULT_WRITE_BEHIND, \
+    DEFAULT_IO_WORKERS
+from conversion_shards import relative_key, ShardManifest, parse_shard_spec, select_shard, shard_suffixed, DEFAULT_MANIFEST_FILE
+from conversion_journal import ProgressJournal, content_hash, DEFAULT_FSYNC_BATCH
+from conversion_diagnostics import Diagnostic, element_fingerprint, report_diagnostics, \
+    DiagnosticsSummary, log_diagnostics_summary, start_queued_logging, attach_log_queue
+from html_input import BYTES_PARSER, declared_encoding, is_byte_input, mapped_html, read_html_bytes, whole_bytes
+from standard_config import load_standard_config, DEFAULT_STANDARD
+from search_index import add_passage, heading_anchor, page_record_path, write_page_record, build_search_shards
+from docs_store import DocsStore, EXAMPLES_JSON_SUFFIX
+from conversion_scheduler import JobResult, estimate_costs, load_previous_timings, plan_chunks, run_pool, \
+    log_pool_stats
+from fragment_memo import FragmentMemo, counts_delta, log_memo_stats, DEFAULT_MEMO_ENTRIES
 
+# --- Configuration Constants ---
+# Site prefix ('/ISBDM/docs/') and element URI base come from the standard's config; functions default to this one
+DEFAULT_STANDARD_CONFIG = load_standard_config(DEFAULT_STANDARD)
+DEFAULT_JOURNAL_FILE = "conversion_journal.jsonl"
+EXAMPLES_IMPORT_NAME = "pageExamples"    # Name the MDX imports the examples JSON under
+# Rendered inline fragments (SeeAlso paragraphs, guidance boilerplate) shared by every page
+# converted in this process; --fragment_memo sizes it
+FRAGMENT_MEMO = FragmentMemo()
+
+# Selectors used on every page, compiled once at import
+ELEMENT_REFERENCE_H4_SELECTOR = soupsieve.compile('div.col-md-7 h4:-soup-contains("Element reference")')
+MAIN_TITLE_SELECTOR = soupsieve.compile('div.col-md-7 > div.row.m-1 > h3')
+MAIN_TITLE_FALLBACK_SELECTOR = soupsieve.compile('main.container div.row.m-1 > h3')
+MAIN_TITLE_H1_SELECTOR = soupsieve.compile('main.container h1, div.col-md-7 h1')
+MAIN_CONTENT_COLUMN_SELECTOR = soupsieve.compile('div.col-md-7.border.rounded')
+
+# Only main.container is built into the tree: it holds both the sidebar nav column and the content column.
+# Head, site navbar, header, footer and scripts are skipped by the parser. The strainer sees the raw class
+# attribute string, so the class is matched as a whitespace-separated token.
+PAGE_REGIONS_STRAINER = SoupStrainer('main', class_=re.compile(r'(?<!\S)container(?!\S)'))
 
 # --- Helper Functions ---
 def normalize_text(text_string):
@@ -26,9 +65,27 @@ def get_decode_contents_or_empty(element):
     return element.decode_contents() if element and hasattr(element, 'decode_contents') else ""
 
 
-def process_html_fragment_for_mdx(html_fragment_str, logger, html_filename, is_for_seealso_context=False):
+def process_html_fragment_for_mdx(html_fragment_str, logger, html_filename, is_for_seealso_context=False,
+                                  standard=DEFAULT_STANDARD_CONFIG):
     if not html_fragment_str or not html_fragment_str.strip(): return ""
-    frag_soup = BeautifulSoup(f"<body>{html_fragment_str}</body>", 'html.parser').body
+    # The rendering depends only on the fragment, the context flag and the standard; a memoised fragment's
+    # pass-through DEBUG messages are logged for the first page it occurs on only
+    return FRAGMENT_MEMO.render(html_fragment_str,
+                                lambda: render_html_fragment(html_fragment_str, logger, html_filename,
+                                                             is_for_seealso_context, standard),
+                                is_for_seealso_context, standard)
+
+
+def render_html_fragment(html_fragment_str, logger, html_filename, is_for_seealso_context, standard):
+    fragment_document = BeautifulSoup(f"<body>{html_fragment_str}</body>", 'html.parser')
+    try:
+        return fragment_to_mdx(fragment_document.body, html_fragment_str, logger, html_filename,
+                               is_for_seealso_context, standard)
+    finally:
+        fragment_document.decompose()  # Free the (cyclic) tree now instead of leaving it to the garbage collector
+
+
+def fragment_to_mdx(frag_soup, html_fragment_str, logger, html_filename, is_for_seealso_context, standard):
     if not frag_soup:
         logger.warning(
             f"{html_filename}: Failed to parse HTML fragment for internal processing: {html_fragment_str[:100]}")
@@ -43,7 +100,7 @@ def process_html_fragment_for_mdx(html_fragment_str, logger, html_filename, is_f
                     ('linkInline' in item.get('class', []) or \
                      (is_for_seealso_context and 'linkMenuElement' in item.get('class', []))):
                 link_text = get_text_or_empty(item)
-                link_href_raw = item.get('href', '').replace('/ISBDM/docs/', '/docs/', 1).replace('.html', '')
+                link_href_raw = standard.local_docs_href(item.get('href', '')).replace('.html', '')
                 link_href_for_inlink = link_href_raw[1:] if link_href_raw.startswith('/docs/') else link_href_raw
                 new_parts.append(f'<InLink href="{link_href_for_inlink}">{normalize_text(link_text)}</InLink>')
             elif item.name == 'span' and ('bolded' in item.get('class', []) or 'bolder' in item.get('class', [])):
@@ -51,14 +108,15 @@ def process_html_fragment_for_mdx(html_fragment_str, logger, html_filename, is_f
             elif item.name == 'i' or item.name == 'em':
                 inner_italic_content = item.decode_contents() if item else ""
                 processed_inner_italic = process_html_fragment_for_mdx(inner_italic_content, logger, html_filename,
-                                                                       is_for_seealso_context)
+                                                                       is_for_seealso_context, standard)
                 new_parts.append(
                     f"*{processed_inner_italic}*")  # Normalization of processed_inner_italic happens when its final string is normalized
             elif item.name == 'br':
                 new_parts.append(" ")
             else:
                 new_parts.append(str(item))
-                if item.name not in ['strong', 'b', 'sub', 'sup', 'p', 'a', 'small']:  # allow common inline
+                if item.name not in ['strong', 'b', 'sub', 'sup', 'p', 'a', 'small'] and \
+                        logger.isEnabledFor(logging.DEBUG):  # allow common inline
                     logger.debug(
                         f"{html_filename}: Kept/passed-through tag '{item.name}' in HTML fragment: {str(item)[:50]}")
 
@@ -68,7 +126,7 @@ def process_html_fragment_for_mdx(html_fragment_str, logger, html_filename, is_f
     return processed_string
 
 
-def format_rdf_sub_elements(element_divs, base_url_prefix):
+def format_rdf_sub_elements(element_divs, base_url_prefix, element_registry=None, standard=DEFAULT_STANDARD_CONFIG):
     sub_elements = []
     if element_divs:
         links = element_divs.find_all('a', class_='linkMenuElement')
@@ -78,27 +136,68 @@ def format_rdf_sub_elements(element_divs, base_url_prefix):
             label = normalize_text(get_text_or_empty(a_tag))
             raw_href = a_tag.get('href', '');
             url = raw_href
-            if raw_href.startswith('/ISBDM/docs/'):
-                url = raw_href.replace('/ISBDM/docs/', '/docs/', 1).replace(".html", "")
+            if raw_href.startswith(standard.docs_href_prefix):
+                url = standard.local_docs_href(raw_href).replace(".html", "")
             elif base_url_prefix and raw_href.startswith(base_url_prefix):
                 url = raw_href.replace(base_url_prefix, "/docs", 1).replace(".html", "")
             elif ".html" in raw_href:
                 url = raw_href.replace(".html", "")
-            uri_base = "http://iflastandards.info/ns/isbdm/elements/";
             element_id_from_url = url.split('/')[-1]
-            uri_prefix = "P" if element_id_from_url.isdigit() else "C";
-            uri = f"{uri_base}{uri_prefix}{element_id_from_url}"
+            # The registry knows whether the id is a property or a class; the P/C guess is only a fallback
+            uri = element_registry.resolve_element_uri(standard.element_uri_base, element_id_from_url) if element_registry else None
+            if not uri:
+                uri_prefix = "P" if element_id_from_url.isdigit() else "C";
+                uri = f"{standard.element_uri_base}{uri_prefix}{element_id_from_url}"
+            elif (registry_label := element_registry.label_for(uri)):
+                label = registry_label
             sub_elements.append({"uri": uri, "url": url, "label": label})
     return sub_elements
 
 
-def process_example_content_row(ex_part_row_tag, current_table_header_needed_state, logger, html_filename):
+# An example row with its first label, value and comment descendants (None where absent)
+ExampleRow = namedtuple("ExampleRow", ["tag", "label", "value", "comment"])
+EXAMPLE_ROW_ROLES = {"xampleLabel": 1, "xampleValue": 2, "editComment": 3}  # class -> ExampleRow field position
+
+
+def collect_example_rows(container, container_is_row=False):
+    """
+    Collects the div.row elements under container in one depth-first pass, each classified with the
+    first xampleLabel/xampleValue/editComment in its subtree. Rows inside a nested div.xamples are not
+    collected (their cells still count for enclosing rows). With container_is_row, container itself is
+    the only row returned.
+    """
+    rows, open_rows = [], []
+    if container_is_row:
+        open_rows.append([container, None, None, None])
+        rows.append(open_rows[0])
+
+    def visit(node, in_nested_xamples):
+        for child in node.children:
+            if not isinstance(child, Tag): continue
+            classes = child.get('class', [])
+            for class_name in classes:
+                role = EXAMPLE_ROW_ROLES.get(class_name)
+                if role is None: continue
+                for row in open_rows:
+                    if row[role] is None: row[role] = child
+            is_row = not container_is_row and not in_nested_xamples and child.name == 'div' and 'row' in classes
+            if is_row:
+                rows.append([child, None, None, None]); open_rows.append(rows[-1])
+            visit(child, in_nested_xamples or (child.name == 'div' and 'xamples' in classes))
+            if is_row: open_rows.pop()
+
+    visit(container, container.name == 'div' and 'xamples' in container.get('class', []) and not container_is_row)
+    return [ExampleRow(*row) for row in rows]
+
+
+def process_example_content_row(example_row, current_table_header_needed_state, logger, html_filename,
+                                standard=DEFAULT_STANDARD_CONFIG):
     lines_to_add = [];
     new_table_header_needed_state = current_table_header_needed_state
     unrecognized_elements_found = False
-    label_tag = ex_part_row_tag.find(class_='xampleLabel');
-    value_tag = ex_part_row_tag.find(class_='xampleValue')
-    comment_div_tag = ex_part_row_tag.find(class_='editComment')
+    label_tag = example_row.label;
+    value_tag = example_row.value
+    comment_div_tag = example_row.comment
     if label_tag and value_tag:
         if new_table_header_needed_state: lines_to_add.extend(["    | Property | Value |", "    |:---------|:------|"])
         prop = normalize_text(get_text_or_empty(label_tag));
@@ -113,7 +212,7 @@ def process_example_content_row(ex_part_row_tag, current_table_header_needed_sta
             elif isinstance(c_item, Tag):
                 if c_item.name == 'a' and 'linkInline' in c_item.get('class', []):
                     lc_text = get_text_or_empty(c_item);
-                    lc_href_raw = c_item.get('href', '').replace('/ISBDM/docs/', '/docs/', 1).replace('.html', '')
+                    lc_href_raw = standard.local_docs_href(c_item.get('href', '')).replace('.html', '')
                     lc_href_for_inlink = lc_href_raw[1:] if lc_href_raw.startswith('/docs/') else lc_href_raw
                     comment_text_parts.append(f'<InLink href="{lc_href_for_inlink}">{normalize_text(lc_text)}</InLink>')
                 elif c_item.name == 'span' and (
@@ -134,21 +233,114 @@ def process_example_content_row(ex_part_row_tag, current_table_header_needed_sta
         if final_comment_line: lines_to_add.append(f"    {final_comment_line}")
         new_table_header_needed_state = True
     else:
-        logger.warning(
-            f"{html_filename}: Unrecognized row structure inside example (div.row.px-2): {str(ex_part_row_tag)[:200]}")
-        unrecognized_elements_found = True
+        unrecognized_elements_found = True  # Reported by the caller, with the row
     return lines_to_add, new_table_header_needed_state, unrecognized_elements_found
 
 
-def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=None):
-    soup = BeautifulSoup(html_content, 'html.parser')
+def extract_example_groups(examples_div, element_url, html_filename):
+    """
+    Examples of one div.xamples as ExampleTable props: one {"entries": [...], "caption": ...} group per
+    <hr>-separated part. A comment row becomes the detail of the entry before it, or the caption when the
+    group has no entry yet. Returns (groups, unrecognized_found).
+    """
+    groups, current = [], {"entries": []}
+    unrecognized_found = False
+    for element_node in examples_div.children:
+        if not isinstance(element_node, Tag): continue
+        if element_node.name == 'hr':
+            groups.append(current); current = {"entries": []}
+            continue
+        if element_node.name != 'div': continue
+        classes = element_node.get('class', [])
+        for example_row in collect_example_rows(element_node, 'row' in classes and 'px-2' in classes):
+            if example_row.label and example_row.value:
+                current["entries"].append({"element": normalize_text(get_text_or_empty(example_row.label)),
+                                           "elementUrl": element_url,
+                                           "value": normalize_text(get_text_or_empty(example_row.value))})
+            elif example_row.comment:
+                comment_text = normalize_text(get_text_or_empty(example_row.comment))
+                if current["entries"] and "detail" not in current["entries"][-1]:
+                    current["entries"][-1]["detail"] = comment_text
+                elif comment_text:
+                    current["caption"] = normalize_text(f"{current.get('caption', '')} {comment_text}")
+            else:
+                unrecognized_found = True
+    groups.append(current)
+    return [g for g in groups if g["entries"] or g.get("caption")], unrecognized_found
+
+
+def cross_check_registry_sub_types(frontmatter, element_uri, element_registry, html_filename):
+    # Compare the sub/super-types linked from the page against the registry hierarchy (set lookups only)
+    notes = []  # Diagnostics
+    registry_sub_types = {r.uri for r in element_registry.sub_types(element_uri)}
+    page_sub_types = {st["uri"] for st in frontmatter["RDF"]["elementSubType"]}
+    for uri in sorted(page_sub_types - registry_sub_types):
+        notes.append(Diagnostic("registry-sub-type-unknown", html_filename, "",
+                                f"Warning: Registry does not list '{uri}' as a sub-type of '{element_uri}'."))
+    for uri in sorted(registry_sub_types - page_sub_types):
+        notes.append(Diagnostic("registry-sub-type-unlinked", html_filename, "",
+                                f"Warning: Registry sub-type '{uri}' of '{element_uri}' is not linked from the page."))
+    registry_super_type = element_registry.super_type(element_uri)
+    page_super_type = frontmatter["RDF"]["elementSuperType"]
+    if (registry_super_type.uri if registry_super_type else None) != (page_super_type["uri"] if page_super_type else None):
+        notes.append(Diagnostic("registry-super-type-differs", html_filename, "",
+                                f"Warning: Element super-type on the page differs from the registry for '{element_uri}'."))
+    return notes
+
+
+def parse_html(html_content, restrict_to_page_regions=True):
+    """
+    Parses a page for conversion. By default only main.container is kept (see PAGE_REGIONS_STRAINER);
+    pages without it are parsed in full so the converter's fallbacks still see the whole document. Raw
+    bytes go undecoded to BYTES_PARSER (lxml when installed) with the page's declared encoding; text is
+    parsed with html.parser.
+    """
+    parser, options = 'html.parser', {}
+    if is_byte_input(html_content):
+        parser, options = BYTES_PARSER, {'from_encoding': declared_encoding(html_content)}
+    if restrict_to_page_regions:
+        soup = BeautifulSoup(whole_bytes(html_content), parser, parse_only=PAGE_REGIONS_STRAINER, **options)
+        if soup.contents: return soup
+        soup.decompose()
+    return BeautifulSoup(whole_bytes(html_content), parser, **options)
+
+
+def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=None, element_registry=None,
+                        example_dataset=None, standard=DEFAULT_STANDARD_CONFIG, diagnostics=None, search_record=None):
+    soup = parse_html(html_content)
+    try:
+        return convert_soup_to_mdx(soup, html_filename, logger, html_subdirectory, element_registry, example_dataset,
+                                   standard, diagnostics, search_record)
+    finally:
+        # BeautifulSoup trees are full of parent/sibling reference cycles; in a batch run thousands of them
+        # would pile up between collections, so each page's tree is torn down as soon as its MDX is built
+        soup.decompose()
+
+
+def convert_soup_to_mdx(soup, html_filename, logger, html_subdirectory=None, element_registry=None,
+                        example_dataset=None, standard=DEFAULT_STANDARD_CONFIG, diagnostics=None, search_record=None):
+    # Works on an already parsed page so callers that need the soup for other passes parse it only once.
+    # With example_dataset (a dict), examples are exported into it keyed by their div.xamples id, and the MDX
+    # imports the page's EXAMPLES_JSON_SUFFIX file and renders each example group as an <ExampleTable>.
+    # Problems found on the page are logged as warnings, or with diagnostics (a DiagnosticsSummary) counted there.
+    # With search_record (a dict), the page's title, URL and searchable passages (see search_index) are added to it.
     mdx_parts = [];
-    unrecognized_elements_log = []
+    diagnostics_found = []
+    search_anchor, anchor_slugs = "", {}
+
+    def index_passage(field, mdx_text):
+        # Passages are indexed under the anchor of the heading they follow
+        if search_record is not None: add_passage(search_record, field, search_anchor, mdx_text)
+
+    def note(code, message, element=None):
+        # message may hold an {element} placeholder; its snippet is only built if the diagnostic is logged
+        diagnostics_found.append(Diagnostic(code, html_filename, element_fingerprint(element) if element is not None else "",
+                                            message, element))
 
     if html_subdirectory and html_subdirectory != '.':
-        target_href_in_html = f"/ISBDM/docs/{html_subdirectory}/{html_filename}"
+        target_href_in_html = f"{standard.docs_href_prefix}{html_subdirectory}/{html_filename}"
     else:
-        target_href_in_html = f"/ISBDM/docs/{html_filename}"
+        target_href_in_html = f"{standard.docs_href_prefix}{html_filename}"
 
     sidebar_nav = soup.find('nav', class_='navISBDMSection')
     calculated_sidebar_position = 1;
@@ -165,16 +357,21 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                 calculated_sidebar_level = arrow_icons_count + 1;
                 item_found_in_sidebar = True;
                 break
-        if not item_found_in_sidebar: unrecognized_elements_log.append(
-            f"Warning: Active link '{target_href_in_html}' for {html_filename} not found in sidebar.")
+        if not item_found_in_sidebar: note(
+            "sidebar-link-missing", f"Warning: Active link '{target_href_in_html}' for {html_filename} not found in sidebar.")
 
-    element_ref_section_h4 = soup.select_one('div.col-md-7 h4:-soup-contains("Element reference")')
+    element_ref_section_h4 = ELEMENT_REFERENCE_H4_SELECTOR.select_one(soup)
     has_element_reference = bool(element_ref_section_h4)
-    main_title_tag = soup.select_one('div.col-md-7 > div.row.m-1 > h3')
-    if not main_title_tag: main_title_tag = soup.select_one('main.container div.row.m-1 > h3')
-    if not main_title_tag: main_title_tag = soup.select_one('main.container h1, div.col-md-7 h1')
+    main_title_tag = MAIN_TITLE_SELECTOR.select_one(soup)
+    if not main_title_tag: main_title_tag = MAIN_TITLE_FALLBACK_SELECTOR.select_one(soup)
+    if not main_title_tag: main_title_tag = MAIN_TITLE_H1_SELECTOR.select_one(soup)
     main_page_title = normalize_text(
         get_text_or_empty(main_title_tag if main_title_tag else soup.find('title', recursive=False)))
+    if search_record is not None:
+        search_record.update(title=main_page_title, url=target_href_in_html[:-len('.html')]
+                             if target_href_in_html.endswith('.html') else target_href_in_html)
+        heading_anchor(main_page_title, anchor_slugs)
+        index_passage("title", main_page_title)
 
     if has_element_reference:  # (Frontmatter population and serialization)
         file_id_match = re.search(r'(\d+)\.html$', html_filename);
@@ -186,6 +383,17 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                                "elementSuperType": None, "equivalentProperty": [], "inverseOf": []},
                        "deprecated_prospective": "true", "deprecatedInVersion_prospective": "1.2.0",
                        "willBeRemovedInVersion_prospective": "2.0.0"}
+        element_uri = element_registry.resolve_element_uri(standard.element_uri_base, element_id_str) if element_registry else None
+        element_record = element_registry.get(element_uri) if element_uri else None
+        registry_filled_labels = set()
+        if element_record:
+            # Literal RDF fields come straight from the registry; the page is only read for what the registry lacks
+            registry_rdf = {k: v for k, v in rdf_frontmatter_from_record(element_record, element_registry).items() if v}
+            frontmatter["RDF"].update(registry_rdf)
+            registry_filled_labels = {k.lower() for k in registry_rdf}
+            if element_record.label and element_record.label != main_page_title:
+                note("registry-label-differs",
+                     f"Warning: Page title '{main_page_title}' differs from registry label '{element_record.label}'.")
         el_ref_container = element_ref_section_h4.find_next_sibling('div', class_='px-4')
         if el_ref_container:
             rows = el_ref_container.find_all('div', class_='row', recursive=False)
@@ -194,6 +402,7 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                 text_div = row.find('div', class_='eltext')
                 if ref_label_div and text_div:
                     label_text = get_text_or_empty(ref_label_div).lower().replace(" ", "").replace("-", "");
+                    if label_text in registry_filled_labels: continue
                     rdf_text_content = normalize_text(get_text_or_empty(text_div))
                     if label_text == 'definition':
                         frontmatter["RDF"]["definition"] = rdf_text_content
@@ -204,16 +413,21 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                     elif label_text == 'range':
                         frontmatter["RDF"]["range"] = rdf_text_content
                     elif label_text == 'elementsubtype':
-                        frontmatter["RDF"]["elementSubType"] = format_rdf_sub_elements(text_div, "/ISBDM")
+                        frontmatter["RDF"]["elementSubType"] = format_rdf_sub_elements(text_div, standard.site_path, element_registry, standard)
                     elif label_text == 'elementsupertype':
-                        super_type_links = format_rdf_sub_elements(text_div, "/ISBDM"); frontmatter["RDF"][
+                        super_type_links = format_rdf_sub_elements(text_div, standard.site_path, element_registry, standard); frontmatter["RDF"][
                             "elementSuperType"] = super_type_links[0] if super_type_links else None
                 else:
-                    unrecognized_elements_log.append(
-                        f"{html_filename}: Warning: Unexpected structure in Element Reference row: {str(row)[:100]}")
+                    note("element-reference-row", "Warning: Unexpected structure in Element Reference row: {element}", row)
         elif element_ref_section_h4:
-            unrecognized_elements_log.append(
-                f"{html_filename}: Warning: 'Element reference' h4 found, but not its 'div.px-4' container.")
+            note("element-reference-container", "Warning: 'Element reference' h4 found, but not its 'div.px-4' container.")
+        if element_record:
+            diagnostics_found.extend(
+                cross_check_registry_sub_types(frontmatter, element_uri, element_registry, html_filename))
+        if search_record is not None:
+            search_anchor = heading_anchor("Element Reference", anchor_slugs)
+            index_passage("definition", frontmatter["RDF"]["definition"])
+            index_passage("scopeNote", frontmatter["RDF"]["scopeNote"])
         mdx_parts.extend(
             ["---", "# Docusaurus-specific fields", f"id: {frontmatter['id']}", f"title: {frontmatter['title']}",
              f"sidebar_position: {frontmatter['sidebar_position']}  # ...",
@@ -239,6 +453,7 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                                                                        f"willBeRemovedInVersion: \"\" # ...", "---",
                                                                        ""])
 
+    title_part_index = len(mdx_parts)
     mdx_parts.append(f"# {main_page_title}");
     if mdx_parts[-1].strip(): mdx_parts.append("")  # Ensure blank line after title
 
@@ -247,7 +462,7 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
 
     # --- Main Content Iteration - REVISED ---
     content_nodes_to_iterate = []
-    main_content_column = soup.select_one('div.col-md-7.border.rounded')
+    main_content_column = MAIN_CONTENT_COLUMN_SELECTOR.select_one(soup)
 
     if main_content_column:
         start_node_for_body_content = None
@@ -268,11 +483,9 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
             start_node_for_body_content = main_content_column.findChild(
                 recursive=False) if main_content_column else None
             if start_node_for_body_content:
-                unrecognized_elements_log.append(
-                    f"{html_filename}: Warning: Using broad fallback for main content start node.")
+                note("content-start-fallback", "Warning: Using broad fallback for main content start node.")
             else:
-                unrecognized_elements_log.append(
-                    f"{html_filename}: Warning: Could not find any starting node for main content iteration.")
+                note("content-start-missing", "Warning: Could not find any starting node for main content iteration.")
 
         current_node_for_collection = start_node_for_body_content
         while current_node_for_collection:
@@ -283,8 +496,7 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
     if not content_nodes_to_iterate and main_content_column and \
             not (not has_element_reference and main_title_tag and not list(
                 main_title_tag.find_next_siblings(Tag))):  # Check if it was truly an empty page after title
-        unrecognized_elements_log.append(
-            f"{html_filename}: Warning: No top-level content blocks identified for iteration.")
+        note("content-blocks-missing", "Warning: No top-level content blocks identified for iteration.")
 
     for content_block_node_idx, content_block_node in enumerate(content_nodes_to_iterate):
         elements_to_process_this_block = []
@@ -298,11 +510,12 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
             is_direct_block = True
 
         if not elements_to_process_this_block and content_block_node.get_text(strip=True) and not is_direct_block:
-            unrecognized_elements_log.append(
-                f"{html_filename}: Info: Content block node '{content_block_node.name}' had text but no processable child tags: '{content_block_node.get_text(strip=True)[:50]}'")
+            note("content-block-unprocessed",
+                 f"Info: Content block node '{content_block_node.name}' had text but no processable child tags: '{{element}}'",
+                 content_block_node)
         elif not elements_to_process_this_block and is_direct_block and not content_block_node.get_text(strip=True):
-            unrecognized_elements_log.append(
-                f"{html_filename}: Info: Direct content block node '{content_block_node.name}' was empty.")
+            note("content-block-empty", f"Info: Direct content block node '{content_block_node.name}' was empty.",
+                 content_block_node)
 
         for element_idx, element in enumerate(elements_to_process_this_block):
             processed_element_in_section = False
@@ -313,6 +526,7 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
 
             if element.name == 'h4':
                 mdx_parts.append(f"## {normalize_text(get_text_or_empty(element))}");
+                if search_record is not None: search_anchor = heading_anchor(mdx_parts[-1][3:], anchor_slugs)
                 if mdx_parts[-1].strip(): mdx_parts.append("")
                 processed_element_in_section = True
             elif element.name == 'p' and not (element.parent and element.parent.has_attr('class') and \
@@ -321,9 +535,10 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                                                'seeAlso' in element.parent.get('class',
                                                                                []))):  # Handle direct <p> not in specific divs
                 raw_p_content = element.decode_contents() if element else ""
-                processed_p_text = process_html_fragment_for_mdx(raw_p_content, logger, html_filename)
+                processed_p_text = process_html_fragment_for_mdx(raw_p_content, logger, html_filename, standard=standard)
                 normalized_p_text = normalize_text(processed_p_text)
                 if normalized_p_text: mdx_parts.append(normalized_p_text)
+                index_passage("body", normalized_p_text)
                 if mdx_parts and mdx_parts[-1].strip(): mdx_parts.append("")
                 processed_element_in_section = True
             elif element.has_attr('class') and 'guid' in element.get('class', []):
@@ -334,9 +549,10 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                     raw_html_guid = p_tag_guid.decode_contents() if p_tag_guid else ""
                 else:
                     raw_html_guid = element.decode_contents() if element else ""
-                processed_guid_content = process_html_fragment_for_mdx(raw_html_guid, logger, html_filename)
+                processed_guid_content = process_html_fragment_for_mdx(raw_html_guid, logger, html_filename, standard=standard)
                 normalized_content = normalize_text(processed_guid_content)
                 mdx_parts.append(f'<div className="guid">{normalized_content}</div>');
+                index_passage("body", normalized_content)
                 if mdx_parts[-1].strip(): mdx_parts.append("")
                 processed_element_in_section = True
             elif element.has_attr('class') and 'seeAlsoAdd' in element.get('class', []):
@@ -345,12 +561,12 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                     raw_seealsoadd_content = p_tag_seealsoadd.decode_contents() if p_tag_seealsoadd else ""
                     processed_seealsoadd_content = process_html_fragment_for_mdx(raw_seealsoadd_content, logger,
                                                                                  html_filename,
-                                                                                 is_for_seealso_context=True)
+                                                                                 is_for_seealso_context=True,
+                                                                                 standard=standard)
                     final_text = normalize_text(processed_seealsoadd_content)
                     if final_text: mdx_parts.append(f"<SeeAlso>{final_text}</SeeAlso>")
                 else:
-                    unrecognized_elements_log.append(
-                        f"{html_filename}: Warning: div.seeAlsoAdd '{str(element)[:50]}' found without a <p> tag.")
+                    note("see-also-add-empty", "Warning: div.seeAlsoAdd '{element}' found without a <p> tag.", element)
                 if mdx_parts and mdx_parts[-1].strip(): mdx_parts.append("")
                 processed_element_in_section = True
             elif element.has_attr('class') and 'seeAlso' in element.get('class',
@@ -362,15 +578,15 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                     for idx_sa, p_sa in enumerate(all_see_also_p_tags):
                         raw_sa_content = p_sa.decode_contents() if p_sa else ""
                         processed_sa_content = process_html_fragment_for_mdx(raw_sa_content, logger, html_filename,
-                                                                             is_for_seealso_context=True)
+                                                                             is_for_seealso_context=True,
+                                                                             standard=standard)
                         final_text = normalize_text(processed_sa_content)
                         if final_text: mdx_parts.append(f"<SeeAlso>{final_text}</SeeAlso>")
                         if idx_sa < len(all_see_also_p_tags) - 1 and final_text and mdx_parts and mdx_parts[
                             -1].strip() != "": mdx_parts.append("")
                     if mdx_parts and mdx_parts[-1].strip() != "": mdx_parts.append("")
                 else:
-                    unrecognized_elements_log.append(
-                        f"{html_filename}: Warning: div.seeAlso '{str(element)[:50]}' found without any <p> tags.")
+                    note("see-also-empty", "Warning: div.seeAlso '{element}' found without any <p> tags.", element)
                 processed_element_in_section = True
             elif element.name == 'hr':
                 mdx_parts.append("---"); mdx_parts.append(""); processed_element_in_section = True
@@ -403,151 +619,411 @@ def convert_html_to_mdx(html_content, html_filename, logger, html_subdirectory=N
                         text = normalize_text(str(stip_child))  # Process it
                         if text:  # Check if there's any text left after normalization
                             mdx_stip_lines.append(text)
+                            index_passage("body", text)
                             current_block_type_in_stip = 'p'  # Assuming any significant floating text starts a paragraph block
                             processed_stip_child_flag = True
                     elif isinstance(stip_child, Tag):
-                if stip_child.name == 'p':
-                    current_block_type_in_stip = 'p'; raw_p_html_content = stip_child.decode_contents() if stip_child else ""; processed_p_content = process_html_fragment_for_mdx(
-                        raw_p_html_content, logger, html_filename); mdx_stip_lines.append(
-                        normalize_text(processed_p_content)); processed_stip_child_flag = True
-                elif stip_child.name in ['ol', 'ul']:
-                    current_block_type_in_stip = 'list';
-                for i, li in enumerate(stip_child.find_all('li', recursive=False),
-                                       1): prefix = f"  {i}." if stip_child.name == 'ol' else "  -"; mdx_stip_lines.append(
-                    f"{prefix} {normalize_text(get_text_or_empty(li))}"); processed_stip_child_flag = True
-            elif stip_child.has_attr('class') and 'seeAlso' in stip_child.get('class',
-                                                                              []) and 'seeAlsoAdd' not in stip_child.get(
-                    'class', []):  # FIX: div.seeAlso in stip
-                current_block_type_in_stip = 'seeAlso_in_stip'
-                all_see_also_p_tags_stip = stip_child.find_all('p')
-                if all_see_also_p_tags_stip:
-                    for idx_sa_stip, p_sa_stip in enumerate(all_see_also_p_tags_stip):
-                        raw_sa_stip_content = p_sa_stip.decode_contents() if p_sa_stip else ""
-                        processed_sa_stip_content = process_html_fragment_for_mdx(raw_sa_stip_content, logger,
-                                                                                  html_filename,
-                                                                                  is_for_seealso_context=True)
-                        mdx_stip_lines.append(f"<SeeAlso>{normalize_text(processed_sa_stip_content)}</SeeAlso>")
-                        if idx_sa_stip < len(all_see_also_p_tags_stip) - 1 and mdx_stip_lines[
-                            -1].strip() != "": mdx_stip_lines.append("")
-                else:
-                    unrecognized_elements_log.append(
-                        f"{html_filename}: Warning: div.seeAlso in stip '{str(stip_child)[:50]}' found no <p> tags.")
-                processed_stip_child_flag = True
-            elif stip_child.has_attr('class') and 'xampleBlockStip' in stip_child.get('class', []):  # <details>
-                current_block_type_in_stip = 'details';
-                mdx_stip_lines.append("<details>");
-                mdx_stip_lines.append("  <summary>Examples</summary>");
-                mdx_stip_lines.append("  ")
-                examples_div = stip_child.find('div', class_='xamples')
-                if examples_div:
-                    details_content_lines = [];
-                    example_elements = [node for node in examples_div.children if isinstance(node, Tag)];
-                    table_header_needed = True
-                    for element_node_idx, element_node in enumerate(example_elements):
-                        is_direct_content_row_block = element_node.name == 'div' and 'row' in element_node.get('class',
-                                                                                                               []) and 'px-2' in element_node.get(
-                            'class', [])
-                        if element_node.name == 'hr': details_content_lines.append(
-                            "    <hr />"); table_header_needed = True
-                        if element_node_idx < len(example_elements) - 1 and example_elements[
-                            element_node_idx + 1].name != 'hr': details_content_lines.append("    ")
-                    elif element_node.name == 'div':
-                    rows_to_process_this_pass = [element_node] if is_direct_content_row_block else \
-                        [r for r in element_node.find_all('div', class_='row', recursive=True) if
-                         r.find_parent('div', class_='xamples') == examples_div]
-                    if not rows_to_process_this_pass: continue
-                    if any(r.find(class_='xampleLabel') for r in rows_to_process_this_pass) and table_header_needed:
-                        if details_content_lines and details_content_lines[-1].strip() != "" and not \
-                        details_content_lines[-1].strip().endswith(
-                            "|:---------|:------|"): details_content_lines.append("    ")
-                        details_content_lines.append("    | Property | Value |");
-                        details_content_lines.append("    |:---------|:------|");
-                        table_header_needed = False
-                    for ex_part_row in rows_to_process_this_pass:
-                        is_comment_row = bool(ex_part_row.find(class_='editComment'))
-                        is_full_example_comment = False
-                        if is_comment_row:
-                            comment_text_check = ex_part_row.find(class_='editComment').get_text(strip=True)
-                            if "[Full example:" in comment_text_check: is_full_example_comment = True
-
-                        if is_comment_row and is_full_example_comment and details_content_lines and \
-                                details_content_lines[-1].strip().endswith("|"):
-                            details_content_lines.append(
-                                "    ")  # Add blank line before Full Example comment if after table
-
-                        new_lines, table_header_needed, unrec_ex = process_example_content_row(ex_part_row,
-                                                                                               table_header_needed,
-                                                                                               logger, html_filename)
-                        if unrec_ex: unrecognized_elements_log.append(
-                            f"{html_filename}: Warning: Unrecognized structure in example row.")
-                        details_content_lines.extend(new_lines)
-                    if details_content_lines and details_content_lines[-1].strip() != "":
-                        if element_node_idx < len(example_elements) - 1 and example_elements[
-                            element_node_idx + 1].name != 'hr':
-                            details_content_lines.append("    ")
-                        elif element_node_idx == len(example_elements) - 1:
-                            details_content_lines.append("    ")
-                else:
-                    unrecognized_elements_log.append(
-                        f"{html_filename}: Warning: Unrecognized tag '{element_node.name}' directly inside div.xamples: {str(element_node)[:100]}")
-            mdx_stip_lines.extend(details_content_lines)
-        mdx_stip_lines.append("</details>");
-        processed_stip_child_flag = True
-    elif stip_child.name == 'div' and 'd-flex' in stip_child.get('class', []) and 'flexrow' in stip_child.get('class',
-                                                                                                              []):
-    if stip_child.find('div', class_='mandatory'): processed_stip_child_flag = True
-
-
-if not processed_stip_child_flag: unrecognized_elements_log.append(
-    f"{html_filename}: Warning: Unrecognized tag '{stip_child.name}' inside div.stip: {str(stip_child)[:100]}")
-if current_block_type_in_stip: last_block_type_in_stip = current_block_type_in_stip
-if idx_stip_child < len(stip_children_tags) - 1 and current_block_type_in_stip:
-    if mdx_stip_lines and mdx_stip_lines[-1].strip() != "": mdx_stip_lines.append("")
-clean_stip_lines = [];
-if mdx_stip_lines:  # ... (stip body assembly) ...
-    first_line_idx = 0
-    while first_line_idx < len(mdx_stip_lines) and mdx_stip_lines[first_line_idx].strip() == "": first_line_idx += 1
-    if first_line_idx < len(mdx_stip_lines): clean_stip_lines.append(mdx_stip_lines[first_line_idx])
-    for i_line in range(first_line_idx + 1, len(mdx_stip_lines)):
-        if not (mdx_stip_lines[i_line].strip() == "" and clean_stip_lines and clean_stip_lines[-1].strip() == ""):
-            clean_stip_lines.append(mdx_stip_lines[i_line])
-        elif mdx_stip_lines[i_line].strip() == "" and clean_stip_lines and clean_stip_lines[-1].strip() != "":
-            clean_stip_lines.append(mdx_stip_lines[i_line])
-stip_body_parts = []
-for line_idx, line_content in enumerate(clean_stip_lines):
-    if line_content.startswith("  ") or line_content.startswith("<details>") or line_content.startswith(
-        "</details>") or line_content.startswith("<Mandatory />") or line_content.strip().startswith(
-        "|") or line_content.strip().startswith("*") or line_content.startswith("<SeeAlso"):
-        stip_body_parts.append(line_content)
-    elif line_content == "":
-        stip_body_parts.append("")
+                        if stip_child.name == 'p':
+                            current_block_type_in_stip = 'p'; raw_p_html_content = stip_child.decode_contents() if stip_child else ""; processed_p_content = process_html_fragment_for_mdx(
+                                raw_p_html_content, logger, html_filename, standard=standard); mdx_stip_lines.append(
+                                normalize_text(processed_p_content)); processed_stip_child_flag = True
+                            index_passage("body", mdx_stip_lines[-1])
+                        elif stip_child.name in ['ol', 'ul']:
+                            current_block_type_in_stip = 'list';
+                            for i, li in enumerate(stip_child.find_all('li', recursive=False),
+                                                   1): prefix = f"  {i}." if stip_child.name == 'ol' else "  -"; mdx_stip_lines.append(
+                                f"{prefix} {normalize_text(get_text_or_empty(li))}"); processed_stip_child_flag = True; index_passage(
+                                "body", mdx_stip_lines[-1][len(prefix) + 1:])
+                        elif stip_child.has_attr('class') and 'seeAlso' in stip_child.get('class',
+                                                                                          []) and 'seeAlsoAdd' not in stip_child.get(
+                                'class', []):  # FIX: div.seeAlso in stip
+                            current_block_type_in_stip = 'seeAlso_in_stip'
+                            all_see_also_p_tags_stip = stip_child.find_all('p')
+                            if all_see_also_p_tags_stip:
+                                for idx_sa_stip, p_sa_stip in enumerate(all_see_also_p_tags_stip):
+                                    raw_sa_stip_content = p_sa_stip.decode_contents() if p_sa_stip else ""
+                                    processed_sa_stip_content = process_html_fragment_for_mdx(raw_sa_stip_content, logger,
+                                                                                              html_filename,
+                                                                                              is_for_seealso_context=True,
+                                                                                              standard=standard)
+                                    mdx_stip_lines.append(f"<SeeAlso>{normalize_text(processed_sa_stip_content)}</SeeAlso>")
+                                    if idx_sa_stip < len(all_see_also_p_tags_stip) - 1 and mdx_stip_lines[
+                                        -1].strip() != "": mdx_stip_lines.append("")
+                            else:
+                                note("stip-see-also-empty", "Warning: div.seeAlso in stip '{element}' found no <p> tags.",
+                                     stip_child)
+                            processed_stip_child_flag = True
+                        elif stip_child.has_attr('class') and 'xampleBlockStip' in stip_child.get('class', []):  # <details>
+                            current_block_type_in_stip = 'details';
+                            mdx_stip_lines.append("<details>");
+                            mdx_stip_lines.append("  <summary>Examples</summary>");
+                            mdx_stip_lines.append("  ")
+                            examples_div = stip_child.find('div', class_='xamples')
+                            if examples_div and example_dataset is not None:
+                                example_key = examples_div.get('id') or f"examples{len(example_dataset) + 1}"
+                                if example_key in example_dataset: example_key = f"{example_key}-{len(example_dataset) + 1}"
+                                example_groups, unrec_ex = extract_example_groups(
+                                    examples_div, standard.local_docs_href(target_href_in_html).replace('.html', ''),
+                                    html_filename)
+                                if unrec_ex: note("example-row-structure", "Warning: Unrecognized structure in example row.",
+                                                  examples_div)
+                                example_dataset[example_key] = example_groups
+                                for group_idx in range(len(example_groups)):
+                                    mdx_stip_lines.append(
+                                        f'    <ExampleTable {{...{EXAMPLES_IMPORT_NAME}["{example_key}"][{group_idx}]}} />')
+                            elif examples_div:
+                                details_content_lines = [];
+                                example_elements = [node for node in examples_div.children if isinstance(node, Tag)];
+                                table_header_needed = True
+                                for element_node_idx, element_node in enumerate(example_elements):
+                                    is_direct_content_row_block = element_node.name == 'div' and 'row' in element_node.get('class',
+                                                                                                                           []) and 'px-2' in element_node.get(
+                                        'class', [])
+                                    if element_node.name == 'hr':
+                                        details_content_lines.append("    <hr />"); table_header_needed = True
+                                        if element_node_idx < len(example_elements) - 1 and example_elements[
+                                            element_node_idx + 1].name != 'hr': details_content_lines.append("    ")
+                                    elif element_node.name == 'div':
+                                        rows_to_process_this_pass = collect_example_rows(element_node, is_direct_content_row_block)
+                                        if not rows_to_process_this_pass: continue
+                                        if any(r.label for r in rows_to_process_this_pass) and table_header_needed:
+                                            if details_content_lines and details_content_lines[-1].strip() != "" and not \
+                                            details_content_lines[-1].strip().endswith(
+                                                "|:---------|:------|"): details_content_lines.append("    ")
+                                            details_content_lines.append("    | Property | Value |");
+                                            details_content_lines.append("    |:---------|:------|");
+                                            table_header_needed = False
+                                        for ex_part_row in rows_to_process_this_pass:
+                                            is_comment_row = bool(ex_part_row.comment)
+                                            is_full_example_comment = False
+                                            if is_comment_row:
+                                                comment_text_check = ex_part_row.comment.get_text(strip=True)
+                                                if "[Full example:" in comment_text_check: is_full_example_comment = True
+
+                                            if is_comment_row and is_full_example_comment and details_content_lines and \
+                                                    details_content_lines[-1].strip().endswith("|"):
+                                                details_content_lines.append(
+                                                    "    ")  # Add blank line before Full Example comment if after table
+
+                                            new_lines, table_header_needed, unrec_ex = process_example_content_row(ex_part_row,
+                                                                                                                   table_header_needed,
+                                                                                                                   logger, html_filename,
+                                                                                                                   standard)
+                                            if unrec_ex: note("example-row-structure",
+                                                              "Warning: Unrecognized structure in example row: {element}",
+                                                              ex_part_row.tag)
+                                            details_content_lines.extend(new_lines)
+                                        if details_content_lines and details_content_lines[-1].strip() != "":
+                                            if element_node_idx < len(example_elements) - 1 and example_elements[
+                                                element_node_idx + 1].name != 'hr':
+                                                details_content_lines.append("    ")
+                                            elif element_node_idx == len(example_elements) - 1:
+                                                details_content_lines.append("    ")
+                                    else:
+                                        note("examples-unrecognized-tag",
+                                             f"Warning: Unrecognized tag '{element_node.name}' directly inside div.xamples: {{element}}",
+                                             element_node)
+                                mdx_stip_lines.extend(details_content_lines)
+                            mdx_stip_lines.append("</details>");
+                            processed_stip_child_flag = True
+                        elif stip_child.name == 'div' and 'd-flex' in stip_child.get('class', []) and 'flexrow' in stip_child.get('class',
+                                                                                                                          []):
+                            if stip_child.find('div', class_='mandatory'): processed_stip_child_flag = True
+
+                    if not processed_stip_child_flag: note(
+                        "stip-unrecognized-tag", f"Warning: Unrecognized tag '{stip_child.name}' inside div.stip: {{element}}",
+                        stip_child)
+                    if current_block_type_in_stip: last_block_type_in_stip = current_block_type_in_stip
+                    if idx_stip_child < len(stip_children_tags) - 1 and current_block_type_in_stip:
+                        if mdx_stip_lines and mdx_stip_lines[-1].strip() != "": mdx_stip_lines.append("")
+                clean_stip_lines = [];
+                if mdx_stip_lines:  # ... (stip body assembly) ...
+                    first_line_idx = 0
+                    while first_line_idx < len(mdx_stip_lines) and mdx_stip_lines[first_line_idx].strip() == "": first_line_idx += 1
+                    if first_line_idx < len(mdx_stip_lines): clean_stip_lines.append(mdx_stip_lines[first_line_idx])
+                    for i_line in range(first_line_idx + 1, len(mdx_stip_lines)):
+                        if not (mdx_stip_lines[i_line].strip() == "" and clean_stip_lines and clean_stip_lines[-1].strip() == ""):
+                            clean_stip_lines.append(mdx_stip_lines[i_line])
+                        elif mdx_stip_lines[i_line].strip() == "" and clean_stip_lines and clean_stip_lines[-1].strip() != "":
+                            clean_stip_lines.append(mdx_stip_lines[i_line])
+                stip_body_parts = []
+                for line_idx, line_content in enumerate(clean_stip_lines):
+                    if line_content.startswith("  ") or line_content.startswith("<details>") or line_content.startswith(
+                        "</details>") or line_content.startswith("<Mandatory />") or line_content.strip().startswith(
+                        "|") or line_content.strip().startswith("*") or line_content.startswith("<SeeAlso"):
+                        stip_body_parts.append(line_content)
+                    elif line_content == "":
+                        stip_body_parts.append("")
+                    else:
+                        stip_body_parts.append(line_content)
+                stip_body = "\n  ".join(stip_body_parts).rstrip()
+                mdx_parts.append(f'<div className="stip">\n  {stip_body}\n</div>');
+                if not (content_block_node_idx == len(content_nodes_to_iterate) - 1 and element_idx == len(
+                    elements_to_process_this_block) - 1) and mdx_parts[-1].strip() != "": mdx_parts.append("")
+                processed_element_in_section = True
+            if not processed_element_in_section and isinstance(element, Tag) and element.name not in ['script', 'style', 'meta',
+                                                                                                      'link', 'title', 'h3']:
+                note("content-unrecognized-element",
+                     f"Warning: Unrecognized element type '{element.name}' in main content: {{element}}", element)
+
+    if example_dataset:
+        examples_json_name = os.path.splitext(html_filename)[0] + EXAMPLES_JSON_SUFFIX
+        mdx_parts[title_part_index:title_part_index] = [f"import {EXAMPLES_IMPORT_NAME} from './{examples_json_name}';", ""]
+    report_diagnostics(diagnostics_found, logger, diagnostics,
+                       f"{html_subdirectory}/{html_filename}" if html_subdirectory else html_filename)
+    final_mdx_output_lines = []
+    if mdx_parts:  # ... (final output filter) ...
+        if mdx_parts[0].strip() != "" or (len(mdx_parts) > 1 and mdx_parts[1].strip() != ""): final_mdx_output_lines.append(
+            mdx_parts[0])
+        for i in range(1, len(mdx_parts)):
+            if mdx_parts[i].strip() != "" or (
+                    mdx_parts[i].strip() == "" and final_mdx_output_lines and final_mdx_output_lines[
+                -1].strip() != ""): final_mdx_output_lines.append(mdx_parts[i])
+    # Remove multiple trailing blank lines, but keep one if content ends with an intentional blank
+    while len(final_mdx_output_lines) > 1 and final_mdx_output_lines[-1].strip() == "" and final_mdx_output_lines[
+        -2].strip() == "": final_mdx_output_lines.pop()
+    if not final_mdx_output_lines or (len(final_mdx_output_lines) == 1 and final_mdx_output_lines[
+        0].strip() == ""): return ""  # Return empty string for empty/whitespace-only output
+    return "\n".join(final_mdx_output_lines) + "\n"
+
+
+# --- Batch Helpers ---
+def discover_html_files(abs_source_dir, recursive=False):
+    items_to_scan = []
+    if recursive:
+        for root, _, files in os.walk(abs_source_dir):
+            for filename in files:
+                if filename.lower().endswith(".html"): items_to_scan.append(os.path.join(root, filename))
     else:
-        stip_body_parts.append(line_content)
-stip_body = "\n  ".join(stip_body_parts).rstrip()
-mdx_parts.append(f'<div className="stip">\n  {stip_body}\n</div>');
-if not (content_block_node_idx == len(content_nodes_to_iterate) - 1 and element_idx == len(
-    elements_to_process_this_block) - 1) and mdx_parts[-1].strip() != "": mdx_parts.append("")
-processed_element_in_section = True
-if not processed_element_in_section and isinstance(element, Tag) and element.name not in ['script', 'style', 'meta',
-                                                                                          'link', 'title', 'h3']:
-    unrecognized_elements_log.append(
-        f"{html_filename}: Warning: Unrecognized element type '{element.name}' in main content: {str(element)[:100]}")
-
-for log_msg in set(unrecognized_elements_log): logger.warning(f"{log_msg}")
-final_mdx_output_lines = []
-if mdx_parts:  # ... (final output filter) ...
-    if mdx_parts[0].strip() != "" or (len(mdx_parts) > 1 and mdx_parts[1].strip() != ""): final_mdx_output_lines.append(
-        mdx_parts[0])
-    for i in range(1, len(mdx_parts)):
-        if mdx_parts[i].strip() != "" or (
-                mdx_parts[i].strip() == "" and final_mdx_output_lines and final_mdx_output_lines[
-            -1].strip() != ""): final_mdx_output_lines.append(mdx_parts[i])
-# Remove multiple trailing blank lines, but keep one if content ends with an intentional blank
-while len(final_mdx_output_lines) > 1 and final_mdx_output_lines[-1].strip() == "" and final_mdx_output_lines[
-    -2].strip() == "": final_mdx_output_lines.pop()
-if not final_mdx_output_lines or (len(final_mdx_output_lines) == 1 and final_mdx_output_lines[
-    0].strip() == ""): return ""  # Return empty string for empty/whitespace-only output
-return "\n".join(final_mdx_output_lines) + "\n"
+        for filename in os.listdir(abs_source_dir):
+            if filename.lower().endswith(".html"):
+                html_file_path = os.path.join(abs_source_dir, filename)
+                if os.path.isfile(html_file_path): items_to_scan.append(html_file_path)
+    return items_to_scan
+
+
+def html_subdirectory_for(html_file_path, abs_source_dir):
+    abs_html_file_dir = os.path.abspath(os.path.dirname(html_file_path))
+    html_subdirectory = ""
+    # Ensure relpath is calculated from the true root of the docs content passed in source_dir
+    if abs_html_file_dir.startswith(abs_source_dir) and abs_html_file_dir != abs_source_dir:
+        html_subdirectory = os.path.relpath(abs_html_file_dir, abs_source_dir)
+        if html_subdirectory == '.': html_subdirectory = ""
+        html_subdirectory = html_subdirectory.replace(os.sep, '/')
+    return html_subdirectory
+
+
+def mdx_path_for(html_file_path, abs_source_dir, dest_dir):
+    relative_path_for_output = os.path.relpath(html_file_path, abs_source_dir)
+    mdx_filename_part = os.path.splitext(relative_path_for_output)[0] + ".mdx"
+    return os.path.join(dest_dir, mdx_filename_part)
+
+
+def read_html_file(html_file_path):
+    with open(html_file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_mdx_file(mdx_file_path, mdx_output):
+    mdx_file_dir = os.path.dirname(mdx_file_path)
+    if not os.path.exists(mdx_file_dir): os.makedirs(mdx_file_dir, exist_ok=True)
+    with open(mdx_file_path, 'w', encoding='utf-8') as f:
+        f.write(mdx_output)
+
+
+def examples_json_text(example_dataset):
+    return json.dumps(example_dataset, ensure_ascii=False, indent=2) + "\n"
+
+
+def write_examples_json(mdx_file_path, example_dataset):
+    # The MDX imports this file by name, so it always sits next to the MDX file
+    examples_json_path = os.path.splitext(mdx_file_path)[0] + EXAMPLES_JSON_SUFFIX
+    with open(examples_json_path, 'w', encoding='utf-8') as f:
+        f.write(examples_json_text(example_dataset))
+
+
+def doc_key_for(mdx_file_path, dest_dir):
+    # 'statements/1025': the page's MDX path without extension, its id in the search index and docs store
+    return os.path.splitext(relative_key(mdx_file_path, dest_dir))[0]
+
+
+def write_page_outputs(mdx_file_path, dest_dir, mdx_output, example_dataset=None, search_record=None, search_dir=None,
+                       store=None, diagnostic_counts=None):
+    # With a store, the page goes into it instead of the docs tree; docs_store.py export writes it out later
+    doc = doc_key_for(mdx_file_path, dest_dir)
+    if store:
+        store.put_page(doc, mdx_output, examples_json_text(example_dataset) if example_dataset else None,
+                       diagnostic_counts)
+    else:
+        write_mdx_file(mdx_file_path, mdx_output)
+        if example_dataset: write_examples_json(mdx_file_path, example_dataset)
+    if search_record is not None: write_page_record(search_dir, doc, search_record)
+
+
+def convert_files_async(items_to_scan, abs_source_dir, dest_dir, logger, element_registry=None,
+                        prefetch=DEFAULT_PREFETCH, write_behind=DEFAULT_WRITE_BEHIND, io_workers=DEFAULT_IO_WORKERS,
+                        examples_json=False, manifest=None, journal=None, standard=DEFAULT_STANDARD_CONFIG,
+                        diagnostics=None, search_dir=None, store=None):
+    """Converts items_to_scan through the asyncio read/convert/write pipeline. Returns PipelineStats."""
+    def convert_job(html_file_path, html_content):
+        input_hash = content_hash(html_content)
+        if journal and already_converted(journal, html_file_path, input_hash, abs_source_dir, dest_dir, search_dir,
+                                         store):
+            return None
+        started = time.perf_counter()
+        example_dataset = {} if examples_json else None
+        search_record = {} if search_dir else None
+        page_diagnostics = page_diagnostics_for(diagnostics, store)
+        mdx_output = convert_html_to_mdx(html_content, os.path.basename(html_file_path), logger,
+                                         html_subdirectory_for(html_file_path, abs_source_dir),
+                                         element_registry=element_registry, example_dataset=example_dataset,
+                                         standard=standard, diagnostics=page_diagnostics, search_record=search_record)
+        diagnostic_counts = merge_page_diagnostics(diagnostics, page_diagnostics, html_file_path, abs_source_dir)
+        return mdx_output, example_dataset, search_record, diagnostic_counts, input_hash, time.perf_counter() - started
+
+    def write_job(html_file_path, converted):
+        mdx_file_path = mdx_path_for(html_file_path, abs_source_dir, dest_dir)
+        if converted is None:
+            logger.info(f"Skipped (unchanged since last run): {html_file_path}")
+        else:
+            mdx_output, example_dataset, search_record, diagnostic_counts, input_hash, seconds = converted
+            write_page_outputs(mdx_file_path, dest_dir, mdx_output, example_dataset, search_record, search_dir, store,
+                               diagnostic_counts)
+            if journal: journal.record(html_file_path, input_hash, "ok")
+            logger.info(f"Successfully converted: {html_file_path} -> {mdx_file_path}")
+            if manifest: manifest.record(html_file_path, "ok", output=mdx_file_path, seconds=seconds)
+            return
+        if manifest: manifest.record(html_file_path, "ok", output=mdx_file_path)
+
+    def on_error(html_file_path, stage, exc):
+        logger.error(f"Failed to convert {html_file_path} ({stage}): {exc}", exc_info=exc)
+        if manifest: manifest.record(html_file_path, "failed", error=f"{stage}: {exc}")
+        if journal: journal.record(html_file_path, None, "failed", error=f"{stage}: {exc}")
+
+    return run_pipeline(items_to_scan, read_html_bytes, convert_job, write_job, prefetch=prefetch,
+                        write_behind=write_behind, io_workers=io_workers, on_error=on_error)
+
+
+def already_converted(journal, html_file_path, input_hash, abs_source_dir, dest_dir, search_dir=None, store=None):
+    # Done in an earlier run, the HTML is unchanged and its MDX (and search record, when indexing) is still there
+    return journal.is_done(html_file_path, input_hash) and \
+        outputs_exist(mdx_path_for(html_file_path, abs_source_dir, dest_dir), dest_dir, search_dir, store)
+
+
+def outputs_exist(mdx_file_path, dest_dir, search_dir=None, store=None):
+    doc = doc_key_for(mdx_file_path, dest_dir)
+    return (store.has_page(doc) if store else os.path.exists(mdx_file_path)) and \
+        (not search_dir or os.path.exists(page_record_path(search_dir, doc)))
+
+
+def page_diagnostics_for(diagnostics, store):
+    # A store keeps each page's diagnostic counts, so with one they are counted per page and then merged
+    return DiagnosticsSummary() if store and diagnostics is not None else diagnostics
+
+
+def merge_page_diagnostics(diagnostics, page_diagnostics, html_file_path, abs_source_dir):
+    """The page's diagnostic counts for the store (None when not counted per page), merged into diagnostics."""
+    if page_diagnostics is None or page_diagnostics is diagnostics: return None
+    counts = page_diagnostics.counts()
+    diagnostics.merge(relative_key(html_file_path, abs_source_dir), counts)
+    return counts
+
+
+# --- Process Pool Conversion ---
+_pool_worker_context = {}
+
+
+def init_pool_worker(abs_source_dir, dest_dir, element_registry_csv, sheet_snapshot_dir, examples_json,
+                     standard_name=DEFAULT_STANDARD, log_queue=None, log_level=logging.INFO,
+                     aggregate_diagnostics=False, search_dir=None, store_path=None,
+                     fragment_memo_entries=DEFAULT_MEMO_ENTRIES):
+    # Each worker loads the registry and standard config itself (the registry from its snapshot when one exists)
+    # instead of unpickling a copy
+    if log_queue is not None: attach_log_queue(log_queue, log_level)
+    FRAGMENT_MEMO.max_entries = fragment_memo_entries
+    _pool_worker_context.update(
+        abs_source_dir=abs_source_dir, dest_dir=dest_dir, examples_json=examples_json,
+        aggregate_diagnostics=aggregate_diagnostics, search_dir=search_dir,
+        store=DocsStore(store_path) if store_path else None,
+        standard=load_standard_config(standard_name),
+        element_registry=load_element_registry(element_registry_csv, sheet_snapshot_dir) if element_registry_csv else None,
+        logger=logging.getLogger(__name__))
+
+
+def convert_chunk(chunk):
+    """Pool worker: converts and writes each (html_file_path, done_hash) job, skipping unchanged files already done."""
+    context = _pool_worker_context
+    abs_source_dir, dest_dir, search_dir = context["abs_source_dir"], context["dest_dir"], context["search_dir"]
+    store = context["store"]
+    results = []
+    for html_file_path, done_hash in chunk:
+        started, input_hash = time.perf_counter(), None
+        memo_before = FRAGMENT_MEMO.counts()
+        try:
+            with mapped_html(html_file_path) as html_content:
+                input_hash = content_hash(html_content)
+                mdx_file_path = mdx_path_for(html_file_path, abs_source_dir, dest_dir)
+                if input_hash == done_hash and outputs_exist(mdx_file_path, dest_dir, search_dir, store):
+                    results.append(JobResult(html_file_path, "skipped", None, input_hash, None))
+                    continue
+                example_dataset = {} if context["examples_json"] else None
+                page_diagnostics = DiagnosticsSummary() if context["aggregate_diagnostics"] else None
+                search_record = {} if search_dir else None
+                mdx_output = convert_html_to_mdx(html_content, os.path.basename(html_file_path), context["logger"],
+                                                 html_subdirectory_for(html_file_path, abs_source_dir),
+                                                 element_registry=context["element_registry"],
+                                                 example_dataset=example_dataset, standard=context["standard"],
+                                                 diagnostics=page_diagnostics, search_record=search_record)
+            seconds = time.perf_counter() - started
+            diagnostic_counts = page_diagnostics.counts() if page_diagnostics else None
+            write_page_outputs(mdx_file_path, dest_dir, mdx_output, example_dataset, search_record, search_dir, store,
+                               diagnostic_counts)
+            results.append(JobResult(html_file_path, "ok", seconds, input_hash, None, diagnostic_counts,
+                                     counts_delta(FRAGMENT_MEMO.counts(), memo_before)))
+        except Exception as e:
+            results.append(JobResult(html_file_path, "failed", None, input_hash, str(e)))
+    return results
+
+
+def convert_files_pooled(items_to_scan, abs_source_dir, dest_dir, logger, workers, element_registry_csv=None,
+                         sheet_snapshot_dir=None, examples_json=False, previous_timings=None, manifest=None,
+                         journal=None, standard_name=DEFAULT_STANDARD, recycle_after_files=None,
+                         max_worker_rss_mb=None, diagnostics=None, log_queue=None, search_dir=None, store_path=None):
+    """
+    Converts items_to_scan on a pool of worker processes, largest pages first: by the previous run's convert
+    times where available, otherwise by HTML size (see conversion_scheduler.plan_chunks). Workers log into
+    log_queue when given, and send their page diagnostics back to be counted in diagnostics. Returns PoolStats.
+    """
+    costs = estimate_costs(items_to_scan, abs_source_dir, previous_timings)
+    jobs = [(p, journal.done_hash(p) if journal else None) for p in items_to_scan]
+    chunks = plan_chunks(jobs, costs, workers)
+    logger.info(f"Scheduling {len(jobs)} file(s) as {len(chunks)} chunk(s) on {workers} worker(s), largest first "
+                f"(by {'previous timings' if previous_timings else 'input size'}).")
+
+    def on_results(results):
+        for result in results:
+            mdx_file_path = mdx_path_for(result.path, abs_source_dir, dest_dir)
+            if result.status == "failed":
+                logger.error(f"Failed to convert {result.path}: {result.error}")
+                if manifest: manifest.record(result.path, "failed", error=result.error)
+                if journal: journal.record(result.path, result.digest, "failed", error=result.error)
+                continue
+            if result.status == "skipped":
+                logger.info(f"Skipped (unchanged since last run): {result.path}")
+            else:
+                if journal: journal.record(result.path, result.digest, "ok")
+                if diagnostics is not None and result.diagnostics:
+                    diagnostics.merge(relative_key(result.path, abs_source_dir), result.diagnostics)
+                if result.fragment_memo: FRAGMENT_MEMO.merge(result.fragment_memo)
+                logger.info(f"Successfully converted: {result.path} -> {mdx_file_path}")
+            if manifest: manifest.record(result.path, "ok", output=mdx_file_path, seconds=result.seconds)
+
+    return run_pool(chunks, convert_chunk, workers, init_pool_worker,
+                    (abs_source_dir, dest_dir, element_registry_csv, sheet_snapshot_dir, examples_json, standard_name,
+                     log_queue, logging.getLogger().getEffectiveLevel(), diagnostics is not None, search_dir,
+                     store_path, FRAGMENT_MEMO.max_entries),
+                    on_results, job_path=lambda job: job[0], recycle_after_files=recycle_after_files,
+                    max_worker_rss_mb=max_worker_rss_mb)
 
 
 # --- Main Execution Logic ---
@@ -556,60 +1032,180 @@ def main():
     parser.add_argument("source_dir", help="Source directory containing HTML files.")
     parser.add_argument("dest_dir", help="Destination directory for converted MDX files.")
     parser.add_argument("--log_file", default="conversion_log.txt", help="File to store conversion logs.")
+    parser.add_argument("--log_level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+                        help="Logging level. DEBUG also logs every diagnostic of every page.")
+    parser.add_argument("--diagnostics", choices=["summary", "per_file"], default="summary",
+                        help="summary: count the converter's warnings across the run and log them once at the end, "
+                             "with sample files. per_file: log each page's warnings as it is converted.")
+    parser.add_argument("--diagnostics_report",
+                        help="With --diagnostics summary: also write the counts to this JSON file (shard-suffixed).")
     parser.add_argument("--recursive", action="store_true", help="Process HTML files in subdirectories recursively.")
+    parser.add_argument("--standard", default=DEFAULT_STANDARD,
+                        help="Standard whose site path and element URIs the HTML uses: a name from standard_configs/ "
+                             "or a config YAML path.")
+    parser.add_argument("--element_registry",
+                        help="Elements CSV (isbd-sheets format) used to fill and cross-check RDF front matter, "
+                             "e.g. output/isbd-sheets/isbd-elements/isbd-elements.csv.")
+    parser.add_argument("--sheet_snapshot_dir",
+                        help="Directory for memory-mapped snapshots of sheet CSVs, reused while the CSV is unchanged.")
+    parser.add_argument("--examples_json", action="store_true",
+                        help="Write each page's examples to <page>.examples.json and render them as <ExampleTable> "
+                             "components importing it, instead of inline markdown tables.")
+    parser.add_argument("--search_index",
+                        help="Directory for search index output: each converted page's title, RDF definition, scope "
+                             "note and body passages as a record under pages/, then one inverted-index shard per "
+                             "section, rebuilt for the sections whose records changed (see search_index.py).")
+    parser.add_argument("--store",
+                        help="Write the converted pages (MDX, parsed front matter, links and, with --diagnostics "
+                             "summary, diagnostic counts) to this SQLite store instead of dest_dir. docs_store.py "
+                             "export writes the pages changed since the last export to the docs tree.")
+    parser.add_argument("--fragment_memo", type=int, default=DEFAULT_MEMO_ENTRIES,
+                        help="Rendered inline fragments (SeeAlso, guidance paragraphs) memoised across pages, per "
+                             "process; hit rate and bytes saved are logged at the end. 0 turns the memo off.")
+    parser.add_argument("--shard", type=parse_shard_spec,
+                        help="Convert only shard i of N (e.g. 2/4) of the discovered files, partitioned by a stable "
+                             "hash of their relative path. The log and manifest names get a shard suffix.")
+    parser.add_argument("--manifest",
+                        help=f"Write a result manifest (JSON) for conversion_shards.py merge. Defaults to "
+                             f"{DEFAULT_MANIFEST_FILE} (shard-suffixed) when --shard is given.")
+    parser.add_argument("--journal",
+                        help=f"Append each finished file (input hash and outcome) to this progress journal. "
+                             f"Defaults to {DEFAULT_JOURNAL_FILE} (shard-suffixed) with --resume.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its journal: skip files converted from unchanged "
+                             "HTML, retry failures and everything not yet done.")
+    parser.add_argument("--fsync_batch", type=int, default=DEFAULT_FSYNC_BATCH,
+                        help="Journal records written between fsyncs.")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Convert on this many worker processes, largest pages first. 0 converts in this process.")
+    parser.add_argument("--timings_from", nargs="+",
+                        help="Manifests of a previous run whose per-file convert times order the --workers schedule. "
+                             "Defaults to this run's --manifest file if it exists; otherwise HTML sizes are used.")
+    parser.add_argument("--recycle_after", type=int,
+                        help="With --workers: replace a worker process with a fresh one after it converts this many files.")
+    parser.add_argument("--max_worker_rss_mb", type=int,
+                        help="With --workers: replace a worker process once its resident memory exceeds this many MiB.")
+    parser.add_argument("--async_io", action="store_true",
+                        help="Overlap file reads and writes with conversion using an asyncio pipeline.")
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH,
+                        help="With --async_io: max HTML files read ahead of the converter.")
+    parser.add_argument("--write_behind", type=int, default=DEFAULT_WRITE_BEHIND,
+                        help="With --async_io: max converted files queued for writing before conversion pauses.")
+    parser.add_argument("--io_workers", type=int, default=DEFAULT_IO_WORKERS,
+                        help="With --async_io: concurrent file reads/writes.")
     args = parser.parse_args()
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
-                        handlers=[logging.FileHandler(args.log_file, mode='w', encoding='utf-8'),
-                                  logging.StreamHandler()])
+    if args.workers and args.async_io: parser.error("--workers and --async_io are alternatives; choose one.")
+    if (args.recycle_after or args.max_worker_rss_mb) and not args.workers:
+        parser.error("--recycle_after and --max_worker_rss_mb apply to --workers runs.")
+    if args.diagnostics_report and args.diagnostics != "summary":
+        parser.error("--diagnostics_report needs --diagnostics summary.")
+    args.log_file = shard_suffixed(args.log_file, args.shard)
+    # Records are queued and written by a listener thread, so conversion never waits on the file or console
+    log_handlers = [logging.FileHandler(args.log_file, mode='w', encoding='utf-8'), logging.StreamHandler()]
+    for handler in log_handlers: handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    log_queue = start_queued_logging(log_handlers, getattr(logging, args.log_level))
     logger = logging.getLogger(__name__)
+    diagnostics = DiagnosticsSummary() if args.diagnostics == "summary" else None
     logger.info(f"Starting conversion from '{os.path.abspath(args.source_dir)}' to '{os.path.abspath(args.dest_dir)}'");
     logger.info(f"Logging to: {os.path.abspath(args.log_file)}")
+    standard = load_standard_config(args.standard)
+    logger.info(f"Standard: {standard.name}")
+    FRAGMENT_MEMO.max_entries = args.fragment_memo
     os.makedirs(args.dest_dir, exist_ok=True)
+    element_registry = load_element_registry(args.element_registry, args.sheet_snapshot_dir) if args.element_registry else None
+    # Modules, compiled selectors and the registry live for the whole run: keep them out of every collection
+    # (and, for --workers, from the collector touching pages the forked workers share)
+    gc.freeze()
+    store = DocsStore(args.store) if args.store else None
+    if store: logger.info(f"Writing pages to the docs store {os.path.abspath(args.store)}")
     files_processed_count = 0;
     conversion_errors = 0
-    items_to_scan = []
     abs_source_dir_for_main = os.path.abspath(args.source_dir)
+    discovered_files = discover_html_files(abs_source_dir_for_main, args.recursive)
+    items_to_scan = select_shard(discovered_files, abs_source_dir_for_main, args.shard)
+    manifest_path = args.manifest or (DEFAULT_MANIFEST_FILE if args.shard else None)
+    manifest = ShardManifest("html_to_mdx_v2", abs_source_dir_for_main, args.shard, discovered_files,
+                             items_to_scan) if manifest_path else None
+    if args.shard:
+        logger.info(f"Shard {args.shard[0]}/{args.shard[1]}: {len(items_to_scan)} of {len(discovered_files)} file(s).")
 
-    if args.recursive:
-        for root, _, files in os.walk(abs_source_dir_for_main):
-            for filename in files:
-                if filename.lower().endswith(".html"): items_to_scan.append(os.path.join(root, filename))
-    else:
-        for filename in os.listdir(abs_source_dir_for_main):
-            if filename.lower().endswith(".html"):
-                html_file_path = os.path.join(abs_source_dir_for_main, filename)
-                if os.path.isfile(html_file_path): items_to_scan.append(html_file_path)
+    journal_path = args.journal or (DEFAULT_JOURNAL_FILE if args.resume else None)
+    journal = ProgressJournal(shard_suffixed(journal_path, args.shard), abs_source_dir_for_main, resume=args.resume,
+                              fsync_batch=args.fsync_batch) if journal_path else None
+
+    if args.workers:
+        timings_from = args.timings_from
+        if not timings_from and manifest_path and os.path.exists(shard_suffixed(manifest_path, args.shard)):
+            timings_from = [shard_suffixed(manifest_path, args.shard)]  # The previous run's manifest
+        previous_timings = load_previous_timings(timings_from, abs_source_dir_for_main) if timings_from else None
+        stats = convert_files_pooled(items_to_scan, abs_source_dir_for_main, args.dest_dir, logger, args.workers,
+                                     args.element_registry, args.sheet_snapshot_dir, args.examples_json,
+                                     previous_timings, manifest, journal, args.standard, args.recycle_after,
+                                     args.max_worker_rss_mb, diagnostics, log_queue, args.search_index, args.store)
+        log_pool_stats(stats, logger)
+        files_processed_count, conversion_errors = stats.files_ok, stats.files_failed
+        items_to_scan = []
+    elif args.async_io:
+        stats = convert_files_async(items_to_scan, abs_source_dir_for_main, args.dest_dir, logger, element_registry,
+                                    args.prefetch, args.write_behind, args.io_workers, args.examples_json, manifest,
+                                    journal, standard, diagnostics, args.search_index, store)
+        log_pipeline_stats(stats, logger)
+        files_processed_count, conversion_errors = stats.files_ok, stats.files_failed
+        items_to_scan = []
 
     for html_file_path in items_to_scan:
+        input_hash = None
         try:
-            logger.info(f"Processing: {html_file_path}")
-            abs_html_file_dir = os.path.abspath(os.path.dirname(html_file_path))
-            html_subdirectory = ""
-            # Ensure relpath is calculated from the true root of the docs content passed in source_dir
-            if abs_html_file_dir.startswith(abs_source_dir_for_main) and abs_html_file_dir != abs_source_dir_for_main:
-                html_subdirectory = os.path.relpath(abs_html_file_dir, abs_source_dir_for_main)
-                if html_subdirectory == '.': html_subdirectory = ""
-                html_subdirectory = html_subdirectory.replace(os.sep, '/')
-
-            relative_path_for_output = os.path.relpath(html_file_path, abs_source_dir_for_main)
-            mdx_filename_part = os.path.splitext(relative_path_for_output)[0] + ".mdx"
-            mdx_file_path = os.path.join(args.dest_dir, mdx_filename_part)
-            mdx_file_dir = os.path.dirname(mdx_file_path)
-            if not os.path.exists(mdx_file_dir): os.makedirs(mdx_file_dir, exist_ok=True)
-            with open(html_file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            mdx_output = convert_html_to_mdx(html_content, os.path.basename(html_file_path), logger, html_subdirectory)
-            with open(mdx_file_path, 'w', encoding='utf-8') as f:
-                f.write(mdx_output)
+            html_subdirectory = html_subdirectory_for(html_file_path, abs_source_dir_for_main)
+            mdx_file_path = mdx_path_for(html_file_path, abs_source_dir_for_main, args.dest_dir)
+            with mapped_html(html_file_path) as html_content:
+                input_hash = content_hash(html_content)
+                if journal and already_converted(journal, html_file_path, input_hash, abs_source_dir_for_main,
+                                                 args.dest_dir, args.search_index, store):
+                    logger.info(f"Skipped (unchanged since last run): {html_file_path}")
+                    if manifest: manifest.record(html_file_path, "ok", output=mdx_file_path)
+                    files_processed_count += 1
+                    continue
+                logger.info(f"Processing: {html_file_path}")
+                started = time.perf_counter()
+                example_dataset = {} if args.examples_json else None
+                search_record = {} if args.search_index else None
+                page_diagnostics = page_diagnostics_for(diagnostics, store)
+                mdx_output = convert_html_to_mdx(html_content, os.path.basename(html_file_path), logger,
+                                                 html_subdirectory, element_registry=element_registry,
+                                                 example_dataset=example_dataset, standard=standard,
+                                                 diagnostics=page_diagnostics, search_record=search_record)
+            seconds = time.perf_counter() - started
+            diagnostic_counts = merge_page_diagnostics(diagnostics, page_diagnostics, html_file_path,
+                                                       abs_source_dir_for_main)
+            write_page_outputs(mdx_file_path, args.dest_dir, mdx_output, example_dataset, search_record,
+                               args.search_index, store, diagnostic_counts)
+            if journal: journal.record(html_file_path, input_hash, "ok")
             logger.info(f"Successfully converted: {html_file_path} -> {mdx_file_path}")
+            if manifest: manifest.record(html_file_path, "ok", output=mdx_file_path, seconds=seconds)
             files_processed_count += 1
         except Exception as e:
             logger.error(f"Failed to convert {html_file_path}: {e}", exc_info=True)
+            if manifest: manifest.record(html_file_path, "failed", error=e)
+            if journal: journal.record(html_file_path, input_hash, "failed", error=e)
             conversion_errors += 1
 
+    if journal: journal.close()
+    if store: store.close()
+    if manifest: manifest.write(shard_suffixed(manifest_path, args.shard))
+    if args.search_index and args.shard:
+        logger.info(f"Search records written to {args.search_index}; once every shard has finished, build the "
+                    f"shards with: search_index.py {args.search_index}")
+    elif args.search_index:
+        rebuilt = build_search_shards(args.search_index)
+        logger.info(f"Search index: {len(rebuilt)} section shard(s) rebuilt{': ' + ', '.join(rebuilt) if rebuilt else ''}.")
+    log_memo_stats(FRAGMENT_MEMO, logger)
+    if diagnostics is not None:
+        log_diagnostics_summary(diagnostics, logger)
+        if args.diagnostics_report: diagnostics.write_json(shard_suffixed(args.diagnostics_report, args.shard))
     logger.info(f"Conversion process finished. {files_processed_count} file(s) processed.")
     if conversion_errors > 0: logger.warning(f"{conversion_errors} file(s) encountered errors during conversion.")
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
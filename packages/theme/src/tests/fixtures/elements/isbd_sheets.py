@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+import os
+import re
+import csv
+import json
+import mmap
+import hashlib
+import struct
+import logging
+import argparse
+from array import array
+from collections import namedtuple
+
+# --- Configuration Constants ---
+DEFAULT_SHEETS_ROOT = "output/isbd-sheets/"
+SNAPSHOT_SUFFIX = ".sheet"
+SNAPSHOT_MAGIC = b"ISBDSHT1"
+SNAPSHOT_HEADER_LEN = struct.Struct("<I")
+SNAPSHOT_KEY_CHARS = 12  # Hex digits of the CSV path's hash in a snapshot's file name
+
+# Sheet headers look like 'uri', 'rdfs:label@en', 'rdfs:label@es[1]' or 'skos:definition@en[0]'
+COLUMN_HEADER_RE = re.compile(r'^(?P<property>[^@\[]+?)(?:@(?P<lang>[A-Za-z0-9-]+))?(?:\[(?P<index>\d+)\])?$')
+
+SheetColumn = namedtuple("SheetColumn", ["header", "property", "lang", "index"])
+
+
+def parse_column_header(header):
+    """
+    Splits a sheet column header into (property, language, index).
+    Language is None for non-literal columns, index is 0 for unrepeated columns.
+    """
+    match = COLUMN_HEADER_RE.match(header.strip())
+    if not match: return header.strip(), None, 0
+    index = int(match.group('index')) if match.group('index') is not None else 0
+    return match.group('property'), match.group('lang'), index
+
+
+# --- Data Structures ---
+class SheetRow:
+    def __init__(self, sheet, row_index):
+        self.sheet = sheet
+        self.row_index = row_index
+
+    def get(self, property_name, lang=None, index=0, default=""):
+        column_pos = self.sheet.column_map.get((property_name, lang, index))
+        if column_pos is None: return default
+        return self.sheet.cell(self.row_index, column_pos) or default
+
+    def values(self, property_name, lang=None):
+        """Non-empty values of a repeated column group, in column index order."""
+        cells = (self.sheet.cell(self.row_index, pos) for pos in self.sheet.column_groups.get((property_name, lang), []))
+        return [cell for cell in cells if cell]
+
+    def to_dict(self):
+        return {column.header: self.sheet.cell(self.row_index, pos) for pos, column in enumerate(self.sheet.columns)}
+
+    def __repr__(self):
+        return f"SheetRow(sheet='{self.sheet.name}', row={self.row_index})"
+
+
+class ColumnarSheet:
+    """
+    One sheet CSV held column-oriented: each column is a single UTF-8 blob plus a uint32 offset array.
+    Cells are decoded only when accessed, and blobs may be slices of a memory-mapped snapshot.
+    """
+
+    def __init__(self, name, headers, blobs, offsets, row_count, source_path=None):
+        self.name = name
+        self.source_path = source_path
+        self.row_count = row_count
+        self.columns = [SheetColumn(h, *parse_column_header(h)) for h in headers]
+        self.column_map = {(c.property, c.lang, c.index): pos for pos, c in enumerate(self.columns)}
+        self.column_groups = {}  # (property, lang) -> [column positions ordered by index]
+        for pos, column in sorted(enumerate(self.columns), key=lambda pc: pc[1].index):
+            self.column_groups.setdefault((column.property, column.lang), []).append(pos)
+        self._blobs = blobs
+        self._offsets = offsets
+        self._decoded_columns = {}
+        self._indexes = {}
+
+    def __len__(self):
+        return self.row_count
+
+    def __iter__(self):
+        return (SheetRow(self, i) for i in range(self.row_count))
+
+    @property
+    def languages(self):
+        return sorted({c.lang for c in self.columns if c.lang})
+
+    def cell(self, row_index, column_pos):
+        decoded = self._decoded_columns.get(column_pos)
+        if decoded is not None: return decoded[row_index]
+        offsets = self._offsets[column_pos]
+        return bytes(self._blobs[column_pos][offsets[row_index]:offsets[row_index + 1]]).decode('utf-8')
+
+    def column(self, property_name, lang=None, index=0):
+        """Decodes (once) and returns a whole column as a list of strings."""
+        column_pos = self.column_map.get((property_name, lang, index))
+        if column_pos is None: return []
+        if column_pos not in self._decoded_columns:
+            blob, offsets = bytes(self._blobs[column_pos]), self._offsets[column_pos]
+            self._decoded_columns[column_pos] = [blob[offsets[i]:offsets[i + 1]].decode('utf-8')
+                                                 for i in range(self.row_count)]
+        return self._decoded_columns[column_pos]
+
+    def row(self, row_index):
+        return SheetRow(self, row_index)
+
+    def index_by(self, property_name, lang=None, index=0):
+        """Lazily built value -> SheetRow lookup over one column (first occurrence wins)."""
+        key = (property_name, lang, index)
+        if key not in self._indexes:
+            lookup = {}
+            for row_index, value in enumerate(self.column(property_name, lang, index)):
+                if value and value not in lookup: lookup[value] = SheetRow(self, row_index)
+            self._indexes[key] = lookup
+        return self._indexes[key]
+
+    def find(self, property_name, value, lang=None, index=0):
+        return self.index_by(property_name, lang, index).get(value)
+
+
+# --- Loading ---
+def encode_columns(column_values):
+    blobs, offsets = [], []
+    for values in column_values:
+        encoded = [v.encode('utf-8') for v in values]
+        column_offsets = array('I', [0])
+        running = 0
+        for chunk in encoded:
+            running += len(chunk)
+            column_offsets.append(running)
+        blobs.append(b"".join(encoded))
+        offsets.append(column_offsets)
+    return blobs, offsets
+
+
+def parse_sheet_csv(csv_path, name=None):
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        column_values = [[] for _ in headers]
+        row_count = 0
+        for row in reader:
+            if not any(cell.strip() for cell in row): continue
+            for pos in range(len(headers)):
+                column_values[pos].append(row[pos].strip() if pos < len(row) else "")
+            row_count += 1
+    blobs, offsets = encode_columns(column_values)
+    sheet_name = name or os.path.splitext(os.path.basename(csv_path))[0]
+    return ColumnarSheet(sheet_name, headers, blobs, offsets, row_count, source_path=csv_path)
+
+
+def snapshot_path_for(csv_path, snapshot_dir):
+    # Keyed on the absolute CSV path as well as its name: sheets in different directories share names (index.csv)
+    abs_path = os.path.abspath(csv_path)
+    path_key = hashlib.sha1(abs_path.encode('utf-8')).hexdigest()[:SNAPSHOT_KEY_CHARS]
+    return os.path.join(snapshot_dir, f"{os.path.splitext(os.path.basename(abs_path))[0]}-{path_key}{SNAPSHOT_SUFFIX}")
+
+
+def write_sheet_snapshot(sheet, snapshot_path):
+    """
+    Snapshot layout: magic, uint32 header length, JSON header, then per column the offsets array
+    followed by the UTF-8 blob. The header records the source CSV's size/mtime for staleness checks.
+    """
+    source_stat = os.stat(sheet.source_path) if sheet.source_path else None
+    layout, position = [], 0
+    for blob, offsets in zip(sheet._blobs, sheet._offsets):
+        offsets_len = len(offsets) * offsets.itemsize
+        layout.append([position, position + offsets_len, len(blob)])
+        position += offsets_len + len(blob)
+    header = json.dumps({
+        "name": sheet.name, "row_count": sheet.row_count, "headers": [c.header for c in sheet.columns],
+        "source_path": os.path.abspath(sheet.source_path) if sheet.source_path else None,
+        "source_size": source_stat.st_size if source_stat else None,
+        "source_mtime_ns": source_stat.st_mtime_ns if source_stat else None,
+        "columns": layout,
+    }).encode('utf-8')
+    os.makedirs(os.path.dirname(os.path.abspath(snapshot_path)), exist_ok=True)
+    tmp_path = snapshot_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(SNAPSHOT_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        for blob, offsets in zip(sheet._blobs, sheet._offsets):
+            f.write(offsets.tobytes())
+            f.write(blob)
+    os.replace(tmp_path, snapshot_path)
+
+
+def read_sheet_snapshot(snapshot_path, csv_path=None):
+    """
+    Memory-maps a snapshot and returns a ColumnarSheet over it, or None if the snapshot is missing,
+    unreadable, truncated, taken of another CSV or older than csv_path.
+    """
+    try:
+        with open(snapshot_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+    view = memoryview(mapped)
+    if bytes(view[:len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC: return None
+    try:
+        header_start = len(SNAPSHOT_MAGIC) + SNAPSHOT_HEADER_LEN.size
+        (header_len,) = SNAPSHOT_HEADER_LEN.unpack(view[len(SNAPSHOT_MAGIC):header_start])
+        header = json.loads(bytes(view[header_start:header_start + header_len]).decode('utf-8'))
+        if csv_path:
+            if header["source_path"] != os.path.abspath(csv_path):
+                logging.info(f"Snapshot {snapshot_path} was taken of {header['source_path']}, not {csv_path}.")
+                return None
+            source_stat = os.stat(csv_path)
+            if header["source_size"] != source_stat.st_size or header["source_mtime_ns"] != source_stat.st_mtime_ns:
+                logging.info(f"Snapshot {snapshot_path} is stale for {csv_path}.")
+                return None
+        data_start = header_start + header_len
+        if len(header["columns"]) != len(header["headers"]): raise ValueError("column count differs from the headers")
+        blobs, offsets = [], []
+        for offsets_start, blob_start, blob_len in header["columns"]:
+            if data_start + blob_start + blob_len > len(view): raise ValueError("column data past the end of the file")
+            offsets.append(view[data_start + offsets_start:data_start + blob_start].cast('I'))
+            blobs.append(view[data_start + blob_start:data_start + blob_start + blob_len])
+            if len(offsets[-1]) != header["row_count"] + 1: raise ValueError("offsets do not match the row count")
+        return ColumnarSheet(header["name"], header["headers"], blobs, offsets, header["row_count"],
+                             source_path=csv_path or header["source_path"])
+    except (struct.error, ValueError, KeyError, TypeError) as e:  # ValueError covers JSON and UTF-8 decoding
+        logging.warning(f"Ignoring corrupt sheet snapshot {snapshot_path}: {type(e).__name__}: {e}")
+        return None
+
+
+_sheet_cache = {}  # (abs_path, mtime_ns) -> ColumnarSheet
+
+
+def load_sheet(csv_path, snapshot_dir=None):
+    """
+    Loads one isbd-sheets CSV, reusing an in-process copy or a fresh snapshot from snapshot_dir when possible.
+    A parsed CSV is snapshotted into snapshot_dir for the next run.
+    """
+    abs_path = os.path.abspath(csv_path)
+    cache_key = (abs_path, os.stat(abs_path).st_mtime_ns)
+    if cache_key in _sheet_cache: return _sheet_cache[cache_key]
+    sheet = None
+    if snapshot_dir:
+        snapshot_path = snapshot_path_for(abs_path, snapshot_dir)
+        sheet = read_sheet_snapshot(snapshot_path, abs_path)
+        if sheet is None:
+            sheet = parse_sheet_csv(abs_path)
+            write_sheet_snapshot(sheet, snapshot_path)
+            logging.info(f"Wrote sheet snapshot {snapshot_path} ({sheet.row_count} rows)")
+    else:
+        sheet = parse_sheet_csv(abs_path)
+    _sheet_cache[cache_key] = sheet
+    return sheet
+
+
+def load_sheet_directory(sheets_dir, snapshot_dir=None):
+    """Loads every CSV directly under sheets_dir, keyed by sheet name (file name without extension)."""
+    sheets = {}
+    for filename in sorted(os.listdir(sheets_dir)):
+        if filename.lower().endswith(".csv"):
+            sheet = load_sheet(os.path.join(sheets_dir, filename), snapshot_dir)
+            sheets[sheet.name] = sheet
+    return sheets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build memory-mapped snapshots of the isbd-sheets CSV exports.")
+    parser.add_argument("--sheets_root", default=DEFAULT_SHEETS_ROOT, help="Root directory of the sheet CSV exports.")
+    parser.add_argument("--snapshot_dir", default=os.path.join(DEFAULT_SHEETS_ROOT, ".snapshots"),
+                        help="Directory for the snapshot files.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    for dirpath, _, filenames in os.walk(args.sheets_root):
+        if os.path.abspath(dirpath).startswith(os.path.abspath(args.snapshot_dir)): continue
+        if any(f.lower().endswith(".csv") for f in filenames):
+            snapshot_dir = os.path.join(args.snapshot_dir, os.path.relpath(dirpath, args.sheets_root))
+            for name, sheet in load_sheet_directory(dirpath, snapshot_dir).items():
+                logging.info(f"{os.path.join(dirpath, name)}: {sheet.row_count} rows, {len(sheet.columns)} columns, "
+                             f"languages {sheet.languages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import re
+from functools import lru_cache
+
+# Markup (after its '<') a tag name may appear in without being a tag; the scan steps over it as the HTML parsers do
+SKIPPED_MARKUP = r'!--.*?-->|script\b.*?</script\s*>|style\b.*?</style\s*>'
+CLASS_ATTRIBUTE = r'\sclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'=<>`]+))'
+ID_ATTRIBUTE = r'\sid\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'=<>`]+))'
+
+
+@lru_cache(maxsize=None)
+def _patterns(tag, as_bytes):
+    # Compiled once per tag for str and for bytes input
+    def compile_pattern(pattern):
+        return re.compile(pattern.encode('ascii') if as_bytes else pattern, re.IGNORECASE | re.DOTALL)
+    return (compile_pattern(rf'<(?:{SKIPPED_MARKUP}|(/?){tag}(?=[\s/>])[^>]*>)'),
+            compile_pattern(CLASS_ATTRIBUTE), compile_pattern(ID_ATTRIBUTE))
+
+
+def _attribute_value(pattern, tag_markup):
+    match = pattern.search(tag_markup)
+    if not match: return None
+    return next(group for group in match.groups() if group is not None)
+
+
+def find_region(html, tag, class_tokens=(), element_id=None, start=0, end=None):
+    """
+    Locates the first <tag> element between start and end carrying every class token (and element_id, if
+    given) without parsing: a regex scan for the opening tag, then tag depth counting to its balancing end
+    tag. html may be str or any bytes buffer (bytes, bytearray, mmap). Returns (start, end) offsets of the element's markup, or None when no such
+    element exists or its end tag is missing.
+    """
+    as_bytes = not isinstance(html, str)
+    boundary_pattern, class_pattern, id_pattern = _patterns(tag.lower(), as_bytes)
+    if as_bytes:
+        class_tokens = [token.encode('ascii') for token in class_tokens]
+        element_id = element_id.encode('utf-8') if element_id is not None else None
+    end = len(html) if end is None else end
+    region_start, depth = None, 0
+    for match in boundary_pattern.finditer(html, start, end):
+        if match.group(1) is None: continue  # Comment, script or style
+        self_closing = match.group(0).endswith(b'/>' if as_bytes else '/>')
+        if region_start is None:
+            if match.group(1) or self_closing: continue
+            opening_tag = match.group(0)
+            if class_tokens:
+                classes = _attribute_value(class_pattern, opening_tag)
+                if classes is None or not set(class_tokens) <= set(classes.split()): continue
+            if element_id is not None and _attribute_value(id_pattern, opening_tag) != element_id: continue
+            region_start, depth = match.start(), 1
+        elif match.group(1):
+            depth -= 1
+            if depth == 0: return region_start, match.end()
+        elif not self_closing:
+            depth += 1
+    return None
+
+
+def find_all_regions(html, tag, class_tokens=(), element_id=None, start=0, end=None):
+    """Every matching element between start and end, outermost only, as a list of (start, end) offsets."""
+    regions = []
+    region = find_region(html, tag, class_tokens, element_id, start, end)
+    while region:
+        regions.append(region)
+        region = find_region(html, tag, class_tokens, element_id, region[1], end)
+    return regions
+
+
+def count_in(html, marker, regions):
+    if not isinstance(html, str) and isinstance(marker, str): marker = marker.encode('ascii')
+    return sum(_count(html, marker, region_start, region_end) for region_start, region_end in regions)
+
+
+def _count(html, marker, start, end):
+    if hasattr(html, 'count'): return html.count(marker, start, end)
+    count, position = 0, html.find(marker, start, end)  # mmap has find() but no count()
+    while position != -1:
+        count += 1
+        position = html.find(marker, position + len(marker), end)
+    return count
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+import os
+import re
+import json
+import logging
+import argparse
+from collections import Counter
+
+# --- Configuration Constants ---
+SEARCH_INDEX_VERSION = 1
+SEARCH_FIELDS = ("title", "definition", "scopeNote", "body")  # Posting field numbers are positions in this tuple
+PAGE_RECORDS_DIR = "pages"      # Per-page records, under the search index directory, mirroring the MDX tree
+ROOT_SECTION = "_root"          # Shard name for pages at the top of the docs tree
+SHARD_SUFFIX = ".json"
+
+TOKEN_PATTERN = re.compile(r"\w{2,}")
+MDX_LINK_PATTERN = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+MDX_TAG_PATTERN = re.compile(r"</?[A-Za-z][^>]*>")
+SLUG_STRIP_PATTERN = re.compile(r"[^\w\- ]")
+
+
+def heading_anchor(heading, seen):
+    """The id Docusaurus gives a markdown heading (github-slugger rules); seen counts slugs used on the page."""
+    slug = SLUG_STRIP_PATTERN.sub("", heading.strip().lower()).replace(" ", "-")
+    count = seen.get(slug, 0)
+    seen[slug] = count + 1
+    return f"{slug}-{count}" if count else slug
+
+
+def plain_text(mdx_text):
+    # Converted passages hold markdown links and JSX tags; the index only wants their words
+    text = MDX_TAG_PATTERN.sub(" ", MDX_LINK_PATTERN.sub(r"\1", mdx_text))
+    return " ".join(text.replace("*", " ").replace("`", " ").split())
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def add_passage(search_record, field, anchor, mdx_text):
+    text = plain_text(mdx_text or "")
+    if text: search_record.setdefault("passages", []).append([field, anchor, text])
+
+
+def section_for(doc):
+    # 'statements/1025' -> 'statements'
+    return doc.split("/", 1)[0] if "/" in doc else ROOT_SECTION
+
+
+def page_record_path(search_dir, doc):
+    return os.path.join(search_dir, PAGE_RECORDS_DIR, *doc.split("/")) + ".json"
+
+
+def write_page_record(search_dir, doc, search_record):
+    """Writes one converted page's passages; doc is its MDX path relative to the docs root, without extension."""
+    record_path = page_record_path(search_dir, doc)
+    os.makedirs(os.path.dirname(record_path), exist_ok=True)
+    with open(record_path, 'w', encoding='utf-8') as f:
+        json.dump({"doc": doc, "title": search_record.get("title", ""), "url": search_record.get("url", ""),
+                   "passages": search_record.get("passages", [])}, f, ensure_ascii=False, separators=(",", ":"))
+
+
+# --- Shards ---
+def build_shard(section, records):
+    """
+    One section's search shard: its documents [doc, title, url], the anchors the postings point into, and
+    an inverted index token -> [[document, field, anchor, occurrences], ...].
+    """
+    docs, anchors, index = [], {"": 0}, {}
+    for record in sorted(records, key=lambda r: r["doc"]):
+        doc_number = len(docs)
+        docs.append([record["doc"], record["title"], record["url"]])
+        occurrences = Counter()
+        for field, anchor, text in record["passages"]:
+            anchor_number = anchors.setdefault(anchor, len(anchors))
+            for token in tokenize(text): occurrences[(token, SEARCH_FIELDS.index(field), anchor_number)] += 1
+        for (token, field_number, anchor_number), count in occurrences.items():
+            index.setdefault(token, []).append([doc_number, field_number, anchor_number, count])
+    return {"version": SEARCH_INDEX_VERSION, "section": section, "fields": list(SEARCH_FIELDS), "docs": docs,
+            "anchors": list(anchors), "index": dict(sorted(index.items()))}
+
+
+def section_record_files(search_dir, section):
+    if section == ROOT_SECTION:
+        records_root = os.path.join(search_dir, PAGE_RECORDS_DIR)
+        return [os.path.join(records_root, f) for f in sorted(os.listdir(records_root)) if f.endswith(".json")]
+    paths = []
+    for root, _, files in os.walk(os.path.join(search_dir, PAGE_RECORDS_DIR, section)):
+        paths.extend(os.path.join(root, f) for f in sorted(files) if f.endswith(".json"))
+    return paths
+
+
+def shard_path(search_dir, section):
+    return os.path.join(search_dir, section + SHARD_SUFFIX)
+
+
+def sections_in(search_dir):
+    records_root = os.path.join(search_dir, PAGE_RECORDS_DIR)
+    if not os.path.isdir(records_root): return []
+    entries = os.listdir(records_root)
+    sections = sorted(e for e in entries if os.path.isdir(os.path.join(records_root, e)))
+    if any(e.endswith(".json") for e in entries): sections.append(ROOT_SECTION)
+    return sections
+
+
+def stale_sections(search_dir):
+    """
+    Sections whose shard is missing or older than a page record or records directory (a directory's mtime
+    moves when a record is added or removed). Pages skipped as unchanged keep their records, so only the
+    sections a run actually converted pages in are rebuilt.
+    """
+    stale = []
+    for section in sections_in(search_dir):
+        shard = shard_path(search_dir, section)
+        built = os.path.getmtime(shard) if os.path.exists(shard) else -1
+        record_files = section_record_files(search_dir, section)
+        record_dirs = {os.path.dirname(p) for p in record_files} or {os.path.join(search_dir, PAGE_RECORDS_DIR)}
+        if any(os.path.getmtime(p) > built for p in list(record_dirs) + record_files): stale.append(section)
+    return stale
+
+
+def build_search_shards(search_dir, sections=None):
+    """Rebuilds the given sections' shards (default: the stale ones) from their page records. Returns the sections."""
+    sections = stale_sections(search_dir) if sections is None else sections
+    for section in sections:
+        records = []
+        for record_path in section_record_files(search_dir, section):
+            with open(record_path, 'r', encoding='utf-8') as f:
+                records.append(json.load(f))
+        shard = shard_path(search_dir, section)
+        with open(shard + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(build_shard(section, records), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(shard + ".tmp", shard)  # A search client never reads a half-written shard
+        logging.info(f"Search shard {shard}: {len(records)} page(s).")
+    return sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build search index shards from the page records written by "
+                                                 "html_to_mdx_v2.py --search_index.")
+    parser.add_argument("search_dir", help="Search index directory (the --search_index of the conversion runs).")
+    parser.add_argument("--all", action="store_true", help="Rebuild every section, not only the stale ones.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    sections = build_search_shards(args.search_dir, sections_in(args.search_dir) if args.all else None)
+    logging.info(f"{len(sections)} search shard(s) rebuilt.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import os
+import yaml # PyYAML
+
+# --- Configuration Constants ---
+STANDARD_CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standard_configs")
+DEFAULT_STANDARD = "ISBDM"
+
+
+class StandardConfig:
+    """
+    What the conversion scripts assume about one standard's HTML site, from standard_configs/<name>.yaml: the
+    path its links are served under, its element URI base, and the sidebar sections html_to_mdx_v10 builds.
+    """
+
+    def __init__(self, name, site_path, element_uri_base, section_config, main_category_index_files, ses=None,
+                 source_html_root=None, target_mdx_root=None, element_registry=None):
+        self.name = name
+        self.site_path = site_path.rstrip('/')       # '/ISBDM'
+        self.docs_href_prefix = f"{self.site_path}/docs/"
+        self.element_uri_base = element_uri_base
+        self.section_config = section_config
+        self.main_category_index_files = main_category_index_files
+        ses = ses or {}
+        self.ses_html_source_dir = ses.get("html_source_dir")
+        self.ses_html_index_filename = ses.get("html_index_filename")
+        self.ses_target_mdx_section_key = ses.get("target_mdx_section_key")
+        # SES page names start with the index page's name: ISBDMSES.html lists ISBDMSES1023.html, ...
+        self.ses_filename_marker = os.path.splitext(self.ses_html_index_filename)[0].upper() \
+            if self.ses_html_index_filename else None
+        self.source_html_root = source_html_root
+        self.target_mdx_root = target_mdx_root
+        self.element_registry = element_registry  # Elements CSV, if the standard has one
+
+    def __repr__(self):
+        return f"StandardConfig({self.name!r})"
+
+    def local_docs_href(self, href):
+        # '/ISBDM/docs/statements/1025.html' -> '/docs/statements/1025.html'
+        return href.replace(self.docs_href_prefix, '/docs/', 1)
+
+    def is_ses_filename(self, filename):
+        return bool(self.ses_filename_marker) and self.ses_filename_marker in filename.upper()
+
+
+# --- Loading ---
+_config_cache = {}  # (abs_path, mtime) -> StandardConfig, so every caller of a standard shares one instance
+
+
+def standard_config_path(name_or_path):
+    """A config file path as given, or the bundled standard_configs/<name>.yaml for a bare standard name."""
+    if name_or_path.endswith(('.yaml', '.yml')) or os.sep in name_or_path: return name_or_path
+    return os.path.join(STANDARD_CONFIG_DIR, f"{name_or_path}.yaml")
+
+
+def load_standard_config(name_or_path=DEFAULT_STANDARD):
+    abs_path = os.path.abspath(standard_config_path(name_or_path))
+    cache_key = (abs_path, os.path.getmtime(abs_path))
+    if cache_key not in _config_cache:
+        with open(abs_path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        try:
+            _config_cache[cache_key] = StandardConfig(**data)
+        except TypeError as e:
+            raise ValueError(f"Invalid standard config {abs_path}: {e}") from e
+    return _config_cache[cache_key]
+
+
+def available_standards():
+    return sorted(os.path.splitext(f)[0] for f in os.listdir(STANDARD_CONFIG_DIR) if f.endswith('.yaml'))
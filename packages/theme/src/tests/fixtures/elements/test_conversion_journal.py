@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from conversion_journal import ProgressJournal, content_hash, load_journal
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / "html"
+    (root / "attributes").mkdir(parents=True)
+    return root
+
+
+def journal_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_load_journal_keeps_the_last_entry_per_path(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    journal.write_text(
+        '{"path": "a.html", "hash": "1", "status": "failed", "error": "boom"}\n'
+        '{"path": "b.html", "hash": "2", "status": "ok"}\n'
+        'not json\n'
+        '{"path": "a.html", "hash": "3", "status": "ok"}\n'
+        '{"path": "c.html", "ha', encoding="utf-8")
+
+    entries = load_journal(str(journal))
+
+    assert {path: (e["hash"], e["status"]) for path, e in entries.items()} == {"a.html": ("3", "ok"), "b.html": ("2", "ok")}
+    assert load_journal(str(tmp_path / "absent.jsonl")) == {}
+
+
+def test_is_done_needs_success_for_the_same_content(site, tmp_path):
+    page, failed = site / "attributes" / "1025.html", site / "attributes" / "1026.html"
+    journal_path = tmp_path / "journal.jsonl"
+    with ProgressJournal(str(journal_path), str(site)) as journal:
+        journal.record(str(page), content_hash(b"<html>v1</html>"), "ok")
+        journal.record(str(failed), content_hash(b"<html>x</html>"), "failed", error="boom")
+
+    assert [e["path"] for e in journal_lines(journal_path)] == ["attributes/1025.html", "attributes/1026.html"]
+    with ProgressJournal(str(journal_path), str(site), resume=True) as resumed:
+        assert resumed.is_done(str(page), content_hash("<html>v1</html>"))  # Text hashes as its UTF-8 bytes
+        assert not resumed.is_done(str(page), content_hash(b"<html>v2</html>"))
+        assert not resumed.is_done(str(page), None)
+        assert not resumed.is_done(str(failed), content_hash(b"<html>x</html>"))
+        assert resumed.done_hash(str(site / "attributes" / "new.html")) is None
+
+
+def test_a_new_run_starts_an_empty_journal(site, tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    journal_path.write_text('{"path": "attributes/1025.html", "hash": "h", "status": "ok"}\n', encoding="utf-8")
+
+    with ProgressJournal(str(journal_path), str(site)) as journal:
+        assert not journal.is_done(str(site / "attributes" / "1025.html"), "h")
+
+    assert journal_path.read_text(encoding="utf-8") == ""
+
+
+def test_resume_drops_a_torn_final_line(site, tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    journal_path.write_text('{"path": "attributes/1.html", "hash": "h1", "status": "ok"}\n'
+                            '{"path": "attributes/2.html", "hash": "h2", "sta', encoding="utf-8")
+
+    with ProgressJournal(str(journal_path), str(site), resume=True, fsync_batch=1) as journal:
+        assert journal.is_done(str(site / "attributes" / "1.html"), "h1")
+        journal.record(str(site / "attributes" / "2.html"), "h2", "ok")
+
+    assert [(e["path"], e["status"]) for e in journal_lines(journal_path)] == \
+        [("attributes/1.html", "ok"), ("attributes/2.html", "ok")]
+    assert set(load_journal(str(journal_path))) == {"attributes/1.html", "attributes/2.html"}
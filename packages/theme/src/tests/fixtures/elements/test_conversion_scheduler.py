@@ -0,0 +1,43 @@
+from conversion_scheduler import plan_chunks
+
+
+def test_costly_jobs_get_their_own_chunk_and_go_first():
+    jobs = ["small1.html", "big.html", "small2.html", "medium.html", "small3.html", "small4.html"]
+    costs = [1, 10, 1, 6, 1, 1]
+
+    # Target chunk cost: 20 / (1 worker * 4 chunks) = 5
+    chunks = plan_chunks(jobs, costs, workers=1, chunks_per_worker=4)
+
+    assert chunks == [["big.html"], ["medium.html"], ["small1.html", "small2.html", "small3.html", "small4.html"]]
+
+
+def test_cheap_jobs_are_batched_up_to_the_target_cost():
+    jobs = list("abcdefgh")
+    costs = [3, 3, 3, 3, 2, 2, 2, 2]
+
+    # Target: 20 / (2 workers * 2 chunks) = 5
+    assert plan_chunks(jobs, costs, workers=2, chunks_per_worker=2) == [["a", "b"], ["c", "d"], ["e", "f", "g"], ["h"]]
+
+
+def test_max_chunk_files_caps_a_batch_of_tiny_jobs():
+    jobs = [f"page{i}.html" for i in range(7)]
+    chunks = plan_chunks(jobs, [1] * 7, workers=1, chunks_per_worker=1, max_chunk_files=3)
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [job for chunk in chunks for job in chunk] == jobs
+
+
+def test_every_job_is_planned_once():
+    jobs = [f"p{i}" for i in range(50)]
+    costs = [(i * 37) % 11 + 1 for i in range(50)]
+
+    chunks = plan_chunks(jobs, costs, workers=4)
+
+    assert sorted(job for chunk in chunks for job in chunk) == sorted(jobs)
+    # Longest job first: the plan walks the jobs in descending cost
+    planned_costs = [costs[jobs.index(job)] for chunk in chunks for job in chunk]
+    assert planned_costs == sorted(costs, reverse=True)
+
+
+def test_no_jobs():
+    assert plan_chunks([], [], workers=4) == []
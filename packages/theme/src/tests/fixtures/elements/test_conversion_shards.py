@@ -0,0 +1,99 @@
+import argparse
+import os
+
+import pytest
+
+from conversion_shards import ShardManifest, merge_manifests, parse_shard_spec, select_shard
+
+ROOT = os.path.join(os.sep, "site", "html")
+PAGES = [os.path.join(ROOT, section, f"{number}.html")
+         for section in ("attributes", "statements", "ves") for number in range(1000, 1012)]
+
+
+@pytest.mark.parametrize("spec, shard", [("1/1", (1, 1)), ("2/4", (2, 4)), ("4/4", (4, 4))])
+def test_parse_shard_spec(spec, shard):
+    assert parse_shard_spec(spec) == shard
+
+
+@pytest.mark.parametrize("spec", ["0/4", "5/4", "2", "2/4/8", "a/b", ""])
+def test_parse_shard_spec_rejects(spec):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard_spec(spec)
+
+
+def test_shards_partition_the_paths_in_order():
+    shards = [select_shard(PAGES, ROOT, (index, 3)) for index in (1, 2, 3)]
+
+    assert sorted(p for shard in shards for p in shard) == sorted(PAGES)
+    assert all(shard for shard in shards)
+    for shard in shards:
+        assert shard == [p for p in PAGES if p in shard]
+    assert select_shard(PAGES, ROOT, None) == PAGES
+
+
+def test_shard_assignment_depends_on_the_relative_path_only():
+    moved_root = os.path.join(os.sep, "elsewhere")
+    moved = [os.path.join(moved_root, os.path.relpath(p, ROOT)) for p in PAGES]
+    assert [os.path.relpath(p, moved_root) for p in select_shard(moved, moved_root, (2, 3))] == \
+        [os.path.relpath(p, ROOT) for p in select_shard(PAGES, ROOT, (2, 3))]
+
+
+def run_shards(shard_count, fail=()):
+    # Manifests of a complete sharded run, as each runner would write them
+    manifests = []
+    for index in range(1, shard_count + 1):
+        assigned = select_shard(PAGES, ROOT, (index, shard_count))
+        manifest = ShardManifest("html_to_mdx_v2", ROOT, (index, shard_count), PAGES, assigned)
+        for path in assigned:
+            manifest.record(path, "failed" if path in fail else "ok", error="boom" if path in fail else None)
+        manifests.append(manifest.to_dict())
+    return manifests
+
+
+def test_merge_complete_run():
+    failed_page = PAGES[5]
+    summary, problems = merge_manifests(run_shards(3, fail=[failed_page]))
+
+    assert problems == []
+    assert (summary["files"], summary["ok"], summary["failed"], summary["missing"]) == (36, 35, 1, [])
+    assert summary["failures"] == {"attributes/1005.html": "boom"}
+    assert [s["shard"] for s in summary["shards"]] == ["1/3", "2/3", "3/3"]
+    assert sum(s["assigned"] for s in summary["shards"]) == 36
+
+
+def test_merge_reports_a_missing_shard_and_its_files():
+    manifests = run_shards(3)
+    dropped = manifests.pop(1)
+
+    summary, problems = merge_manifests(manifests)
+
+    assert "Manifest for shard 2/3 is missing." in problems
+    assert f"Shards cover {36 - len(dropped['assigned'])} file(s) but 36 were discovered." in problems
+
+
+def test_merge_reports_duplicate_and_misplaced_files():
+    manifests = run_shards(2)
+    stray = manifests[1]["assigned"][0]
+    manifests[0]["assigned"].append(stray)
+
+    _, problems = merge_manifests(manifests + [manifests[0]])
+
+    assert "Shard 1/2 appears in more than one manifest." in problems
+    assert f"'{stray}' was processed by shard 1 but hashes to shard 2." in problems
+    assert any(p.startswith(f"'{stray}' is assigned to shards") for p in problems)
+
+
+def test_merge_reports_unfinished_files_and_mismatched_runs():
+    manifests = run_shards(2)
+    unfinished = manifests[0]["assigned"][0]
+    del manifests[0]["results"][unfinished]
+    manifests[1]["discovered_count"] = 35
+
+    summary, problems = merge_manifests(manifests)
+
+    assert summary["missing"] == [unfinished]
+    assert problems == ["Shard 2/2 has discovered_count '35', shard 1/2 has '36'."]
+
+
+def test_merge_without_manifests():
+    assert merge_manifests([]) == ({}, ["No manifests given."])
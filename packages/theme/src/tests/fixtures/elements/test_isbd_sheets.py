@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from isbd_sheets import parse_sheet_csv, read_sheet_snapshot, snapshot_path_for, write_sheet_snapshot
+
+SHEET_CSV = (
+    "uri,rdfs:label@en,rdfs:label@fr,skos:altLabel@en[0],skos:altLabel@en[1],rdf:type\n"
+    "isbd:terms/mediatype,Media type,Type de média,,,skos:ConceptScheme\n"
+    "isbd:terms/mediatype/T1001,audio,audio,sound,,skos:Concept\n"
+    ",,,,,\n"
+    "isbd:terms/mediatype/T1002,électronique,électronique,digital,computer,skos:Concept\n"
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "mediatype.csv"
+    path.write_text(SHEET_CSV, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def snapshot(csv_path, tmp_path):
+    path = snapshot_path_for(csv_path, str(tmp_path / "snapshots"))
+    write_sheet_snapshot(parse_sheet_csv(csv_path), path)
+    return path
+
+
+def test_snapshot_round_trip(csv_path, snapshot):
+    sheet = read_sheet_snapshot(snapshot, csv_path)
+
+    assert (sheet.name, sheet.row_count, sheet.languages) == ("mediatype", 3, ["en", "fr"])
+    assert sheet.column("uri") == ["isbd:terms/mediatype", "isbd:terms/mediatype/T1001", "isbd:terms/mediatype/T1002"]
+    row = sheet.find("uri", "isbd:terms/mediatype/T1002")
+    assert row.get("rdfs:label", "fr") == "électronique"
+    assert row.values("skos:altLabel", "en") == ["digital", "computer"]
+    assert [r.to_dict() for r in sheet] == [r.to_dict() for r in parse_sheet_csv(csv_path)]
+
+
+def test_snapshot_names_are_per_csv_path(tmp_path):
+    snapshot_dir = str(tmp_path / "snapshots")
+    first = snapshot_path_for(str(tmp_path / "a" / "index.csv"), snapshot_dir)
+    second = snapshot_path_for(str(tmp_path / "b" / "index.csv"), snapshot_dir)
+
+    assert first != second
+    assert os.path.basename(first).startswith("index-") and first.endswith(".sheet")
+    assert snapshot_path_for(os.path.join(str(tmp_path), "a", "..", "a", "index.csv"), snapshot_dir) == first
+
+
+def test_snapshot_of_another_csv_is_not_used(csv_path, snapshot, tmp_path):
+    other = tmp_path / "other" / "mediatype.csv"
+    other.parent.mkdir()
+    other.write_text(SHEET_CSV, encoding="utf-8")
+    os.utime(other, ns=(os.stat(csv_path).st_atime_ns, os.stat(csv_path).st_mtime_ns))
+
+    assert read_sheet_snapshot(snapshot, str(other)) is None
+
+
+def test_stale_snapshot_is_not_used(csv_path, snapshot):
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("isbd:terms/mediatype/T1003,video,vidéo,,,skos:Concept\n")
+
+    assert read_sheet_snapshot(snapshot, csv_path) is None
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:10],                             # Cut inside the header length
+    lambda data: data[:40],                             # Cut inside the JSON header
+    lambda data: data[:-3],                             # Cut inside the last column
+    lambda data: data[:12] + b"\xff" + data[13:],       # Header JSON no longer UTF-8
+    lambda data: data.replace(b'"columns"', b'"kolumns"'),
+    lambda data: data.replace(b'"row_count": 3', b'"row_count": 9'),
+    lambda data: b"NOTASNAP" + data[8:],
+    lambda data: b"",
+])
+def test_corrupt_snapshot_gives_none(csv_path, snapshot, damage):
+    with open(snapshot, "rb") as f:
+        data = f.read()
+    with open(snapshot, "wb") as f:
+        f.write(damage(data))
+
+    assert read_sheet_snapshot(snapshot, csv_path) is None
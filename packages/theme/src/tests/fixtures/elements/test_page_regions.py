@@ -0,0 +1,95 @@
+import mmap
+
+import pytest
+
+from page_regions import find_region, find_all_regions, count_in
+
+PAGE = ('<main class="container"><nav class="navISBDMSection">A<div><nav>inner</nav></div></nav>'
+        '<div class="col-md-7 border rounded"><div class="row"><h3>Title</h3></div></div>'
+        '<nav class="navISBDMSection">B</nav></main>')
+
+
+def region_text(html, region):
+    return html[region[0]:region[1]]
+
+
+def test_nested_same_tag_region_ends_at_its_balancing_end_tag():
+    region = find_region(PAGE, 'nav', ('navISBDMSection',))
+    assert region_text(PAGE, region) == '<nav class="navISBDMSection">A<div><nav>inner</nav></div></nav>'
+
+    column = find_region(PAGE, 'div', ('border', 'col-md-7'))
+    assert region_text(PAGE, column) == '<div class="col-md-7 border rounded"><div class="row"><h3>Title</h3></div></div>'
+
+
+def test_find_all_regions_returns_outermost_regions_only():
+    regions = find_all_regions(PAGE, 'nav')
+    assert [region_text(PAGE, r) for r in regions] == [
+            '<nav class="navISBDMSection">A<div><nav>inner</nav></div></nav>',
+            '<nav class="navISBDMSection">B</nav>']
+
+
+def test_search_is_limited_to_start_and_end():
+    main = find_region(PAGE, 'main', ('container',))
+    assert main == (0, len(PAGE))
+    second = find_all_regions(PAGE, 'nav', ('navISBDMSection',))[1]
+    assert find_region(PAGE, 'nav', start=second[0]) == second
+    assert find_region(PAGE, 'nav', start=second[0], end=second[1] - 1) is None
+
+
+def test_class_tokens_and_id_must_all_match():
+    html = '<div class="col-md-7x">no</div><div id="x" class=\'a b\'>yes</div><div class=a id=y>unquoted</div>'
+    assert find_region(html, 'div', ('col-md-7',)) is None
+    assert region_text(html, find_region(html, 'div', ('b', 'a'), element_id='x')) == '<div id="x" class=\'a b\'>yes</div>'
+    assert region_text(html, find_region(html, 'div', ('a',), element_id='y')) == '<div class=a id=y>unquoted</div>'
+    assert find_region(html, 'div', ('a', 'c')) is None
+
+
+@pytest.mark.parametrize("skipped", [
+    '<!-- <nav class="navISBDMSection"> -->',
+    '<script>var s = "<nav class=\\"navISBDMSection\\">";</script>',
+    '<style>/* <nav class="navISBDMSection"> */</style>',
+])
+def test_markers_in_comments_scripts_and_styles_are_not_tags(skipped):
+    html = f'<body>{skipped}<nav class="navISBDMSection">real</nav></body>'
+    assert region_text(html, find_region(html, 'nav', ('navISBDMSection',))) == '<nav class="navISBDMSection">real</nav>'
+
+
+def test_end_tags_in_comments_and_scripts_do_not_close_the_region():
+    html = '<div class="c">x<!-- </div> --><script>document.write("</div>")</script>y</div>tail'
+    assert region_text(html, find_region(html, 'div', ('c',))) == html[:-len('tail')]
+
+
+def test_unbalanced_markup_gives_none():
+    assert find_region('<div class="c"><div>never closed</div>', 'div', ('c',)) is None
+    assert find_all_regions('<nav class="n">a</nav><nav class="n">b', 'nav', ('n',)) == [(0, 22)]
+    # A stray end tag before the element is not counted against it
+    html = '</div><div class="c">ok</div>'
+    assert region_text(html, find_region(html, 'div', ('c',))) == '<div class="c">ok</div>'
+
+
+def test_self_closing_and_prefixed_tags_are_not_nested():
+    html = '<div class="c"><div/><divider></divider>text</div>'
+    assert find_region(html, 'div', ('c',)) == (0, len(html))
+
+
+def test_bytes_and_str_input_give_the_same_offsets(tmp_path):
+    html = PAGE.replace('>B<', '>B é<')  # Non-ASCII text after the first nav shifts no earlier offsets
+    as_bytes = html.encode('utf-8')
+    assert find_region(as_bytes, 'div', ('col-md-7',)) == find_region(html, 'div', ('col-md-7',))
+    str_navs, byte_navs = find_all_regions(html, 'nav', ('navISBDMSection',)), \
+        find_all_regions(as_bytes, 'nav', ('navISBDMSection',))
+    assert byte_navs[0] == str_navs[0]
+    assert as_bytes[byte_navs[1][0]:byte_navs[1][1]].decode('utf-8') == region_text(html, str_navs[1])
+
+    page_file = tmp_path / "page.html"
+    page_file.write_bytes(as_bytes)
+    with open(page_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert find_all_regions(mapped, 'nav', ('navISBDMSection',)) == byte_navs
+        assert count_in(mapped, 'navISBDMSection', byte_navs) == count_in(as_bytes, 'navISBDMSection', byte_navs) == 2
+
+
+def test_count_in_counts_only_inside_the_regions():
+    regions = find_all_regions(PAGE, 'nav', ('navISBDMSection',))
+    assert count_in(PAGE, 'nav', regions) == 8
+    assert count_in(PAGE, 'col-md-7', regions) == 0
+    assert count_in(PAGE, 'col-md-7', [(0, len(PAGE))]) == 1
@@ -0,0 +1,44 @@
+from text_triage import triage, estimate_similarities
+
+WORDS = [f"term{i * 7919 % 10007:05d}" for i in range(300)]
+PAGE_TEXT = " ".join(WORDS)
+
+
+def with_words_changed(every):
+    # Upper-cases every n-th word: a rendering slip that keeps the text's length and most of its shingles
+    return " ".join(word.upper() if i % every == 0 else word for i, word in enumerate(WORDS))
+
+
+def test_pairs_are_ranked_worst_first_with_verdicts():
+    html_texts = [PAGE_TEXT, PAGE_TEXT, "same text", PAGE_TEXT, ""]
+    mdx_texts = [with_words_changed(300), with_words_changed(10), "same text", "unrelated " * 40, ""]
+
+    ranked = triage(html_texts, mdx_texts)
+
+    assert [(index, verdict) for index, _, verdict in ranked] == [
+        (3, "broken"), (1, "differs"), (0, "minor"), (2, "identical"), (4, "identical")]
+    similarities = [similarity for _, similarity, _ in ranked]
+    assert similarities == sorted(similarities)
+    assert similarities[-2:] == [1.0, 1.0]
+    assert 0.5 <= similarities[1] < 0.98 <= similarities[2] < 1.0
+
+
+def test_identical_is_decided_by_equality_not_the_estimate():
+    # A one-word slip estimates as similar as an equal pair, but only the equal pair is 'identical'
+    assert estimate_similarities([PAGE_TEXT], [with_words_changed(300)])[0] >= 0.98
+    assert [verdict for _, _, verdict in triage([PAGE_TEXT, PAGE_TEXT], [with_words_changed(300), PAGE_TEXT])] == \
+        ["minor", "identical"]
+
+
+def test_empty_text_against_content_is_broken():
+    assert triage(["", "Title"], ["Title", ""]) == [(0, 0.0, "broken"), (1, 0.0, "broken")]
+
+
+def test_thresholds_move_the_verdicts():
+    html_texts, mdx_texts = [PAGE_TEXT], [with_words_changed(10)]
+    assert triage(html_texts, mdx_texts, clearly_fine=0.5)[0][2] == "minor"
+    assert triage(html_texts, mdx_texts, clearly_broken=0.99)[0][2] == "broken"
+
+
+def test_no_pairs():
+    assert triage([], []) == []
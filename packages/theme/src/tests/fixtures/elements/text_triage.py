@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import numpy as np
+
+# --- Configuration Constants ---
+SHINGLE_CHARS = 5          # Characters per shingle of the flattened (whitespace-free) text
+SIGNATURE_BITS = 7         # 2**7 = 128 signature slots; the similarity estimate's error is about 1/sqrt of that
+MINHASH_SEED = 1
+CLEARLY_FINE = 0.98        # Estimated similarity of a differing pair at or above which it is only listed as minor
+CLEARLY_BROKEN = 0.5       # ... and below which it is listed as broken, in both cases without a diff
+WORST_PAGES_SHOWN = 50
+
+SHINGLE_MULTIPLIER = np.uint64(1000003)
+EMPTY_SLOT = np.iinfo(np.uint64).max  # A slot none of the text's shingles hashed into
+
+
+def mix64(values):
+    # splitmix64's finalizer: spreads the polynomial shingle hashes over all 64 bits, so the top bits pick a slot
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xbf58476d1ce4e5b9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94d049bb133111eb)
+    return values ^ (values >> np.uint64(31))
+
+
+def shingle_hashes(text, shingle_chars=SHINGLE_CHARS, seed=MINHASH_SEED):
+    """The hashes of the text's character shingles; a text shorter than a shingle is one shingle."""
+    if not text: return np.empty(0, dtype=np.uint64)
+    code_points = np.frombuffer(text.encode('utf-32-le'), dtype='<u4').astype(np.uint64)
+    width = min(shingle_chars, len(code_points))
+    count = len(code_points) - width + 1
+    hashes = np.full(count, seed, dtype=np.uint64)
+    for offset in range(width):  # Polynomial hash of every window at once; uint64 arithmetic wraps
+        hashes *= SHINGLE_MULTIPLIER
+        hashes += code_points[offset:offset + count]
+    return mix64(hashes)
+
+
+def minhash_signature(hashes, signature_bits=SIGNATURE_BITS):
+    """
+    One-permutation MinHash: the top signature_bits of a hash pick its slot and each slot keeps its smallest
+    hash, so a single hash per shingle stands in for 2**signature_bits independent permutations.
+    """
+    signature = np.full(2 ** signature_bits, EMPTY_SLOT, dtype=np.uint64)
+    np.minimum.at(signature, (hashes >> np.uint64(64 - signature_bits)).astype(np.intp), hashes)
+    return signature
+
+
+def signature_matrix(texts):
+    """One MinHash signature row per text."""
+    matrix = np.empty((len(texts), 2 ** SIGNATURE_BITS), dtype=np.uint64)
+    for row, text in enumerate(texts):
+        matrix[row] = minhash_signature(shingle_hashes(text))
+    return matrix
+
+
+def estimate_similarities(html_texts, mdx_texts):
+    """
+    Estimated Jaccard similarity of each HTML/MDX pair's shingle sets, compared for the whole corpus at once:
+    matching slots over the slots not empty in both (two empty texts are identical).
+    """
+    html_signatures, mdx_signatures = signature_matrix(html_texts), signature_matrix(mdx_texts)
+    both_empty = ((html_signatures == EMPTY_SLOT) & (mdx_signatures == EMPTY_SLOT)).sum(axis=1)
+    matches = (html_signatures == mdx_signatures).sum(axis=1) - both_empty
+    slots = html_signatures.shape[1] - both_empty
+    return np.where(slots > 0, matches / np.maximum(slots, 1), 1.0)
+
+
+def triage(html_texts, mdx_texts, clearly_fine=CLEARLY_FINE, clearly_broken=CLEARLY_BROKEN):
+    """
+    Ranks the pairs worst first as [(index, similarity, verdict)]. String equality settles most pairs in C
+    ('identical'); only the rest are MinHashed. Their estimate sorts them into 'minor' (at or above
+    clearly_fine), 'broken' (below clearly_broken) or, in between, 'differs': the pairs worth an exact diff.
+    """
+    differing = [i for i, (html_text, mdx_text) in enumerate(zip(html_texts, mdx_texts)) if html_text != mdx_text]
+    similarities = np.ones(len(html_texts))
+    if differing:
+        similarities[differing] = estimate_similarities([html_texts[i] for i in differing],
+                                                        [mdx_texts[i] for i in differing])
+    differing = set(differing)
+    ranked = []
+    for index in np.argsort(similarities, kind='stable'):
+        similarity = float(similarities[index])
+        if index not in differing: verdict = "identical"
+        elif similarity >= clearly_fine: verdict = "minor"
+        elif similarity < clearly_broken: verdict = "broken"
+        else: verdict = "differs"
+        ranked.append((int(index), similarity, verdict))
+    return ranked
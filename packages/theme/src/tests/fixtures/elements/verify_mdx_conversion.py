@@ -1,7 +1,11 @@
 import os
 import re
 from bs4 import BeautifulSoup
+from page_regions import find_region
+from html_input import declared_encoding, read_html_bytes
+from text_triage import triage, CLEARLY_FINE, CLEARLY_BROKEN, WORST_PAGES_SHOWN
 import difflib # For showing differences
+from collections import Counter
 
 def normalize_text_flattened(text):
     """
@@ -18,8 +22,17 @@ def get_text_from_div(html_file_path, div_identifier_type, div_identifier_value)
     Parses an HTML file and extracts flattened, normalized text from a specified div.
     """
     try:
-        with open(html_file_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'lxml') # or 'html.parser'
+        html_content = read_html_bytes(html_file_path) # lxml decodes the raw bytes itself
+
+        # Pre-scan for the div so only its markup is parsed. Selectors and multi-class values
+        # can't be located without a tree, so those pages are parsed in full.
+        region = None
+        if div_identifier_type == 'id':
+            region = find_region(html_content, 'div', element_id=div_identifier_value)
+        elif div_identifier_type == 'class' and len(div_identifier_value.split()) == 1:
+            region = find_region(html_content, 'div', (div_identifier_value,))
+        soup = BeautifulSoup(html_content[region[0]:region[1]] if region else html_content, 'lxml',
+                             from_encoding=declared_encoding(html_content)) # or 'html.parser'
 
         target_div = None
         if div_identifier_type == 'id':
@@ -160,12 +173,36 @@ def compare_and_report(html_text_normalized, mdx_text_normalized, html_filename,
         # else:
         # print("  MDX content contains HTML content, but they are not identical (could be extra chars in MDX or different chars).")
 
+def triage_and_report(pairs):
+    """
+    Triage mode: exact equality for all (html_filename, mdx_filename, html_text, mdx_text) pairs, MinHash
+    similarity estimates for those that differ, and the worst pages listed first. Only pairs whose estimate
+    is in the uncertain band get the detailed report. Returns the number of pairs that differ.
+    """
+    if not pairs:
+        return 0
+    ranked = triage([p[2] for p in pairs], [p[3] for p in pairs])
+    verdicts = Counter(verdict for _, _, verdict in ranked)
+    print(f"\n--- Triage (estimated similarity; reports for differing pairs between {CLEARLY_BROKEN} and {CLEARLY_FINE}) ---")
+    shown = [r for r in ranked if r[2] != "identical"][:WORST_PAGES_SHOWN]
+    for index, similarity, verdict in shown:
+        print(f"  {similarity:6.3f}  {verdict:<8} {pairs[index][0]}")
+    if len(ranked) - verdicts["identical"] > len(shown):
+        print(f"  ... {len(ranked) - verdicts['identical'] - len(shown)} better-matching differing pair(s) not shown.")
+    print(f"{verdicts['identical']} identical, {verdicts['minor']} with minor differences, "
+          f"{verdicts['differs']} differing, {verdicts['broken']} broken.")
+    for index, _, verdict in shown:
+        if verdict == "differs":
+            compare_and_report(pairs[index][2], pairs[index][3], pairs[index][0], pairs[index][1])
+    return len(ranked) - verdicts["identical"]
+
 
 def main():
     html_directory = input("Enter the path to the directory containing HTML files: ").strip()
     mdx_directory = input("Enter the path to the directory containing corresponding MDX files: ").strip()
     div_identifier_type = input("Enter HTML div identifier type ('id', 'class', or 'selector'): ").lower().strip()
     div_identifier_value = input(f"Enter the HTML div {div_identifier_type} value: ").strip()
+    triage_mode = input("Compare every pair in full, or triage by estimated similarity first? ('full' or 'triage', default full): ").lower().strip() == 'triage'
 
     if not os.path.isdir(html_directory):
         print(f"Error: HTML directory not found at {html_directory}")
@@ -177,6 +214,7 @@ def main():
     found_html_files = 0
     processed_pairs = 0
     mismatched_files = 0
+    triage_pairs = []
 
     for html_filename_full in os.listdir(html_directory):
         if html_filename_full.lower().endswith(('.html', '.htm')):
@@ -186,12 +224,12 @@ def main():
             html_file_path = os.path.join(html_directory, html_filename_full)
             mdx_file_path = os.path.join(mdx_directory, mdx_filename_full)
 
-            print(f"\nProcessing HTML: {html_file_path}")
+            if not triage_mode: print(f"\nProcessing HTML: {html_file_path}")
             if not os.path.exists(mdx_file_path):
                 print(f"Warning: Corresponding MDX file not found: {mdx_file_path}")
                 continue
 
-            print(f"Found MDX:     {mdx_file_path}")
+            if not triage_mode: print(f"Found MDX:     {mdx_file_path}")
             processed_pairs +=1
 
             html_div_text_normalized = get_text_from_div(html_file_path, div_identifier_type, div_identifier_value)
@@ -208,10 +246,15 @@ def main():
             # print(f"Norm MDX  (len {len(mdx_content_normalized)}): '{mdx_content_normalized[:100]}...'")
 
 
+            if triage_mode:
+                triage_pairs.append((html_filename_full, mdx_filename_full, html_div_text_normalized, mdx_content_normalized))
+                continue
             if html_div_text_normalized != mdx_content_normalized:
                 mismatched_files +=1
             compare_and_report(html_div_text_normalized, mdx_content_normalized, html_filename_full, mdx_filename_full)
 
+    if triage_mode:
+        mismatched_files = triage_and_report(triage_pairs)
 
     print("\n--- Summary ---")
     print(f"Found {found_html_files} HTML files in '{html_directory}'.")
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+import os
+import csv
+import json
+import hashlib
+import logging
+import argparse
+from isbd_sheets import load_sheet, DEFAULT_SHEETS_ROOT
+from element_registry import expand_curie, in_namespace, CURIE_PREFIXES
+from html_to_mdx_v10 import read_front_matter, render_front_matter
+
+# --- Configuration Constants ---
+DEFAULT_VALUES_DIR = os.path.join(DEFAULT_SHEETS_ROOT, "isbd-values")
+INDEX_CSV = "index.csv"                     # One row per vocabulary: Sheet Name, Title, Description, Languages, ...
+DEFAULT_STATE_FILE = ".vocabulary_pages.json"  # Under the docs directory: what each page was generated from
+DEFAULT_SIDEBAR_LEVEL = 1
+DEFAULT_LANGUAGE = "en"
+PAGE_FORMAT_VERSION = 1                     # Bump when the page layout changes, to regenerate every page once
+# index.csv's "Original CSV Path" mirrors the namespace: '.../csv/ns/isbd/terms/mediatype.csv' is the vocabulary
+# http://iflastandards.info/ns/isbd/terms/mediatype
+NAMESPACE_ROOT = "http://iflastandards.info/"
+ORIGINAL_CSV_NAMESPACE_MARKER = "/csv/"
+
+# Concept keys of the VocabularyTable front matter and the sheet columns they come from
+CONCEPT_PROPERTIES = (
+    ("value", "skos:prefLabel"),
+    ("definition", "skos:definition"),
+    ("scopeNote", "skos:scopeNote"),
+    ("altLabel", "skos:altLabel"),
+    ("notation", "skos:notation"),
+    ("example", "skos:example"),
+    ("changeNote", "skos:changeNote"),
+    ("historyNote", "skos:historyNote"),
+    ("editorialNote", "skos:editorialNote"),
+)
+CONCEPT_SCHEME_TYPE = "skos:ConceptScheme"
+
+# Front matter keys html_to_mdx_v10.py sets from the HTML sidebar; a regenerated page keeps the existing ones
+V10_SIDEBAR_KEYS = ("sidebar_label", "sidebar_level", "sidebar_position", "sidebar_class_name")
+
+PAGE_BODY = """import { VocabularyTable } from '@ifla/theme';
+
+# {frontMatter.title}
+
+<VocabularyTable
+  {...frontMatter}
+  showTitle={false}
+  filterPlaceholder="Filter vocabulary terms..."
+/>
+
+export const toc = VocabularyTable.generateTOC(frontMatter);
+"""
+
+
+def read_vocabulary_index(values_dir):
+    """The index.csv rows, in order, as dicts keyed by its headers."""
+    with open(os.path.join(values_dir, INDEX_CSV), 'r', encoding='utf-8', newline='') as f:
+        return [row for row in csv.DictReader(f) if (row.get("Sheet Name") or "").strip()]
+
+
+def index_languages(index_row):
+    return [lang.strip() for lang in (index_row.get("Languages") or "").split(",") if lang.strip()]
+
+
+def rows_hash(csv_path, index_row):
+    """
+    Digest of the vocabulary's data rows (read as CSV, cells stripped, blank rows dropped) and its index row, so
+    a re-export that only changes quoting, line endings or file times does not count as a change.
+    """
+    digest = hashlib.sha1(f"{PAGE_FORMAT_VERSION}\0{json.dumps(index_row, sort_keys=True)}".encode('utf-8'))
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            cells = [cell.strip() for cell in row]
+            if any(cells): digest.update("\x1f".join(cells).encode('utf-8') + b"\x1e")
+    return digest.hexdigest()
+
+
+def vocabulary_prefixes(index_row):
+    """
+    CURIE prefixes for one vocabulary's rows. Besides the shared ones, the content qualification exports use
+    local prefixes ('contentqualification:dimensionality', 'dimensionality:T1001'): each segment of the
+    vocabulary's namespace path is a prefix for that path.
+    """
+    prefixes = dict(CURIE_PREFIXES)
+    original_path = (index_row.get("Original CSV Path") or "").replace(os.sep, "/")
+    if ORIGINAL_CSV_NAMESPACE_MARKER not in "/" + original_path: return prefixes
+    segments = os.path.splitext(("/" + original_path).split(ORIGINAL_CSV_NAMESPACE_MARKER, 1)[1])[0].split("/")
+    for depth, segment in enumerate(segments, 1):
+        prefixes.setdefault(segment, NAMESPACE_ROOT + "/".join(segments[:depth]) + "/")
+    return prefixes
+
+
+def multilingual(row, property_name, languages):
+    # {lang: value} (a list where the column repeats), only for languages with a value
+    text = {}
+    for lang in languages:
+        values = row.values(property_name, lang)
+        if values: text[lang] = values[0] if len(values) == 1 else values
+    return text
+
+
+def vocabulary_front_matter(sheet, index_row, sidebar_position, sidebar_level=DEFAULT_SIDEBAR_LEVEL):
+    """VocabularyTable front matter for one values sheet: the scheme's metadata and its concepts, in sheet order."""
+    languages = index_languages(index_row) or sheet.languages
+    prefixes = vocabulary_prefixes(index_row)
+    scheme_row = sheet.find("rdf:type", CONCEPT_SCHEME_TYPE)
+    scheme_curie = scheme_row.get("uri") if scheme_row else ""
+    concepts = []
+    for row in sheet:
+        curie = row.get("uri")
+        if not curie or row.get("rdf:type") == CONCEPT_SCHEME_TYPE: continue
+        # Exports end with rows that are not the vocabulary's own (e.g. the registry status concept)
+        in_scheme = row.get("skos:inScheme") == scheme_curie if row.get("skos:inScheme") else \
+            in_namespace(expand_curie(curie, prefixes), expand_curie(scheme_curie, prefixes))
+        if scheme_curie and not in_scheme:
+            logging.debug(f"{sheet.name}: skipped {curie}, not in {scheme_curie}.")
+            continue
+        concept = {}
+        for key, property_name in CONCEPT_PROPERTIES:
+            text = multilingual(row, property_name, languages)
+            if text: concept[key] = text
+        concept["uri"] = expand_curie(curie, prefixes)
+        concepts.append(concept)
+
+    title = index_row.get("Title") or (scheme_row.get("dc:title") if scheme_row else "") or sheet.name
+    uri = expand_curie(scheme_curie, prefixes) if scheme_curie else None
+    front_matter = {"sidebar_label": title, "sidebar_level": sidebar_level, "sidebar_position": sidebar_position,
+                    "vocabularyId": sheet.name, "title": title}
+    if uri: front_matter.update(uri=uri, isDefinedBy=uri)
+    if index_row.get("Description"): front_matter["description"] = index_row["Description"]
+    front_matter.update(defaultLanguage=DEFAULT_LANGUAGE if DEFAULT_LANGUAGE in languages else languages[0],
+                        availableLanguages=languages, showLanguageSelector=len(languages) > 1, concepts=concepts)
+    return front_matter
+
+
+def keep_v10_sidebar_keys(front_matter, existing_fm):
+    # A page html_to_mdx_v10.py has already placed in the sidebar keeps its level, position, class and prefix
+    sidebar = {key: existing_fm.get(key, front_matter.get(key)) for key in V10_SIDEBAR_KEYS
+               if key in existing_fm or key in front_matter}
+    kept = dict(sidebar, **{k: v for k, v in front_matter.items() if k not in sidebar})
+    custom_props = existing_fm.get("customProps")
+    if isinstance(custom_props, dict) and custom_props.get("sidebar_prefix"):
+        kept["customProps"] = {"sidebar_prefix": custom_props["sidebar_prefix"]}
+    return kept
+
+
+def load_state(state_path):
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_state(state_path, state):
+    with open(state_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(state_path + ".tmp", state_path)
+
+
+def generate_vocabulary_pages(values_dir, docs_dir, state_path=None, everything=False, snapshot_dir=None,
+                              sidebar_level=DEFAULT_SIDEBAR_LEVEL):
+    """
+    Writes <docs_dir>/<sheet name>.mdx for each vocabulary in values_dir/index.csv whose rows changed since the
+    page was last generated (or every one). A CSV whose size and mtime are as recorded is not read at all; one
+    that was touched is re-read and hashed, and only rendered when its rows differ. Returns (written, unchanged).
+    """
+    state_path = state_path or os.path.join(docs_dir, DEFAULT_STATE_FILE)
+    state = load_state(state_path)
+    os.makedirs(docs_dir, exist_ok=True)
+    written, unchanged = [], []
+    for position, index_row in enumerate(read_vocabulary_index(values_dir), 1):
+        name = index_row["Sheet Name"].strip()
+        csv_path = os.path.join(values_dir, name + ".csv")
+        mdx_path = os.path.join(docs_dir, name + ".mdx")
+        if not os.path.exists(csv_path):
+            logging.warning(f"Vocabulary '{name}' is listed in {INDEX_CSV} but {csv_path} does not exist.")
+            continue
+        csv_stat = os.stat(csv_path)
+        recorded = state.get(name, {})
+        page_exists = os.path.exists(mdx_path)
+        if not everything and page_exists and recorded.get("size") == csv_stat.st_size \
+                and recorded.get("mtime_ns") == csv_stat.st_mtime_ns and recorded.get("index") == index_row:
+            unchanged.append(name)
+            continue
+        digest = rows_hash(csv_path, index_row)
+        state[name] = {"size": csv_stat.st_size, "mtime_ns": csv_stat.st_mtime_ns, "index": index_row,
+                       "rows_hash": digest}
+        if not everything and page_exists and recorded.get("rows_hash") == digest:
+            unchanged.append(name)
+            continue
+        front_matter = vocabulary_front_matter(load_sheet(csv_path, snapshot_dir), index_row, position, sidebar_level)
+        if page_exists: front_matter = keep_v10_sidebar_keys(front_matter, read_front_matter(mdx_path)[0])
+        with open(mdx_path, 'w', encoding='utf-8') as f:
+            f.write(render_front_matter(front_matter, "\n" + PAGE_BODY))
+        logging.info(f"Wrote {mdx_path}: {len(front_matter['concepts'])} concept(s), "
+                     f"languages {', '.join(front_matter['availableLanguages'])}.")
+        written.append(name)
+    write_state(state_path, state)
+    return written, unchanged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate one VocabularyTable MDX page per vocabulary of an "
+                                                 "isbd-values sheet export, rewriting only vocabularies whose rows "
+                                                 "changed.")
+    parser.add_argument("docs_dir", help="Docs directory to write <sheet name>.mdx pages to.")
+    parser.add_argument("--values_dir", default=DEFAULT_VALUES_DIR,
+                        help="isbd-values export directory holding index.csv and one CSV per vocabulary.")
+    parser.add_argument("--state_file",
+                        help=f"What each page was generated from. Defaults to {DEFAULT_STATE_FILE} in docs_dir.")
+    parser.add_argument("--all", action="store_true", help="Regenerate every page, changed or not.")
+    parser.add_argument("--sidebar_level", type=int, default=DEFAULT_SIDEBAR_LEVEL,
+                        help="sidebar_level of new pages; html_to_mdx_v10.py may set it (and the position) later, "
+                             "and regenerated pages keep what it set.")
+    parser.add_argument("--sheet_snapshot_dir",
+                        help="Directory for memory-mapped snapshots of the sheet CSVs, reused while a CSV is unchanged.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    written, unchanged = generate_vocabulary_pages(args.values_dir, args.docs_dir, args.state_file, args.all,
+                                                   args.sheet_snapshot_dir, args.sidebar_level)
+    logging.info(f"{len(written)} vocabulary page(s) written, {len(unchanged)} unchanged.")
+
+
+if __name__ == "__main__":
+    main()